@@ -9,18 +9,19 @@ FastAPI implementation using latest LangGraph patterns:
 - Automatic OpenAPI documentation
 """
 
+import json
 import logging
 import os
 import sys
 from datetime import datetime
 import asyncio
 import uuid
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
 from langgraph.types import Command
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Add the src directory to the path for imports
@@ -33,19 +34,31 @@ from src.utils.api_helpers import (
 
 # Import workflow
 from src.workflow import (
+    analysis_result_store,
     get_workflow_history,
-    SprinklrWorkflow
+    speculation_registry,
+    theme_history_log,
+    thread_artifact_store
 )
 from src.persistence.mongodb_checkpointer import get_async_mongodb_checkpointer
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('sprinklr_dashboard_api.log')
-    ]
+from src.setup.sprinklr_client_setup import close_sprinklr_client
+from src.utils.hit_cache import get_hit_cache
+from src.utils.job_queue import JobQueue, JobRejectedError
+from src.utils.metrics import get_metrics_registry, render_metrics
+from src.setup.admission_setup import admission_controller
+from src.setup.analysis_pool_setup import analysis_pool
+from src.setup.components_setup import component_registry, get_component
+from src.utils.admission import OverloadedError
+from src.utils.logging_setup import StateSummary, bind_request_id, configure_logging, request_id_var
+from src.config.settings import settings
+from src.tools.get_tool import fetched_window_index, sprinklr_circuit_breaker, sprinklr_fetch_flight, sprinklr_rate_limiter
+
+# Configure logging (written by a listener thread, off the event loop)
+log_listener = configure_logging(
+    level=settings.LOG_LEVEL,
+    json_format=settings.LOG_FORMAT == "json",
+    log_file=settings.LOG_FILE or None,
+    use_queue=settings.LOG_QUEUE_ENABLED
 )
 
 logger = logging.getLogger(__name__)
@@ -67,12 +80,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag log records of each request with an id (client-supplied X-Request-ID or a new one)"""
+    request_id = request.headers.get("X-Request-ID", "")[:64] or uuid.uuid4().hex
+    with bind_request_id(request_id):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Pydantic models for request/response validation
 class QueryRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=10000, description="User query")
     thread_id: Optional[str] = Field(None, description="Conversation thread ID")
+    background: bool = Field(False, description="Queue the work and return a job id instead of waiting for the result")
 
 class ApiResponse(BaseModel):
     status: str
@@ -92,15 +116,39 @@ class StatusResponse(BaseModel):
 # Global workflow instance
 workflow_instance = None
 
+# Global job queue instance (background /api/process requests)
+job_queue = JobQueue(
+    max_workers=settings.JOB_WORKERS,
+    max_queue_size=settings.JOB_QUEUE_SIZE,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS
+)
+
 @app.on_event("startup")
 async def startup_event():
     global workflow_instance
     if workflow_instance is None:
         logger.info("App Startup")
-        workflow_instance = SprinklrWorkflow()
+        workflow_instance = get_component("workflow")
         await workflow_instance.async_init()
+        job_queue.start()
+        if analysis_pool is not None and settings.ANALYSIS_POOL_WARM_ON_STARTUP:
+            await analysis_pool.start()
+        if thread_artifact_store.spill is not None:
+            await asyncio.to_thread(thread_artifact_store.spill.prune)
         logger.info("Workflow instance initialized with MongoDB persistence.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release long-lived resources owned by the app"""
+    logger.info("App Shutdown")
+    await job_queue.stop()
+    await close_sprinklr_client()
+    get_hit_cache().close()
+    if analysis_pool is not None:
+        await asyncio.to_thread(analysis_pool.shutdown)
+    if log_listener is not None:
+        log_listener.stop()
+
 def get_workflow():
     """Get or initialize the workflow instance"""
     global workflow_instance
@@ -141,6 +189,19 @@ async def get_status():
             "workflow_initialized": wf is not None,
             "memory_enabled": hasattr(wf, 'memory'),
             "agents_loaded": len(wf.__dict__) > 0 if wf else 0,
+            "hit_cache": get_hit_cache().get_stats(),
+            "sprinklr_fetch_coalescing": sprinklr_fetch_flight.get_stats(),
+            "sprinklr_rate_limiter": sprinklr_rate_limiter.get_stats(),
+            "sprinklr_circuit_breaker": sprinklr_circuit_breaker.get_stats(),
+            "delta_fetch_windows": fetched_window_index.get_stats(),
+            "thread_artifacts": thread_artifact_store.get_stats(),
+            "speculative_prefetch": speculation_registry.get_stats(),
+            "theme_history": theme_history_log.get_stats(),
+            "shared_analyses": analysis_result_store.get_stats(),
+            "job_queue": job_queue.get_stats(),
+            "admission_control": admission_controller.get_stats(),
+            "analysis_pool": analysis_pool.get_stats() if analysis_pool is not None else None,
+            "components": component_registry.get_stats(),
             "timestamp": datetime.now().isoformat()
         }
         return create_success_response(status_info, "API operational")
@@ -148,6 +209,274 @@ async def get_status():
         logger.error(f"Error getting service status: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting service status: {str(e)}")
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics: per-node, LLM, fetch, embedding and clustering
+    latency histograms, outcome counters, item counts and payload sizes,
+    plus job queue and process gauges.
+    """
+    registry = get_metrics_registry()
+    queue_stats = job_queue.get_stats()
+    registry.gauge("insights_job_queue_depth", "Background jobs waiting for a worker").set(queue_stats["queue_depth"])
+    registry.gauge("insights_job_running", "Background jobs currently executing").set(queue_stats["running"])
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# State fields forwarded as intermediate outputs in progress events
+PROGRESS_FIELDS = (
+    "refined_query", "keywords", "filters", "defaults_applied", "boolean_query",
+    "hit_count", "themes", "current_stage", "workflow_status", "errors"
+)
+
+
+def serialize_result(state_values: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the client-facing result fields from the workflow state"""
+    return {
+        "query": state_values.get("query", []),
+        "refined_query": state_values.get("refined_query", ""),
+        "keywords": state_values.get("keywords", []),
+        "filters": state_values.get("filters", {}),
+        "data_requirements": state_values.get("data_requirements", []),
+        "defaults_applied": state_values.get("defaults_applied", {}),
+        "entities": state_values.get("entities", []),
+        "use_case": state_values.get("use_case", "General Use Case"),
+        "industry": state_values.get("industry", ""),
+        "sub_vertical": state_values.get("sub_vertical", ""),
+        "conversation_summary": state_values.get("conversation_summary", ""),
+        "boolean_query": state_values.get("boolean_query", ""),
+        "themes": state_values.get("themes", []),
+    }
+
+
+def build_interrupt_payload(interrupt_value: Dict[str, Any], state_values: Dict[str, Any], thread_id: str) -> Dict[str, Any]:
+    """Combine an interrupt's question with the state the user is asked to review"""
+    # Initialize defaults
+    message = "Human input required"
+    interrupt_data = {}
+    
+    # Extract interrupt question and instructions if available
+    question = interrupt_value.get("question", "Please review the analysis below and approve to continue:")
+    instructions = interrupt_value.get("instructions", "Reply 'yes' to approve or provide feedback to refine")
+    
+    # Check if we have HITL data in the state
+    if 'refined_query' in state_values:
+        refined_query = state_values.get('refined_query', '')
+        
+        # Combine interrupt event data with state values
+        interrupt_data = {
+            "question": question,
+            "step": interrupt_value.get("step", 1),
+            "refined_query": refined_query,
+            "keywords": state_values.get('keywords') or [],
+            "filters": state_values.get('filters', {}),
+            "data_requirements": state_values.get('data_requirements') or [],
+            "defaults_applied": state_values.get('defaults_applied') or {},
+            "entities": state_values.get('entities') or [],
+            "use_case": state_values.get('use_case', 'General Use Case'),
+            "industry": state_values.get('industry', ''),
+            "sub_vertical": state_values.get('sub_vertical', ''),
+            "conversation_summary": state_values.get('conversation_summary', ''),
+            "instructions": instructions
+        }
+        message = f"Review analysis: {refined_query[:100]}..."
+    
+    return {
+        "status": "waiting_for_input",
+        "message": message,
+        "thread_id": thread_id,
+        "interrupt_data": interrupt_data
+    }
+
+
+def summarize_node_update(node: str, update: Any) -> Dict[str, Any]:
+    """Reduce a node's state update to the fields worth showing as progress"""
+    summary = {"node": node}
+    if not isinstance(update, dict):
+        return summary
+    for field in PROGRESS_FIELDS:
+        if field in update:
+            summary[field] = update[field]
+    messages = update.get("messages") or []
+    if messages:
+        summary["message"] = getattr(messages[-1], "content", str(messages[-1]))
+    return summary
+
+
+async def iter_query_events(user_query: str, thread_id: str, resume: bool, node_starts: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run or resume a conversation, yielding progress events as nodes run.
+
+    Yields "node_started" (only with node_starts) and "node_completed" events
+    while the graph runs, then exactly one terminal event: "interrupt" or
+    "completed", whose "payload" is the /api/process response data.
+
+    Args:
+        user_query: User query (new conversation) or response (resume)
+        thread_id: Conversation thread ID
+        resume: True to resume the thread with Command(resume=user_query)
+        node_starts: Also report node starts (uses LangGraph's debug stream)
+
+    Yields:
+        Event dictionaries with an "event" type
+    """
+    workflow = get_workflow()
+    graph_input = Command(resume=user_query) if resume else {"query": [user_query]}
+    
+    # Prepare configuration for the workflow
+    config = {"configurable": {"thread_id": thread_id}}
+    # "values" carries the full state after every step, so interrupt and
+    # completion payloads come from the stream instead of checkpoint reads
+    stream_mode = ["updates", "values", "debug"] if node_starts else ["updates", "values"]
+    snapshot: Dict[str, Any] = {}
+    
+    async def state_snapshot() -> Dict[str, Any]:
+        """Latest state from the stream, or one checkpoint read if the stream carried none"""
+        if "values" not in snapshot:
+            current_state = await workflow.workflow.aget_state(config=config)
+            snapshot["values"] = current_state.values if current_state and current_state.values else {}
+        return snapshot["values"]
+    
+    async def graph_events():
+        """Translate LangGraph stream chunks into progress events (interrupts are passed through)"""
+        async for mode, chunk in workflow.workflow.astream(graph_input, config=config, stream_mode=stream_mode):
+            if mode == "values":
+                snapshot["values"] = chunk
+                yield {"event": "__values__"}
+                continue
+            if mode == "debug":
+                if chunk.get("type") == "task":
+                    yield {"event": "node_started", "node": chunk["payload"]["name"]}
+                continue
+            logger.info(f"📨 Completed Streamed event: {list(chunk.keys())}")
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    yield {"event": "__interrupt__", "interrupt": update[0]}
+                else:
+                    yield {"event": "node_completed", **summarize_node_update(node, update)}
+    
+    if resume:
+        # Single pass: the HITL node receives the user input through interrupt()
+        # and the run continues until the next interrupt or the end
+        logger.info(f"🔄 Resuming workflow with Command(resume='{user_query}')")
+    else:
+        logger.info(f"📜 Starting workflow with inputs: {graph_input} and config: {config}")
+    
+    # A new conversation reports completion as soon as the analyzer has run; a
+    # resumed one continues to the theme review interrupt
+    analysis_done = False
+    async for event in graph_events():
+        if event["event"] == "__values__":
+            if analysis_done:
+                break
+            continue
+        
+        # Check for interrupt (HITL) following modern LangGraph pattern
+        if event["event"] == "__interrupt__":
+            logger.info(f"🛑 Workflow interrupted")
+            state_values = await state_snapshot()
+            yield {"event": "interrupt", "payload": build_interrupt_payload(event["interrupt"].value, state_values, thread_id)}
+            return
+        
+        yield event
+        
+        # Check if final node output is present (completion); the state arrives with the step's values chunk
+        if event["event"] == "node_completed" and event["node"] == "data_analyzer" and not resume:  # Final node in our workflow
+            analysis_done = True
+    
+    if analysis_done:
+        logger.info("✅ Workflow completed successfully")
+        yield {
+            "event": "completed",
+            "payload": {"status": "completed", "result": serialize_result(await state_snapshot()), "thread_id": thread_id}
+        }
+        return
+    
+    logger.info("✅ Workflow completed - returning current state")
+    yield {
+        "event": "completed",
+        "payload": {"status": "completed-explicitly", "result": serialize_result(await state_snapshot()), "thread_id": thread_id}
+    }
+
+
+async def run_query(user_query: str, thread_id: str, resume: bool) -> Dict[str, Any]:
+    """
+    Run or resume a conversation until it completes or hits a HITL interrupt.
+
+    Shared by the synchronous /api/process path and background jobs.
+
+    Args:
+        user_query: User query (new conversation) or response (resume)
+        thread_id: Conversation thread ID
+        resume: True to resume the thread with Command(resume=user_query)
+
+    Returns:
+        Dictionary with status ("waiting_for_input" or "completed"), thread_id
+        and the interrupt payload or final result
+    """
+    async for event in iter_query_events(user_query, thread_id, resume):
+        if event["event"] in ("interrupt", "completed"):
+            return event["payload"]
+    raise RuntimeError("Workflow stream ended without a result")
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode a progress event as a server-sent event"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def resolve_query_request(query_request: QueryRequest) -> Tuple[str, str, bool]:
+    """
+    Validate a query request and resolve its conversation.
+
+    Returns:
+        Tuple of (user query, thread ID, whether the thread is resumed)
+
+    Raises:
+        HTTPException: If the query is empty or too long
+    """
+    user_query = query_request.query.strip()
+    thread_id = query_request.thread_id
+    
+    # Log the request details
+    logger.info(f"🔍 Processing query: {user_query[:100]}...")
+    
+    if not user_query:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    if len(user_query) > 10000:
+        raise HTTPException(status_code=400, detail="Query too long (max 10000 characters)")
+    
+    resume = thread_id is not None
+    if resume:
+        logger.info(f"🔄 Continuing conversation: {thread_id} with input: {user_query}")
+    else:
+        thread_id = str(uuid.uuid4())
+        logger.info(f"🆕 Starting new conversation: {thread_id}")
+    return user_query, thread_id, resume
+
+
+def ensure_thread_idle(thread_id: str) -> None:
+    """Reject running a thread inline while a background job owns it"""
+    active_job = job_queue.active_job(thread_id)
+    if active_job is not None:
+        raise HTTPException(status_code=409, detail=f"Job {active_job.job_id} is still active for this thread")
+
+def overloaded_exception(error: OverloadedError) -> HTTPException:
+    """503 response telling the client which stage is saturated and when to retry"""
+    return HTTPException(
+        status_code=503,
+        detail=f"Server overloaded ({error.stage}): {error}",
+        headers={"Retry-After": str(int(max(1, error.retry_after)))}
+    )
+
+
+def ensure_capacity() -> None:
+    """Reject new work up front while any workflow stage is saturated"""
+    try:
+        admission_controller.check()
+    except OverloadedError as e:
+        raise overloaded_exception(e)
+
 @app.post("/api/process", response_model=Dict[str, Any])
 async def process_query(query_request: QueryRequest):
     """    
@@ -164,6 +493,9 @@ async def process_query(query_request: QueryRequest):
             "thread_id": "<thread_id>"
         }
     
+    Add "background": true to queue the work and return a job id immediately;
+    poll GET /api/jobs/{job_id} for the status and result.
+    
     Features:
     - Unified approach - no explicit tracking of new vs existing
     - Uses streaming with interrupt() like helper demo
@@ -172,185 +504,97 @@ async def process_query(query_request: QueryRequest):
     """
     log_endpoint_access("process_query")
     
-    user_query = query_request.query.strip()
-    thread_id = query_request.thread_id
+    user_query, thread_id, resume = resolve_query_request(query_request)
+    ensure_capacity()
     
-    # Log the request details
-    logger.info(f"🔍 Processing query: {user_query[:100]}...")
+    if query_request.background:
+        try:
+            request_id = request_id_var.get()
+            
+            async def run_job():
+                with bind_request_id(request_id):
+                    return await run_query(user_query, thread_id, resume)
+            
+            job = job_queue.submit(run_job, key=thread_id)
+        except JobRejectedError as e:
+            status_code = {"queue_full": 429, "key_busy": 409}.get(e.reason, 503)
+            raise HTTPException(status_code=status_code, detail=str(e))
+        logger.info(f"📥 Queued job {job.job_id} for thread {thread_id}")
+        return JSONResponse(
+            status_code=202,
+            content=create_success_response({
+                "job_id": job.job_id,
+                "thread_id": thread_id,
+                "status": job.status,
+                "poll_url": f"/api/jobs/{job.job_id}"
+            }, "Query accepted")
+        )
     
-    if not user_query:
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
-    
-    if len(user_query) > 10000:
-        raise HTTPException(status_code=400, detail="Query too long (max 10000 characters)")
+    ensure_thread_idle(thread_id)
     
     try:
-        workflow = get_workflow()
-        
-        if thread_id is None:
-            thread_id = str(uuid.uuid4())
-            inputs = {"query": [user_query]}
-            logger.info(f"🆕 Starting new conversation: {thread_id}")
-        else:
-            inputs = None  
-            logger.info(f"🔄 Continuing conversation: {thread_id} with input: {user_query}")
-        
-        # Prepare configuration for the workflow
-        config = {"configurable": {"thread_id": thread_id}}
-        
-        # Use asyncio to handle the async stream properly
-        
-        async def run_workflow_stream():
-            """Run the workflow stream in an async context to handle streaming and interrupts"""
-            
-            # For continuing conversations, use Command pattern 
-            # Thread ID Present but the inputs are None
-            if thread_id and inputs is None:
-                # Get current state of the Graph
-                current_state = await workflow.workflow.aget_state(config=config)
-                logger.info(f"📍 Current state before resume: hitl_step={current_state}")
-                
-                # Use Command(resume=...) pattern 
-                # The HITL verification node will handle the user input directly through yield interrupt()
-                logger.info(f"🔄 Resuming workflow with Command(resume='{user_query}')")
-                await workflow.workflow.ainvoke(Command(resume=user_query), config=config)
-            
-            logger.info(f"📜 Starting workflow with inputs: {inputs} and config: {config}")
-
-
-
-
-            # Stream the workflow execution
-            async for event in workflow.workflow.astream(inputs, config=config):
-                logger.info(f"📨 Completed Streamed event: {list(event.keys())}")
-
-                # Check for interrupt (HITL) following modern LangGraph pattern
-                if "__interrupt__" in event:
-                    logger.info(f"🛑 Workflow interrupted - getting state for details")
-                    
-                    # Extract data directly from the interrupt event
-                    # The __interrupt__ contains a tuple with the Interrupt object as its first element
-                    interrupt_obj = event.get("__interrupt__")[0]  # Access the first element of the tuple
-                    interrupt_value = interrupt_obj.value
-                    
-                    # Initialize defaults
-                    message = "Human input required"
-                    interrupt_data = {}
-                    
-                    # Extract interrupt question and instructions if available
-                    question = interrupt_value.get("question", "Please review the analysis below and approve to continue:")
-                    instructions = interrupt_value.get("instructions", "Reply 'yes' to approve or provide feedback to refine")
-
-
-                    current_state = await workflow.workflow.aget_state(config=config)
-                    # Get current state to extract additional information
-                    logger.info(f"📍 Current state during interrupt: {current_state}")
-
-
-                    # Try to get interrupt data from the state's values
-                    if hasattr(current_state, 'values') and current_state.values:
-                        state_values = current_state.values
-                        logger.info(f"📜 Current state values: {state_values}")
-                        # Check if we have HITL data in the state
-                        if 'refined_query' in state_values:
-                            refined_query = state_values.get('refined_query', '')
-                            keywords = state_values.get('keywords', [])
-                            filters = state_values.get('filters', {})
-                            data_requirements = state_values.get('data_requirements', [])
-                            defaults_applied = state_values.get('defaults_applied', {})
-                            entities = state_values.get('entities', [])
-                            use_case = state_values.get('use_case', 'General Use Case')
-                            industry = state_values.get('industry', '')
-                            sub_vertical = state_values.get('sub_vertical', '')
-                            conversation_summary = state_values.get('conversation_summary', '')
-
-                            # Combine interrupt event data with state values
-                            interrupt_data = {
-                                "question": question,
-                                "step": interrupt_value.get("step", 1),
-                                "refined_query": refined_query,
-                                "keywords": keywords if keywords else [],
-                                "filters": filters,
-                                "data_requirements": data_requirements if data_requirements else [],
-                                "defaults_applied": defaults_applied if defaults_applied else {},
-                                "entities": entities if entities else [],
-                                "use_case": use_case,
-                                "industry": industry,
-                                "sub_vertical": sub_vertical,
-                                "conversation_summary": conversation_summary,
-                                "instructions": instructions
-                            }
-                            message = f"Review analysis: {refined_query[:100]}..."
-                    
-                    return {
-                        "status": "waiting_for_input",
-                        "message": message,
-                        "thread_id": thread_id,
-                        "interrupt_data": interrupt_data
-                    }
-                
-                # Check if final node output is present (completion)
-                elif event.get("data_analyzer"):  # Final node in our workflow
-                    logger.info("✅ Workflow completed successfully")
-                    
-                    # Serialize the data_analyzer result to handle AIMessage objects
-                    # analyzer_result = event["data_analyzer"]
-                    current_state = await workflow.workflow.aget_state(config=config)
-
-                    serialized_result = {
-                        "query": current_state.values.get("query", []),
-                        "refined_query": current_state.values.get("refined_query", ""),
-                        "keywords": current_state.values.get("keywords", []),
-                        "filters": current_state.values.get("filters", {}),
-                        "data_requirements": current_state.values.get("data_requirements", []),
-                        "defaults_applied": current_state.values.get("defaults_applied", {}),
-                        "entities": current_state.values.get("entities", []),
-                        "use_case": current_state.values.get("use_case", "General Use Case"),
-                        "industry": current_state.values.get("industry", ""),
-                        "sub_vertical": current_state.values.get("sub_vertical", ""),
-                        "conversation_summary": current_state.values.get("conversation_summary", ""),
-                        "boolean_query": current_state.values.get("boolean_query", ""),
-                        "themes": current_state.values.get("themes", []),
-                    }
-                    return {
-                        "status": "completed",
-                        "result": serialized_result,
-                        "thread_id": thread_id
-                    }
-            
-
-            current_state = await workflow.workflow.aget_state(config=config)
-            logger.info("✅ Workflow completed - returning current state")
-            serialized_result = {
-                "query": current_state.values.get("query", []),
-                "refined_query": current_state.values.get("refined_query", ""),
-                "keywords": current_state.values.get("keywords", []),
-                "filters": current_state.values.get("filters", {}),
-                "data_requirements": current_state.values.get("data_requirements", []),
-                "defaults_applied": current_state.values.get("defaults_applied", {}),
-                "entities": current_state.values.get("entities", []),
-                "use_case": current_state.values.get("use_case", "General Use Case"),
-                "industry": current_state.values.get("industry", ""),
-                "sub_vertical": current_state.values.get("sub_vertical", ""),
-                "conversation_summary": current_state.values.get("conversation_summary", ""),
-                "boolean_query": current_state.values.get("boolean_query", ""),
-                "themes": current_state.values.get("themes", []),
-            }
-            
-            return {
-                "status": "completed-explicitly",
-                "result": serialized_result,
-                "thread_id": thread_id
-            }
-
-        result = await run_workflow_stream()
+        result = await run_query(user_query, thread_id, resume)
         return create_success_response(result, "Query processed successfully")
         
+    except OverloadedError as e:
+        raise overloaded_exception(e)
     except Exception as e:
         logger.error(f"❌ Error processing query: {str(e)}")
         logger.error(f"📝 Query was: {user_query[:200]}...")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
                             
+@app.post("/api/process/stream")
+async def process_query_stream(query_request: QueryRequest):
+    """
+    Same payload as /api/process, answered as a server-sent event stream.
+    
+    Events:
+    - accepted: sent immediately with the thread_id
+    - node_started / node_completed: per-node progress; completions carry the
+      node's intermediate outputs (refined query, keywords, boolean query,
+      hit count, themes, ...)
+    - interrupt / completed: terminal event whose payload matches /api/process
+    - error: the run failed
+    """
+    log_endpoint_access("process_query_stream")
+    
+    user_query, thread_id, resume = resolve_query_request(query_request)
+    ensure_thread_idle(thread_id)
+    ensure_capacity()
+    
+    async def event_source():
+        yield format_sse({"event": "accepted", "thread_id": thread_id})
+        try:
+            async for event in iter_query_events(user_query, thread_id, resume, node_starts=True):
+                yield format_sse(event)
+        except OverloadedError as e:
+            logger.warning(f"🚦 Streaming query rejected: {e}")
+            yield format_sse({"event": "error", "thread_id": thread_id, "status_code": 503, "stage": e.stage, "retry_after": e.retry_after, "detail": f"Server overloaded ({e.stage}): {e}"})
+        except Exception as e:
+            logger.error(f"❌ Error streaming query: {str(e)}")
+            yield format_sse({"event": "error", "thread_id": thread_id, "detail": f"Processing failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_job(job_id: str):
+    """
+    Poll a background job.
+
+    While queued or running only the status and timings are returned; once
+    succeeded, "result" holds the same payload a synchronous /api/process call
+    returns (including HITL interrupt data).
+    """
+    log_endpoint_access("get_job")
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found or expired")
+    return create_success_response(job.to_dict(), f"Job {job.status}")
+
 @app.get("/api/history/{thread_id}", response_model=Dict[str, Any])
 async def get_history(thread_id: str):
     """
@@ -371,7 +615,7 @@ async def get_history(thread_id: str):
         logger.info(f"Fetching history for thread ID: {thread_id}")
         state = (await workflow.workflow.aget_state(config=config)).values
 
-        logger.info(f"Current state for thread {thread_id}: {state}")
+        logger.debug("Current state for thread %s: %s", thread_id, StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         return create_success_response({
             "thread_id": thread_id,
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Local Sprinklr get-mentions stand-in server.
+
+Mimics the get-mentions contract (POST a request body with filters,
+fromTime/uptoTime and numberOfMessages; receive a JSON array of hits) so the
+tool node and the full graph can be benchmarked without Sprinklr credentials
+or network access.
+
+- Replays a recorded corpus (--corpus hits.json) or a seeded synthetic one (--size)
+- Only hits inside the requested time window and field filters are returned, newest first
+- Configurable latency distribution, error/throttle rates and streaming mode
+
+Usage:
+    python mock_sprinklr_server.py --size 20000 --latency-ms 300 --stream chunked
+    SPRINKLR_MENTIONS_API_URL=http://127.0.0.1:8900/get-mentions python start.py
+
+The boolean QUERY filter is not evaluated - every hit in the window matches.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 24 * 60 * 60 * 1000
+FILTERS_JSON_PATH = Path(__file__).parent / "src" / "knowledge_base" / "filters.json"
+
+# Topic vocabulary for synthetic mentions, so clustering produces distinct themes
+SYNTHETIC_TOPICS = {
+    "battery": ["battery drains overnight", "charging takes forever", "battery life is amazing", "phone gets hot while charging"],
+    "support": ["customer service never replied", "support agent was very helpful", "waited two hours on hold", "refund request ignored"],
+    "pricing": ["subscription price went up again", "great value for the money", "hidden fees at checkout", "discount code did not work"],
+    "delivery": ["package arrived late", "delivery was super fast", "courier left the box in the rain", "order tracking is broken"],
+    "app": ["app crashes on login", "new update looks great", "dark mode finally added", "notifications stopped working"],
+}
+SYNTHETIC_FILLERS = ["honestly", "again", "this week", "for the third time", "so far", "#fail", "#love", "lol", "smh", "today"]
+
+
+class MockConfig:
+    """Runtime configuration of the stand-in server."""
+
+    def __init__(
+        self,
+        size: int = 10000,
+        corpus_path: Optional[str] = None,
+        seed: int = 42,
+        from_time: Optional[int] = None,
+        upto_time: Optional[int] = None,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        stream: str = "none",
+        chunk_size: int = 100,
+        chunk_delay_ms: float = 0.0,
+    ):
+        self.size = size
+        self.corpus_path = corpus_path
+        self.seed = seed
+        self.upto_time = upto_time if upto_time is not None else (int(time.time() * 1000) // DAY_MS + 1) * DAY_MS - 1
+        self.from_time = from_time if from_time is not None else self.upto_time - 365 * DAY_MS + 1
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.stream = stream
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay_ms = chunk_delay_ms
+
+
+def _load_filter_values() -> Dict[str, List[str]]:
+    """Load the allowed source/country/language/gender values used for synthetic hits."""
+    try:
+        with open(FILTERS_JSON_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)["filters"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not load {FILTERS_JSON_PATH}: {e} - using fallback values")
+        return {"source": ["TWITTER"], "country": ["US"], "language": ["en"], "gender": ["UNKNOWN"]}
+
+
+def generate_synthetic_corpus(size: int, from_time: int, upto_time: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic synthetic corpus of mentions.
+
+    Args:
+        size: Number of hits
+        from_time: Earliest createdTime (epoch ms)
+        upto_time: Latest createdTime (epoch ms)
+        seed: Random seed (same seed, size and window give the same corpus)
+
+    Returns:
+        List of hit dictionaries shaped like get-mentions hits
+    """
+    rng = random.Random(seed)
+    filter_values = _load_filter_values()
+    topics = list(SYNTHETIC_TOPICS.items())
+
+    hits = []
+    for i in range(size):
+        topic, phrases = topics[rng.randrange(len(topics))]
+        text = f"{rng.choice(phrases)} {rng.choice(SYNTHETIC_FILLERS)} - {rng.choice(phrases)} ({topic} #{i % 97})"
+        hits.append({
+            "id": f"mock-{seed}-{i}",
+            "text": text,
+            "createdTime": rng.randint(from_time, upto_time),
+            "source": rng.choice(filter_values["source"]),
+            "country": rng.choice(filter_values["country"]),
+            "language": rng.choice(filter_values["language"]),
+            "gender": rng.choice(filter_values["gender"]),
+        })
+    return hits
+
+
+def load_corpus(config: MockConfig) -> List[Dict[str, Any]]:
+    """
+    Load the recorded corpus or generate a synthetic one, sorted newest first.
+
+    Args:
+        config: Server configuration
+
+    Returns:
+        List of hits
+    """
+    if config.corpus_path:
+        with open(config.corpus_path, "r", encoding="utf-8") as f:
+            corpus = json.load(f)
+        if not isinstance(corpus, list):
+            raise ValueError(f"Corpus file {config.corpus_path} must contain a JSON array of hits")
+        logger.info(f"Loaded {len(corpus)} recorded hits from {config.corpus_path}")
+    else:
+        corpus = generate_synthetic_corpus(config.size, config.from_time, config.upto_time, config.seed)
+        logger.info(f"Generated {len(corpus)} synthetic hits")
+
+    corpus.sort(key=lambda hit: hit.get("createdTime") or 0, reverse=True)
+    return corpus
+
+
+def select_hits(corpus: List[Dict[str, Any]], request_body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Apply the request's time window, field filters and message count to the corpus.
+
+    Args:
+        corpus: Hits sorted newest first
+        request_body: get-mentions request body
+
+    Returns:
+        Matching hits, at most numberOfMessages of them
+    """
+    from_time = int(request_body.get("fromTime") or 0)
+    upto_time = int(request_body.get("uptoTime") or sys.maxsize)
+    limit = int(request_body.get("numberOfMessages") or 500)
+
+    # SOURCE/COUNTRY/LANGUAGE/GENDER clauses match the lower-cased hit field
+    field_filters = {
+        clause["field"].lower(): set(clause.get("values") or [])
+        for clause in request_body.get("filters") or []
+        if clause.get("field") and clause["field"] != "QUERY"
+    }
+
+    selected = []
+    for hit in corpus:
+        created_time = hit.get("createdTime")
+        if created_time is not None and not from_time <= created_time <= upto_time:
+            continue
+        if any(hit.get(field) not in values for field, values in field_filters.items()):
+            continue
+        selected.append(hit)
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    """
+    Build the stand-in FastAPI application.
+
+    Args:
+        config: Server configuration
+
+    Returns:
+        FastAPI app exposing POST /get-mentions, GET /stats and GET /health
+    """
+    app = FastAPI(title="Mock Sprinklr get-mentions")
+    corpus = load_corpus(config)
+    rng = random.Random(config.seed)
+    stats = {"requests": 0, "errors": 0, "throttled": 0, "hits_served": 0}
+
+    async def simulate_latency() -> None:
+        delay_ms = rng.gauss(config.latency_ms, config.latency_jitter_ms) if config.latency_jitter_ms else config.latency_ms
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    async def stream_chunks(hits: List[Dict[str, Any]]):
+        chunks = [hits[i:i + config.chunk_size] for i in range(0, len(hits), config.chunk_size)]
+        if config.stream == "sse":
+            for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if config.chunk_delay_ms:
+                    await asyncio.sleep(config.chunk_delay_ms / 1000)
+            yield "data: [DONE]\n\n"
+            return
+
+        yield "["
+        for index, chunk in enumerate(chunks):
+            body = ",".join(json.dumps(hit) for hit in chunk)
+            yield body if index == 0 else "," + body
+            if config.chunk_delay_ms:
+                await asyncio.sleep(config.chunk_delay_ms / 1000)
+        yield "]"
+
+    @app.post("/get-mentions")
+    @app.post("/get-mentions/{path:path}")
+    async def get_mentions(request: Request, path: str = ""):
+        stats["requests"] += 1
+        request_body = await request.json()
+        await simulate_latency()
+
+        roll = rng.random()
+        if roll < config.throttle_rate:
+            stats["throttled"] += 1
+            return Response(status_code=429, headers={"Retry-After": str(config.retry_after)})
+        if roll < config.throttle_rate + config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(status_code=503, content={"error": "mock upstream failure"})
+
+        hits = select_hits(corpus, request_body)
+        stats["hits_served"] += len(hits)
+
+        if config.stream == "none":
+            return Response(content=json.dumps(hits), media_type="application/json")
+        media_type = "text/event-stream" if config.stream == "sse" else "application/json"
+        return StreamingResponse(stream_chunks(hits), media_type=media_type)
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "corpus_size": len(corpus)}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+def main():
+    """Parse arguments and run the stand-in server"""
+    parser = argparse.ArgumentParser(description="Local Sprinklr get-mentions stand-in server")
+    parser.add_argument("--host", default=os.getenv("MOCK_SPRINKLR_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_SPRINKLR_PORT", 8900)))
+    parser.add_argument("--corpus", dest="corpus_path", help="JSON array of recorded hits to replay")
+    parser.add_argument("--size", type=int, default=10000, help="Synthetic corpus size (ignored with --corpus)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic corpus, latency and errors")
+    parser.add_argument("--from-time", type=int, help="Synthetic corpus start (epoch ms, default: a year before --upto-time)")
+    parser.add_argument("--upto-time", type=int, help="Synthetic corpus end (epoch ms, default: end of today)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with HTTP 429")
+    parser.add_argument("--stream", choices=["none", "chunked", "sse"], default="none", help="Response body framing")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Hits per streamed chunk")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Delay between streamed chunks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config_args = {key: value for key, value in vars(args).items() if key not in ("host", "port")}
+    app = create_app(MockConfig(**config_args))
+
+    logger.info(f"🧪 Mock Sprinklr get-mentions: http://{args.host}:{args.port}/get-mentions")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,11 @@ Key features:
 - Combines unsupervised clustering with supervised refinement for higher accuracyClus
 """
 
+import asyncio
 import logging
 import json
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
 
 from bertopic import BERTopic
@@ -26,10 +27,26 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.setup.llm_setup import LLMSetup
 from src.agents.query_generator_agent import QueryGeneratorAgent
+from src.utils.hit_store import HitStore, HitStoreBuilder
+from src.utils.hits_helper import get_mention_id
+from src.utils.cluster_stability import assignment_stability
+from src.utils.metrics import observe_stage
+from src.setup.admission_setup import admission_controller
+from src.setup.analysis_pool_setup import EMBEDDING_MODEL_NAME, analysis_pool
+from src.utils.admission import OverloadedError
+from src.utils.analysis_worker import (
+    assignment_stability_shared, cluster_topics, encode_texts, encode_texts_shared, fit_topics, fit_topics_shared
+)
+from src.utils.shared_arrays import SharedMemoryScope
+from src.config.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
+# State fields (besides the boolean query) read by theme generation, scoring
+# and per-theme query generation; they are part of the shared analysis key
+THEME_CONTEXT_KEYS = ("refined_query", "keywords", "entities", "industry", "sub_vertical", "use_case")
+
 
 class DataAnalyzerAgent:
     """
@@ -40,21 +57,20 @@ class DataAnalyzerAgent:
     2. LLM-guided theme generation and refinement with confidence scoring
     """
     
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, query_generator=None, embedding_model=None):
         """
         Initialize hybrid components for BERTopic clustering and LLM theme refinement.
         
         Args:
             llm: Optional LLM instance. If None, will use LLMSetup for agent-specific LLM.
+            query_generator: Optional shared QueryGeneratorAgent
+            embedding_model: Optional shared SentenceTransformer (must be EMBEDDING_MODEL_NAME)
         """
         try:
             # Initialize BERTopic components
-            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-            self.topic_model = BERTopic(
-                embedding_model=self.embedding_model, 
-                nr_topics="auto",  # Let BERTopic determine optimal number
-                min_topic_size=3   # Minimum documents per topic
-            )
+            self.embedding_model_name = EMBEDDING_MODEL_NAME
+            self.embedding_model = embedding_model or SentenceTransformer(self.embedding_model_name)
+            self.topic_model = self._new_topic_model()
             
             # Initialize LLM for theme generation and refinement
             if llm is None:
@@ -64,7 +80,7 @@ class DataAnalyzerAgent:
                 self.llm = llm
                 
             # Initialize QueryGeneratorAgent for boolean query generation
-            self.query_generator = QueryGeneratorAgent(llm=self.llm)
+            self.query_generator = query_generator or QueryGeneratorAgent(llm=self.llm)
             
             # Enhanced scoring parameters for high-quality theme generation
             self.min_confidence_score = 0.65  # Higher threshold for quality themes
@@ -270,26 +286,52 @@ class DataAnalyzerAgent:
             logger.error(f"{error_msg}. Cleaned response was: {cleaned_response[:500]}...")
             raise RuntimeError(error_msg) from e
 
-    def _extract_documents_from_hits(self, hits: List[Dict[str, Any]]) -> List[str]:
+    @staticmethod
+    def _clean_text(text: Any) -> Optional[str]:
+        """Strip raw hit text and apply the minimum length check."""
+        if text:
+            text_content = str(text).strip()
+            if len(text_content) > 10:  # Minimum length check
+                return text_content
+        return None
+
+    @staticmethod
+    def _extract_text(hit: Dict[str, Any]) -> Optional[str]:
+        """
+        Extract analyzable text from a single hit.
+
+        Args:
+            hit: Single hit from Sprinklr API
+
+        Returns:
+            Stripped text content, or None if the hit has no usable text
+        """
+        if isinstance(hit, dict) and "text" in hit:
+            return DataAnalyzerAgent._clean_text(hit["text"])
+        return None
+
+    def _extract_documents_from_hits(self, hits: Union[HitStore, List[Dict[str, Any]]]) -> List[str]:
         """
         Enhanced text extraction from Sprinklr API hits with better content discovery.
         
         Args:
-            hits: List of hits from Sprinklr API
+            hits: HitStore or list of hits from Sprinklr API
             
         Returns:
             List of extracted document strings
         """
         documents = []
         
-        for hit in hits:
-            text_content = ""
-            
-            if isinstance(hit, dict) and "text" in hit and hit["text"]:
-                text_content = str(hit["text"]).strip()
+        # Columnar store: read texts straight from the buffer without building hit dicts
+        if isinstance(hits, HitStore):
+            texts = (self._clean_text(text) for text in hits.iter_texts())
+        else:
+            texts = (self._extract_text(hit) for hit in hits)
+
+        for text_content in texts:
 
             # Add document if we found valid content
-            if text_content and len(text_content) > 10:  # Minimum length check
+            if text_content:
                 documents.append(text_content)
 
         if not documents:
@@ -298,58 +340,273 @@ class DataAnalyzerAgent:
         logger.info(f"Extracted {len(documents)} documents from {len(hits)} hits")
         return documents
 
-    def _cluster_documents(self, docs: List[str]) -> Tuple[List[int], np.ndarray, BERTopic]:
+    async def extract_documents_from_stream(
+        self,
+        hit_stream: AsyncIterator[Dict[str, Any]],
+        embed_batch_size: int = 256
+    ) -> Dict[str, Any]:
         """
-        Perform initial BERTopic clustering on documents.
+        Consume a streaming hit iterator, extracting text and embedding it while the download continues.
+
+        Full batches are encoded off the event loop as soon as they are complete,
+        so embedding overlaps with network I/O instead of starting after it.
 
         Args:
-            docs: List of document strings
+            hit_stream: Async iterator of hits (e.g. from stream_sprinklr_data)
+            embed_batch_size: Number of documents per embedding batch
 
         Returns:
-            Tuple of (topics, probabilities, topic_model)
+            Dictionary with "hits" (a HitStore), "documents" and row-aligned "embeddings"
         """
-        try:
-            logger.info(f"Performing initial clustering on {len(docs)} documents")
+        store_builder = HitStoreBuilder()
+        documents = []
+        batch = []
+        encode_tasks = []
+        encode_lock = asyncio.Lock()
 
-            # Fit the topic model to the data
-            topics, probs = self.topic_model.fit_transform(docs)
+        async def encode_batch(texts: List[str]) -> np.ndarray:
+            # Serialize encodes so batches do not compete for the same cores
+            async with encode_lock:
+                return await self._aencode(texts, "stream_batch")
 
-            # Update topics with documents for better representation
-            self.topic_model.update_topics(docs, topics)
+        async for hit in hit_stream:
+            store_builder.append(hit)
+            text_content = self._extract_text(hit)
+            if not text_content:
+                continue
+            documents.append(text_content)
+            batch.append(text_content)
+            if len(batch) >= embed_batch_size:
+                encode_tasks.append(asyncio.create_task(encode_batch(batch)))
+                batch = []
 
-            logger.info(f"Initial clustering complete: {len(set(topics))} topics found")
-            return topics, probs, self.topic_model
+        if batch:
+            encode_tasks.append(asyncio.create_task(encode_batch(batch)))
 
-        except IndexError as e:
-            # Handle BERTopic clustering failure when no topics can be found
-            logger.warning(f"BERTopic could not find meaningful topics in the documents: {e}")
-            logger.info("Creating fallback clustering with single topic assignment")
+        if not documents:
+            for task in encode_tasks:
+                task.cancel()
+            raise ValueError(f"No valid text content found in {store_builder.count} hits")
 
-            # Create fallback clustering where all documents belong to topic 0
-            fallback_topics = [0] * len(docs)
-            fallback_probs = np.ones((len(docs),)) * 0.5  # Moderate confidence
+        embeddings = np.vstack(await asyncio.gather(*encode_tasks))
+        hits = store_builder.build()
 
-            # Create a new topic model instance for consistency
-            fallback_model = BERTopic(
-                embedding_model=self.embedding_model,
-                nr_topics=1,  # Force single topic
-                min_topic_size=1
-            )
+        logger.info(f"Extracted and embedded {len(documents)} documents from {len(hits)} streamed hits")
+        return {"hits": hits, "documents": documents, "embeddings": embeddings}
 
-            return fallback_topics, fallback_probs, fallback_model
+    async def collect_adaptive_sample(
+        self,
+        fetch_round: Callable[[int], Awaitable[Iterable[Dict[str, Any]]]],
+        sizes: Sequence[int],
+        stability_threshold: float = 0.85,
+        embed_batch_size: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Fetch a small sample first and grow it only while theme assignments keep shifting.
 
-        except Exception as e:
-            logger.error(f"Error in initial clustering: {e}")
-            raise RuntimeError(f"Clustering failed: {e}") from e
+        Each round fetches only its increment over the previous sample (disjoint
+        from earlier rounds, see plan_sample_rounds), embeds it and runs a cheap
+        k-means stability check against the previous round. Growing stops once
+        the assignments agree above the threshold, a round comes back short of
+        its increment (the API is running out of mentions) or the last size is
+        reached.
+
+        Args:
+            fetch_round: Coroutine fetching the new hits of round N (zero-based)
+            sizes: Cumulative sample size after each round (see sample_schedule)
+            stability_threshold: Adjusted Rand index at which the sample is considered stable
+            embed_batch_size: Batch size for the embedding model
+
+        Returns:
+            Dictionary with "hits" (a HitStore), "documents", row-aligned "embeddings" and "rounds"
+        """
+        store_builder = HitStoreBuilder()
+        seen_ids = set()
+        documents = []
+        embedding_batches = []
+        previous_count = 0
+        previous_size = 0
+        rounds = 0
+
+        for index, size in enumerate(sizes):
+            rounds += 1
+            increment = size - previous_size
+            previous_size = size
+            fetched = 0
+
+            new_documents = []
+            for hit in await fetch_round(index):
+                fetched += 1
+                mention_id = get_mention_id(hit)
+                if mention_id is not None:
+                    if mention_id in seen_ids:
+                        continue
+                    seen_ids.add(mention_id)
+                store_builder.append(hit)
+                text_content = self._extract_text(hit)
+                if text_content:
+                    new_documents.append(text_content)
+
+            if new_documents:
+                embedding_batches.append(
+                    await self._aencode(new_documents, "adaptive_round", batch_size=embed_batch_size)
+                )
+                documents.extend(new_documents)
 
+            logger.info(f"Adaptive sample round {rounds}: fetched {fetched} of {increment} new mentions, {len(documents)} documents total")
+            if fetched < increment or index == len(sizes) - 1 or not documents:
+                break
 
+            if previous_count:
+                async with admission_controller.slot("clustering"):
+                    with observe_stage("clustering", "stability_check"):
+                        stability = await self._stability_check(np.vstack(embedding_batches), previous_count)
+                if stability >= stability_threshold:
+                    logger.info(f"Adaptive sample stable after {rounds} rounds ({len(documents)} documents)")
+                    break
+
+            previous_count = len(documents)
+
+        if not documents:
+            raise ValueError(f"No valid text content found in {store_builder.count} hits")
+
+        return {
+            "hits": store_builder.build(),
+            "documents": documents,
+            "embeddings": np.vstack(embedding_batches),
+            "rounds": rounds,
+        }
+
+    def analysis_config(self) -> Dict[str, Any]:
+        """
+        Settings that change the analysis output, used to key shared analysis results.
+        
+        Returns:
+            Dictionary of embedding, clustering and theme selection parameters
+        """
+        return {
+            "embedding_model": self.embedding_model_name,
+            "nr_topics": self.topic_model.nr_topics,
+            "min_topic_size": self.topic_model.min_topic_size,
+            "min_confidence_score": self.min_confidence_score,
+            "max_themes_output": self.max_themes_output,
+            "min_themes_output": self.min_themes_output,
+        }
+
+    def analysis_context(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Conversation context that shapes the themes, used to key shared analysis results.
+        
+        Args:
+            state: LangGraph state
+            
+        Returns:
+            Dictionary of the THEME_CONTEXT_KEYS values in the state
+        """
+        return {key: state.get(key) for key in THEME_CONTEXT_KEYS}
+
+    async def _aencode(self, texts: List[str], stage_name: str, **kwargs) -> np.ndarray:
+        """Embed texts off the event loop once an embedding slot is available"""
+        async with admission_controller.slot("embedding"):
+            with observe_stage("embedding", stage_name) as stage:
+                stage.items = len(texts)
+                if analysis_pool is None:
+                    return await asyncio.to_thread(self.embedding_model.encode, texts, **kwargs)
+                if not settings.ANALYSIS_POOL_SHARED_MEMORY:
+                    return await analysis_pool.run(encode_texts, self.embedding_model_name, list(texts), kwargs)
+                with SharedMemoryScope() as scope:
+                    out = scope.allocate_array((len(texts), self.embedding_model.get_sentence_embedding_dimension()), np.float32)
+                    await analysis_pool.run(encode_texts_shared, self.embedding_model_name, scope.share_texts(texts), out, kwargs)
+                    return scope.read_array(out)
+
+    async def _stability_check(self, embeddings: np.ndarray, reference_count: int) -> float:
+        """Run the adaptive-sample stability check off the event loop"""
+        if analysis_pool is None:
+            return await asyncio.to_thread(assignment_stability, embeddings, reference_count)
+        if not settings.ANALYSIS_POOL_SHARED_MEMORY:
+            return await analysis_pool.run(assignment_stability, embeddings, reference_count)
+        with SharedMemoryScope() as scope:
+            return await analysis_pool.run(assignment_stability_shared, scope.share_array(embeddings), reference_count)
+
+    async def prepare_documents(
+        self,
+        hits: Union[HitStore, List[Dict[str, Any]]],
+        documents: Optional[Sequence[str]] = None,
+        embed_batch_size: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Extract documents from hits (if not given) and embed them off the event loop.
+
+        Args:
+            hits: HitStore or list of hits from Sprinklr API
+            documents: Documents already extracted from the hits
+            embed_batch_size: Batch size for the embedding model
+
+        Returns:
+            Dictionary with "documents" and row-aligned "embeddings"
+        """
+        if documents is None:
+            documents = self._extract_documents_from_hits(hits)
+        embeddings = await self._aencode(list(documents), "documents", batch_size=embed_batch_size)
+        logger.info(f"Embedded {len(documents)} documents")
+        return {"documents": documents, "embeddings": embeddings}
+
+    def _new_topic_model(self) -> BERTopic:
+        """Create an unfitted BERTopic model with the analyzer's clustering parameters"""
+        return BERTopic(
+            embedding_model=self.embedding_model, 
+            nr_topics="auto",  # Let BERTopic determine optimal number
+            min_topic_size=3   # Minimum documents per topic
+        )
+
+    def _cluster_documents(self, docs: List[str], embeddings: Optional[np.ndarray] = None) -> Tuple[List[int], np.ndarray, BERTopic]:
+        """
+        Perform initial BERTopic clustering on documents in this process.
+
+        Args:
+            docs: List of document strings
+            embeddings: Optional precomputed document embeddings (skips re-encoding)
+
+        Returns:
+            Tuple of (topics, probabilities, topic_model)
+        """
+        return cluster_topics(docs, embeddings, self.embedding_model, self.topic_model.nr_topics, self.topic_model.min_topic_size)
+
+    async def _acluster_documents(self, docs: List[str], embeddings: Optional[np.ndarray] = None) -> Tuple[List[int], np.ndarray]:
+        """
+        Cluster documents off the event loop once a clustering slot is available.
+
+        Args:
+            docs: List of document strings
+            embeddings: Optional precomputed document embeddings (skips re-encoding)
+
+        Returns:
+            Tuple of (topics, probabilities)
+        """
+        async with admission_controller.slot("clustering"):
+            with observe_stage("clustering", "bertopic") as stage:
+                stage.items = len(docs)
+                if analysis_pool is None:
+                    topics, probs, _ = await asyncio.to_thread(self._cluster_documents, docs, embeddings)
+                    return topics, probs
+                params = (self.topic_model.nr_topics, self.topic_model.min_topic_size)
+                if not settings.ANALYSIS_POOL_SHARED_MEMORY:
+                    topics, probs = await analysis_pool.run(fit_topics, self.embedding_model_name, list(docs), embeddings, *params)
+                    return topics.tolist(), probs
+                with SharedMemoryScope() as scope:
+                    shared_embeddings = scope.share_array(embeddings) if embeddings is not None else None
+                    topics, probs = await analysis_pool.run(
+                        fit_topics_shared, self.embedding_model_name, scope.share_texts(docs), shared_embeddings, *params
+                    )
+                return topics.tolist(), probs
 
     async def _refine_clusters_with_labels(
         self, 
         docs: List[str], 
         potential_themes: List[Dict[str, str]], 
         initial_topics: List[int],
-        initial_probs: np.ndarray
+        initial_probs: np.ndarray,
+        doc_embeddings: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Refine clusters using LLM-generated theme labels with enhanced quality thresholds.
@@ -359,6 +616,7 @@ class DataAnalyzerAgent:
             potential_themes: LLM-generated potential themes
             initial_topics: Initial topic assignments
             initial_probs: Initial topic probabilities
+            doc_embeddings: Optional precomputed document embeddings
             
         Returns:
             List of refined themes with document associations
@@ -367,11 +625,12 @@ class DataAnalyzerAgent:
             logger.info("Refining clusters with LLM-generated labels using enhanced quality thresholds")
             
             # Get document embeddings for semantic similarity
-            doc_embeddings = self.embedding_model.encode(docs)
+            if doc_embeddings is None:
+                doc_embeddings = await self._aencode(docs, "refine_documents")
             
             # Create embeddings for theme descriptions
             theme_texts = [f"{theme['name']}: {theme['description']}" for theme in potential_themes]
-            theme_embeddings = self.embedding_model.encode(theme_texts)
+            theme_embeddings = await self._aencode(theme_texts, "theme_labels")
             
             # Calculate similarity between documents and themes
             similarity_matrix = cosine_similarity(doc_embeddings, theme_embeddings)
@@ -452,6 +711,8 @@ class DataAnalyzerAgent:
             
             return refined_themes
             
+        except OverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Error in cluster refinement: {e}")
             raise RuntimeError(f"Cluster refinement failed: {e}") from e
@@ -645,13 +906,21 @@ class DataAnalyzerAgent:
             logger.error(error_msg)
             raise RuntimeError(error_msg) from e
 
-    async def analyze_hits_and_state(self, hits: List[Dict[str, Any]], state: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_hits_and_state(
+        self,
+        hits: Union[HitStore, List[Dict[str, Any]]],
+        state: Dict[str, Any],
+        documents: Optional[List[str]] = None,
+        embeddings: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Main analysis method implementing the complete hybrid approach.
         
         Args:
-            hits: List of hits from Sprinklr API (not stored in state)
+            hits: HitStore or list of hits from Sprinklr API (not stored in state)
             state: LangGraph state containing refined_query, keywords, filters
+            documents: Optional documents already extracted from the hits
+            embeddings: Optional embeddings row-aligned with documents
             
         Returns:
             Dictionary with enhanced themes containing boolean queries
@@ -662,8 +931,10 @@ class DataAnalyzerAgent:
         try:
             logger.info(f"Starting hybrid analysis on {len(hits)} hits with state context")
             
-            # Step 1: Extract documents from hits
-            documents = self._extract_documents_from_hits(hits)
+            # Step 1: Extract documents from hits (unless already extracted while streaming)
+            if documents is None:
+                documents = self._extract_documents_from_hits(hits)
+                embeddings = None
             
             if len(documents) < 2:
                 raise ValueError("At least 2 documents required for clustering analysis")
@@ -672,11 +943,11 @@ class DataAnalyzerAgent:
             potential_themes = await self._generate_potential_themes_with_llm(state)
             
             # Step 3: Perform initial clustering
-            initial_topics, initial_probs, topic_model = self._cluster_documents(documents)
+            initial_topics, initial_probs = await self._acluster_documents(documents, embeddings)
             
             # Step 4: Refine clusters with label guidance
             refined_themes = await self._refine_clusters_with_labels(
-                documents, potential_themes, initial_topics, initial_probs
+                documents, potential_themes, initial_topics, initial_probs, embeddings
             )
             
             if not refined_themes:
@@ -720,8 +991,8 @@ class DataAnalyzerAgent:
             return result
             
         except Exception as e:
-            if isinstance(e, ValueError):
-                raise  # Re-raise validation errors
+            if isinstance(e, (ValueError, OverloadedError)):
+                raise  # Re-raise validation errors and admission rejections
             error_msg = f"Hybrid analysis failed: {e}"
             logger.error(error_msg, exc_info=True)
             raise RuntimeError(error_msg) from e
@@ -14,7 +14,7 @@ from typing import Dict, Any, List, Optional
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.tools import tool
 from src.agents.base.agent_base import LLMAgent
-from src.rag.filters_rag import FiltersRAG
+from src.rag.filters_rag import FiltersRAG, get_filters_rag
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +25,9 @@ class QueryRefinerAgent(LLMAgent):
     Dramatically simplified while maintaining all functionality.
     """
     
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, rag_system: Optional[FiltersRAG] = None):
         super().__init__("query_refiner", llm)
-        self.rag_system = FiltersRAG()
+        self.rag_system = rag_system or get_filters_rag()
     
     async def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -38,12 +38,14 @@ class ThemeModifierAgent:
     - Generate granular sub-themes for deeper analysis
     """
     
-    def __init__(self, llm=None):
+    def __init__(self, llm=None, query_generator=None, embedding_model=None):
         """
         Initialize Theme Modifier Agent with supervised clustering capabilities.
         
         Args:
             llm: Optional LLM instance for theme generation and refinement
+            query_generator: Optional shared QueryGeneratorAgent
+            embedding_model: Optional shared SentenceTransformer model
         """
         try:
             # Initialize LLM for theme operations
@@ -54,10 +56,10 @@ class ThemeModifierAgent:
                 self.llm = llm_setup.get_llm()
             
             # Initialize query generator for boolean query creation
-            self.query_generator = QueryGeneratorAgent()
+            self.query_generator = query_generator or QueryGeneratorAgent(llm=self.llm)
             
             # Initialize embedding model for semantic analysis
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.embedding_model = embedding_model or SentenceTransformer('all-MiniLM-L6-v2')
             
             logger.info("✅ Theme Modifier Agent initialized successfully")
             
@@ -50,6 +50,10 @@ class Settings(BaseSettings):
         default="https://space-p0-lst-poc.sprinklr.com/ui/rest/chatgpt/stream/get-mentions/9004/MESSAGE_STREAM_SUMMARIZATION_STREAM/",
         description="Sprinklr API endpoint"
     )
+    SPRINKLR_MENTIONS_API_URL: str = Field(
+        default="https://space-p0-lst-poc.sprinklr.com/ui/rest/chatgpt/stream/get-mentions/9004/MESSAGE_STREAM_SUMMARIZATION_STREAM",
+        description="Sprinklr get-mentions endpoint used by the data tool (point at mock_sprinklr_server.py for offline testing)"
+    )
     
     # Changing headers that can be configured via environment variables
     SPRINKLR_COOKIES: str = Field(
@@ -77,6 +81,96 @@ class Settings(BaseSettings):
         description="Baggage header for Sprinklr API requests"
     )
 
+    # Sprinklr HTTP Client Pool Configuration
+    SPRINKLR_HTTP2: bool = Field(default=True, description="Use HTTP/2 for Sprinklr API requests (falls back to HTTP/1.1 if h2 is missing)")
+    SPRINKLR_MAX_CONNECTIONS: int = Field(default=20, description="Maximum concurrent connections to the Sprinklr host")
+    SPRINKLR_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=10, description="Maximum idle keep-alive connections kept in the pool")
+    SPRINKLR_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Seconds an idle pooled connection is kept open")
+    SPRINKLR_CONNECT_TIMEOUT: float = Field(default=10.0, description="Connect timeout in seconds for Sprinklr API requests")
+    SPRINKLR_READ_TIMEOUT: float = Field(default=90.0, description="Read timeout in seconds for Sprinklr API requests")
+    SPRINKLR_POOL_TIMEOUT: float = Field(default=30.0, description="Seconds to wait for a free pooled connection")
+
+    # Sprinklr Sharded Fetch Configuration
+    SPRINKLR_FETCH_SHARDS: int = Field(default=1, description="Number of time sub-windows to fetch in parallel (1 disables sharding)")
+    SPRINKLR_SHARD_CONCURRENCY: int = Field(default=4, description="Maximum shard requests in flight at once")
+    SPRINKLR_SHARD_MIN_MESSAGES: int = Field(default=1000, description="Only shard requests asking for at least this many messages")
+    SPRINKLR_SINGLE_FLIGHT_ENABLED: bool = Field(default=True, description="Coalesce identical concurrent Sprinklr fetches into one request")
+    SPRINKLR_STREAM_HITS: bool = Field(default=False, description="Parse get-mentions responses incrementally and embed hits while downloading")
+    ADAPTIVE_SAMPLING_ENABLED: bool = Field(default=False, description="Start with a small sample and fetch more mentions only while clusters are unstable")
+    ADAPTIVE_SAMPLE_INITIAL: int = Field(default=1000, description="Mentions requested in the first adaptive round")
+    ADAPTIVE_SAMPLE_MAX: int = Field(default=5000, description="Upper bound on mentions requested by adaptive sampling")
+    ADAPTIVE_SAMPLE_GROWTH: float = Field(default=2.0, description="Sample size multiplier per adaptive round")
+    ADAPTIVE_SAMPLE_SLICES: int = Field(default=4, description="Disjoint time sub-windows fetched per adaptive round (rounds never refetch earlier mentions)")
+    ADAPTIVE_STABILITY_THRESHOLD: float = Field(default=0.85, description="Adjusted Rand index between rounds at which the sample is considered stable")
+
+    # Sprinklr Rate Limiting and Circuit Breaker Configuration
+    SPRINKLR_RATE_LIMIT_PER_SECOND: float = Field(default=5.0, description="Maximum Sprinklr requests per second across all callers")
+    SPRINKLR_RATE_LIMIT_BURST: int = Field(default=10, description="Token bucket capacity (requests allowed in a burst)")
+    SPRINKLR_RATE_LIMIT_MIN_PER_SECOND: float = Field(default=0.5, description="Floor for the adaptive rate after repeated throttling")
+    SPRINKLR_BACKOFF_BASE_SECONDS: float = Field(default=1.0, description="Base delay for jittered exponential retry backoff")
+    SPRINKLR_BACKOFF_MAX_SECONDS: float = Field(default=20.0, description="Maximum delay between retries")
+    SPRINKLR_MAX_RETRY_AFTER_SECONDS: float = Field(default=60.0, description="Give up instead of waiting when Retry-After exceeds this")
+    SPRINKLR_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, description="Consecutive failed requests that open the circuit")
+    SPRINKLR_CIRCUIT_RESET_SECONDS: float = Field(default=30.0, description="Seconds the circuit stays open before a probe request")
+
+    # Sprinklr Hit Cache Configuration
+    HIT_CACHE_ENABLED: bool = Field(default=True, description="Cache fetched hits keyed by query, time window and limit")
+    HIT_CACHE_TTL_SECONDS: int = Field(default=6 * 60 * 60, description="Time-to-live for cached hit lists in seconds")
+    HIT_CACHE_MEMORY_ENTRIES: int = Field(default=16, description="Maximum hit lists kept in the in-memory LRU")
+    HIT_CACHE_DB_PATH: str = Field(default="./cache/hit_cache.sqlite3", description="SQLite file backing the hit cache")
+    HIT_CACHE_MAX_DISK_MB: int = Field(default=512, description="Maximum compressed size of the on-disk hit cache in MB")
+    DELTA_FETCH_ENABLED: bool = Field(default=True, description="Fetch only uncovered time sub-ranges when a cached window of the same query lies inside the request")
+    DELTA_FETCH_MAX_QUERIES: int = Field(default=64, description="Maximum canonical queries whose fetched windows are tracked")
+
+    # Per-Thread Artifact Store Configuration
+    ARTIFACT_STORE_MAX_THREADS: int = Field(default=32, description="Maximum conversations whose fetched hits are kept between graph nodes")
+    ARTIFACT_STORE_MAX_MB: int = Field(default=1024, description="Maximum approximate memory of kept hits, documents and embeddings in MB")
+    ARTIFACT_STORE_TTL_SECONDS: int = Field(default=60 * 60, description="Seconds an idle conversation's hits are kept for theme refinement")
+    ARTIFACT_SPILL_ENABLED: bool = Field(default=True, description="Spill each conversation's hits, documents and embeddings to disk and serve them memory-mapped")
+    ARTIFACT_SPILL_DIR: str = Field(default="./cache/artifacts", description="Directory holding per-thread artifact spills")
+    ARTIFACT_SPILL_EMBEDDING_DTYPE: str = Field(default="float32", description="Dtype of spilled embeddings (float32 or float16)")
+    ARTIFACT_SPILL_TTL_SECONDS: int = Field(default=24 * 60 * 60, description="Seconds a spill stays reusable, e.g. for resumes after a restart")
+
+    # Speculative Prefetch Configuration
+    SPECULATIVE_PREFETCH_ENABLED: bool = Field(default=False, description="Generate the Boolean query and fetch hits while the query verification interrupt is pending")
+    SPECULATIVE_PREFETCH_EMBED: bool = Field(default=False, description="Also embed the prefetched hits before the user approves")
+    SPECULATIVE_PREFETCH_MAX_RUNS: int = Field(default=16, description="Maximum conversations with a pending speculative run")
+    SPECULATIVE_PREFETCH_TTL_SECONDS: int = Field(default=10 * 60, description="Seconds after which an unclaimed speculative run is cancelled")
+
+    # Background Job Configuration
+    JOB_WORKERS: int = Field(default=4, description="Background /api/process jobs executed concurrently")
+    JOB_QUEUE_SIZE: int = Field(default=64, description="Background jobs allowed to wait; further submissions get HTTP 429")
+    JOB_RESULT_TTL_SECONDS: int = Field(default=60 * 60, description="Seconds finished job results stay available for polling")
+
+    # Admission Control Configuration
+    ADMISSION_CONTROL_ENABLED: bool = Field(default=True, description="Limit concurrent LLM calls, fetches, embedding passes and BERTopic fits")
+    ADMISSION_MAX_WAIT_SECONDS: float = Field(default=60.0, description="Longest a call waits for a stage slot before it is rejected (0 waits indefinitely)")
+    ADMISSION_LLM_CONCURRENCY: int = Field(default=8, description="Concurrent LLM calls")
+    ADMISSION_LLM_QUEUE: int = Field(default=64, description="LLM calls allowed to wait for a slot")
+    ADMISSION_FETCH_CONCURRENCY: int = Field(default=8, description="Concurrent Sprinklr fetch requests")
+    ADMISSION_FETCH_QUEUE: int = Field(default=64, description="Sprinklr fetch requests allowed to wait for a slot")
+    ADMISSION_EMBEDDING_CONCURRENCY: int = Field(default=2, description="Concurrent embedding passes")
+    ADMISSION_EMBEDDING_QUEUE: int = Field(default=16, description="Embedding passes allowed to wait for a slot")
+    ADMISSION_CLUSTERING_CONCURRENCY: int = Field(default=1, description="Concurrent BERTopic fits")
+    ADMISSION_CLUSTERING_QUEUE: int = Field(default=8, description="BERTopic fits allowed to wait for a slot")
+
+    # Analysis Process Pool Configuration
+    ANALYSIS_POOL_WORKERS: int = Field(default=2, description="Worker processes for embedding, BERTopic and stability checks (0 runs them in threads)")
+    ANALYSIS_POOL_THREADS_PER_WORKER: int = Field(default=0, description="Torch threads per analysis worker (0 splits the CPU cores between workers)")
+    ANALYSIS_POOL_SHARED_MEMORY: bool = Field(default=True, description="Pass corpora and embedding matrices to analysis workers through shared memory instead of pickling them")
+    ANALYSIS_POOL_WARM_ON_STARTUP: bool = Field(default=True, description="Start the analysis workers and load their models when the app starts")
+
+    # Shared Analysis Cache Configuration
+    ANALYSIS_CACHE_ENABLED: bool = Field(default=True, description="Reuse finished theme analyses across conversations with the same boolean query, time window and filters")
+    ANALYSIS_CACHE_MAX_ENTRIES: int = Field(default=256, description="Maximum analyses kept in the shared store")
+    ANALYSIS_CACHE_TTL_SECONDS: int = Field(default=6 * 60 * 60, description="Seconds after which a shared analysis is recomputed")
+
+    # Theme History Configuration
+    THEME_HISTORY_MAX_ENTRIES: int = Field(default=20, description="Theme HITL decisions and theme backups kept per conversation (outside checkpoints)")
+    THEME_HISTORY_TTL_SECONDS: int = Field(default=24 * 60 * 60, description="Seconds an idle conversation's theme history is kept")
+    THEME_HISTORY_PERSIST: bool = Field(default=True, description="Also store theme history in MongoDB so it survives restarts and is shared by workers")
+    THEME_HISTORY_COLLECTION: str = Field(default="theme_history", description="MongoDB collection for theme history (one document per thread)")
+
     # MongoDB Configuration for Persistence
     MONGODB_URI: str = Field(default="mongodb://localhost:27017/", description="MongoDB connection URI")
     MONGODB_DATABASE: str = Field(default="insights_dashboard", description="MongoDB database name")
@@ -84,6 +178,10 @@ class Settings(BaseSettings):
 
     # Logging Configuration
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
+    LOG_FORMAT: str = Field(default="text", description="Log line format: \"text\" or \"json\" (one object per line with the request id)")
+    LOG_FILE: Optional[str] = Field(default="sprinklr_dashboard_api.log", description="File receiving log records in addition to stdout (empty to disable)")
+    LOG_QUEUE_ENABLED: bool = Field(default=True, description="Write log records from a background listener thread instead of the event loop")
+    LOG_STATE_MAX_CHARS: int = Field(default=2000, description="Maximum length of debug-level workflow state summaries")
     
     @field_validator("KNOWLEDGE_BASE_PATH")
     @classmethod
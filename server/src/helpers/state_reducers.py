@@ -0,0 +1,66 @@
+"""
+Bounded reducers for accumulating state fields.
+
+LangGraph checkpoints the full state after every node, so fields merged with
+plain appending reducers (operator.add, add_messages) make every checkpoint
+write and aget_state read grow with conversation length. These reducers keep
+such fields to a fixed window:
+
+- windowed(add_messages, 30) keeps the newest 30 messages after merging
+  (older context is carried by conversation_summary)
+- query_history(20) appends queries, moving a repeated query to the end
+  instead of storing it twice, and keeps the newest 20
+"""
+
+import re
+from typing import Any, Callable, List, Sequence, Union
+
+
+def windowed(reducer: Callable[[Any, Any], Sequence], max_items: int) -> Callable[[Any, Any], List]:
+    """
+    Wrap a list reducer so the merged value keeps only its newest items.
+
+    Args:
+        reducer: Reducer merging the current value with an update (e.g. add_messages)
+        max_items: Number of newest items kept
+
+    Returns:
+        Reducer applying reducer and then the window
+    """
+    def reduce(left: Any, right: Any) -> List:
+        merged = list(reducer(left, right))
+        return merged[-max_items:] if len(merged) > max_items else merged
+
+    return reduce
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", str(query)).strip().casefold()
+
+
+def query_history(max_items: int) -> Callable[[Any, Any], List[str]]:
+    """
+    Build a reducer for the user query history.
+
+    Queries are appended in order; a query already in the history (ignoring
+    case and whitespace) is moved to the end rather than duplicated, so the
+    latest input is always last. Blank queries are ignored.
+
+    Args:
+        max_items: Number of newest queries kept
+
+    Returns:
+        Reducer for the query field
+    """
+    def reduce(left: Union[List[str], str, None], right: Union[List[str], str, None]) -> List[str]:
+        history = [left] if isinstance(left, str) else list(left or [])
+        updates = [right] if isinstance(right, str) else list(right or [])
+        for query in updates:
+            key = _normalize_query(query)
+            if not key:
+                continue
+            history = [existing for existing in history if _normalize_query(existing) != key]
+            history.append(query)
+        return history[-max_items:]
+
+    return reduce
@@ -12,7 +12,13 @@ from typing import Dict, List, Optional, Any, Annotated, Sequence, TypedDict
 from datetime import datetime
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
-import operator
+
+from src.helpers.state_reducers import query_history, windowed
+
+# Checkpoints are written after every node; accumulating fields are windowed
+# so their size does not grow with conversation length
+MESSAGE_WINDOW = 30
+QUERY_HISTORY_LIMIT = 20
 
 
 class DashboardState(TypedDict):
@@ -29,7 +35,7 @@ class DashboardState(TypedDict):
     """
     
     # Core fields as per PROMPT.md
-    query: Annotated[List[str], operator.add]  # List of queries for conversation ### IMPORTANT
+    query: Annotated[List[str], query_history(QUERY_HISTORY_LIMIT)]  # Deduplicated list of queries for conversation ### IMPORTANT
     refined_query: Optional[str]  # Refined query string ### IMPORTANT
     keywords: Optional[List[str]]  # Extracted keywords list ### IMPORTANT
     filters: Optional[Dict[str, Any]]  # Filter mappings ### IMPORTANT
@@ -37,10 +43,12 @@ class DashboardState(TypedDict):
     themes: Optional[List[Dict[str, Any]]]  # Generated themes with boolean queries ### IMPORTANT
     
     # LangGraph compatibility (required)
-    messages: Annotated[Sequence[BaseMessage], add_messages] ### IMPORTANT
+    messages: Annotated[Sequence[BaseMessage], windowed(add_messages, MESSAGE_WINDOW)] ### IMPORTANT
     
     # Additional tracking fields
     thread_id: Optional[str] ### IMPORTANT
+    hits_run_id: Optional[str]  # Run id of the tool execution whose hits are in the thread artifact store
+    hit_count: Optional[int]  # Number of hits retrieved by the latest tool execution
     current_stage: Optional[str]
     workflow_status: Optional[str]
     workflow_started: Optional[str]
@@ -68,12 +76,12 @@ class DashboardState(TypedDict):
     theme_modification_intent: Optional[str]  # add, remove, modify, create_sub_theme
     target_theme: Optional[str]  # Theme being modified
     theme_modification_details: Optional[str]  # User's modification details
-    original_themes: Optional[List[Dict[str, Any]]]  # Backup of original themes before modification
     theme_modification_context: Optional[Dict[str, Any]]  # Additional context for modifications
     theme_action: Optional[str]  # Action to be taken
     theme_modification_query: Optional[str]  # The user's theme modification query
-    theme_hitl_history: Optional[List[Dict[str, Any]]]  # History of theme HITL interactions
     pending_theme_changes: Optional[List[Dict[str, Any]]]  # Changes waiting to be applied
+    # Theme backups and the theme HITL history live in the per-thread history
+    # log (src/utils/thread_history.py), not in checkpointed state
     
     # Workflow tracking
     errors: Optional[List[str]]
@@ -130,10 +138,8 @@ def create_initial_state(user_query: str, thread_id: str = None) -> DashboardSta
         theme_modification_intent=None,
         target_theme=None,
         theme_modification_details=None,
-        original_themes=None,
         theme_modification_context=None,
         theme_action=None,
         theme_modification_query=None,
-        theme_hitl_history=[],
         pending_theme_changes=[],
     )
@@ -11,11 +11,9 @@ information and context to help agents make better decisions about user queries.
 
 import json
 import logging
-import os
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-from src.utils.files_helper import import_module_from_file
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -32,20 +30,14 @@ class FiltersRAG:
         """Initialize the filters RAG system."""
         # Import here to avoid circular imports
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            setup_dir = os.path.join(current_dir, '..', 'setup')
-            
-            vector_db_path = os.path.join(setup_dir, 'vector_db_setup.py')
-            embedding_path = os.path.join(setup_dir, 'embedding_setup.py')
-            
-            vector_db_module = import_module_from_file(vector_db_path, 'vector_db_setup')
-            
-            self.vector_db = vector_db_module.get_vector_db()
+            from src.setup.vector_db_setup import get_vector_db
+            from src.setup.embedding_setup import get_embedding_model
+
+            self.vector_db = get_vector_db()
             
             # Try to get embedding model, but it's optional
             try:
-                embedding_module = import_module_from_file(embedding_path, 'embedding_setup')
-                self.embedding_model = embedding_module.get_embedding_model()
+                self.embedding_model = get_embedding_model()
             except Exception as e:
                 logger.warning(f"Could not load embedding model: {e}")
                 self.embedding_model = None
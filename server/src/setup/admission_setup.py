@@ -0,0 +1,44 @@
+"""
+This script sets up the process-wide admission controller.
+
+# Stages:
+- llm: calls through the LLM router / Gemini
+- fetch: Sprinklr get-mentions requests
+- embedding: sentence-transformer encode passes
+- clustering: BERTopic fits
+
+# Purpose:
+- Bound how many expensive operations run at once on one box
+- Queue excess work fairly (FIFO) and reject it early once the queue is full,
+  instead of letting every request slow down
+"""
+
+from src.config.settings import settings
+from src.utils.admission import AdmissionController, StageLimiter
+
+
+def _build_admission_controller() -> AdmissionController:
+    """Create the stage limiters from settings (an empty controller when disabled)."""
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return AdmissionController()
+    max_wait = settings.ADMISSION_MAX_WAIT_SECONDS or None
+    return AdmissionController([
+        StageLimiter("llm", settings.ADMISSION_LLM_CONCURRENCY, settings.ADMISSION_LLM_QUEUE, max_wait),
+        StageLimiter("fetch", settings.ADMISSION_FETCH_CONCURRENCY, settings.ADMISSION_FETCH_QUEUE, max_wait),
+        StageLimiter("embedding", settings.ADMISSION_EMBEDDING_CONCURRENCY, settings.ADMISSION_EMBEDDING_QUEUE, max_wait),
+        StageLimiter("clustering", settings.ADMISSION_CLUSTERING_CONCURRENCY, settings.ADMISSION_CLUSTERING_QUEUE, max_wait),
+    ])
+
+
+# Global admission controller instance
+admission_controller = _build_admission_controller()
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Get the global admission controller.
+
+    Returns:
+        AdmissionController instance
+    """
+    return admission_controller
@@ -0,0 +1,50 @@
+"""
+This script sets up the process pool for CPU-bound analysis work.
+
+# Work executed in the pool:
+- Sentence-transformer encode passes
+- BERTopic fits
+- Adaptive-sample stability checks
+
+# Purpose:
+- Keep the event loop free for health checks, history reads and other conversations
+- Run analyses of different conversations in parallel across cores
+- Load the embedding model once per worker at startup instead of per request
+"""
+
+import os
+from typing import Optional
+
+from src.config.settings import settings
+from src.utils.analysis_worker import init_worker
+from src.utils.process_pool import WarmProcessPool
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def _build_analysis_pool() -> Optional[WarmProcessPool]:
+    """Create the pool from settings (None runs analysis in worker threads instead)."""
+    workers = settings.ANALYSIS_POOL_WORKERS
+    if workers <= 0:
+        return None
+    torch_threads = settings.ANALYSIS_POOL_THREADS_PER_WORKER or max(1, (os.cpu_count() or 1) // workers)
+    return WarmProcessPool(
+        "analysis",
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(EMBEDDING_MODEL_NAME, torch_threads),
+    )
+
+
+# Global analysis pool instance
+analysis_pool = _build_analysis_pool()
+
+
+def get_analysis_pool() -> Optional[WarmProcessPool]:
+    """
+    Get the global analysis process pool.
+
+    Returns:
+        WarmProcessPool instance, or None when analysis runs in threads
+    """
+    return analysis_pool
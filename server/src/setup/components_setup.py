@@ -0,0 +1,104 @@
+"""
+This script sets up the process-wide component registry.
+
+# Components (each created once, on first use):
+- llm: shared RouterChatModel used by every agent
+- embedding_model: SentenceTransformer owned by the embedding setup (lazy loader)
+- filters_rag: FiltersRAG on the single ChromaDB client
+- query_refiner, data_collector, query_generator, data_analyzer, theme_modifier: agents
+- workflow: SprinklrWorkflow (registered by src.workflow)
+
+# Purpose:
+- Build every heavy object exactly once and inject it wherever it is needed
+- Avoid duplicate models, Chroma clients and settings objects in one process
+"""
+
+from typing import Any
+
+from src.utils.component_registry import ComponentRegistry
+
+
+def _load_llm():
+    from src.setup.llm_setup import llm_setup
+    return llm_setup.get_agent_llm("workflow")
+
+
+def _load_embedding_model():
+    from src.setup.embedding_setup import get_embedding_model
+    model = get_embedding_model()._get_model()
+    if model is None:
+        raise RuntimeError("Failed to load embedding model")
+    return model
+
+
+def _load_filters_rag():
+    from src.rag.filters_rag import get_filters_rag
+    return get_filters_rag()
+
+
+def _load_query_refiner():
+    from src.agents.query_refiner_agent import QueryRefinerAgent
+    return QueryRefinerAgent(get_component("llm"), rag_system=get_component("filters_rag"))
+
+
+def _load_data_collector():
+    from src.agents.data_collector_agent import DataCollectorAgent
+    return DataCollectorAgent(get_component("llm"))
+
+
+def _load_query_generator():
+    from src.agents.query_generator_agent import QueryGeneratorAgent
+    return QueryGeneratorAgent(get_component("llm"))
+
+
+def _load_data_analyzer():
+    from src.agents.data_analyzer_agent2 import DataAnalyzerAgent
+    return DataAnalyzerAgent(
+        get_component("llm"),
+        query_generator=get_component("query_generator"),
+        embedding_model=get_component("embedding_model"),
+    )
+
+
+def _load_theme_modifier():
+    from src.agents.theme_modifier_agent import ThemeModifierAgent
+    return ThemeModifierAgent(
+        get_component("llm"),
+        query_generator=get_component("query_generator"),
+        embedding_model=get_component("embedding_model"),
+    )
+
+
+# Global component registry instance
+component_registry = ComponentRegistry()
+component_registry.register("llm", _load_llm)
+component_registry.register("embedding_model", _load_embedding_model)
+component_registry.register("filters_rag", _load_filters_rag)
+component_registry.register("query_refiner", _load_query_refiner)
+component_registry.register("data_collector", _load_data_collector)
+component_registry.register("query_generator", _load_query_generator)
+component_registry.register("data_analyzer", _load_data_analyzer)
+component_registry.register("theme_modifier", _load_theme_modifier)
+
+
+def get_component_registry() -> ComponentRegistry:
+    """
+    Get the global component registry.
+
+    Returns:
+        ComponentRegistry instance
+    """
+    return component_registry
+
+
+def get_component(name: str) -> Any:
+    """
+    Get a shared component, creating it on first use.
+
+    Args:
+        name: Component name (llm, embedding_model, filters_rag, agent names, workflow)
+
+    Returns:
+        The shared component instance
+    """
+    return component_registry.get(name)
@@ -3,6 +3,7 @@ Modern RouterChatModel that supports both GoogleGenerativeAI (development)
 and LLM Router (production) while maintaining full LangChain/LangGraph compatibility.
 """
 
+import asyncio
 import os
 import requests
 import logging
@@ -17,6 +18,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.config.settings import settings
+from src.utils.metrics import current_node, observe_stage
+from src.setup.admission_setup import admission_controller
 
 logger = logging.getLogger(__name__)
 
@@ -131,8 +134,8 @@ class RouterChatModel(BaseLLM):
         Returns:
             Generated response string
         """
-        # For now, delegate to sync generate
-        return self._generate(messages, stop, run_manager, **kwargs)
+        # The router and Gemini clients are blocking; run them off the event loop
+        return await asyncio.to_thread(self._generate, messages, stop, run_manager, **kwargs)
 
     def invoke(self, messages: Union[List[BaseMessage], str], **kwargs) -> AIMessage:
         """
@@ -149,8 +152,10 @@ class RouterChatModel(BaseLLM):
         if isinstance(messages, str):
             messages = [HumanMessage(content=messages)]
         
-        # Generate response
-        content = self._generate(messages, **kwargs)
+        # Generate response (attributed to the graph node issuing the call)
+        with observe_stage("llm", current_node.get()) as stage:
+            content = self._generate(messages, **kwargs)
+            stage.payload_bytes = len(content or "")
         
         # Return as AIMessage for LangChain compatibility
         return AIMessage(content=content)
@@ -170,8 +175,12 @@ class RouterChatModel(BaseLLM):
         if isinstance(messages, str):
             messages = [HumanMessage(content=messages)]
         
-        # Generate response
-        content = await self._agenerate(messages, **kwargs)
+        # Generate response (attributed to the graph node issuing the call);
+        # time spent waiting for an LLM slot is reported as admission wait
+        async with admission_controller.slot("llm"):
+            with observe_stage("llm", current_node.get()) as stage:
+                content = await self._agenerate(messages, **kwargs)
+                stage.payload_bytes = len(content or "")
         
         # Return as AIMessage for LangChain compatibility
         return AIMessage(content=content)
@@ -0,0 +1,165 @@
+"""
+This script sets up the shared HTTP client used to talk to the Sprinklr API.
+
+# HTTP Client:
+- httpx.AsyncClient: One long-lived client per process with a keep-alive pool
+- HTTP/2 when the `h2` package is available, HTTP/1.1 otherwise
+- Connection limits and timeouts configured through settings
+
+# Purpose:
+- Avoid a fresh TCP/TLS handshake on every `get_sprinklr_data` call
+- Build the static headers and parsed cookies once instead of per request
+- Give the FastAPI app an explicit place to close the pool on shutdown
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SprinklrClientSetup:
+    """
+    Owns the process-wide pooled httpx client for the Sprinklr API.
+
+    The client is created lazily on first use and re-created if the running
+    event loop changes (e.g. between `asyncio.run` calls in test scripts),
+    since httpx connection pools are bound to the loop that opened them.
+    """
+
+    def __init__(self):
+        """Initialize the client setup and build the static request parts once."""
+        self.headers = self._build_headers()
+        self.cookies = self._parse_cookies(settings.SPRINKLR_COOKIES)
+        self.http2 = settings.SPRINKLR_HTTP2 and self._h2_available()
+        self.limits = httpx.Limits(
+            max_connections=settings.SPRINKLR_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SPRINKLR_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SPRINKLR_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(
+            connect=settings.SPRINKLR_CONNECT_TIMEOUT,
+            read=settings.SPRINKLR_READ_TIMEOUT,
+            write=settings.SPRINKLR_CONNECT_TIMEOUT,
+            pool=settings.SPRINKLR_POOL_TIMEOUT,
+        )
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        logger.info(f"SprinklrClientSetup initialized (http2={self.http2}, max_connections={settings.SPRINKLR_MAX_CONNECTIONS})")
+
+    @staticmethod
+    def _h2_available() -> bool:
+        """Check whether the optional `h2` dependency needed for HTTP/2 is installed."""
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("h2 package not installed - Sprinklr client will use HTTP/1.1")
+            return False
+
+    @staticmethod
+    def _parse_cookies(cookie_string: str) -> Dict[str, str]:
+        """
+        Parse a raw `Cookie` header string into a dictionary.
+
+        Args:
+            cookie_string: Cookie string in `key=value; key2=value2` format
+
+        Returns:
+            Dictionary of cookie names to values
+        """
+        cookies = {}
+        if cookie_string:
+            for cookie in cookie_string.split(';'):
+                if '=' in cookie:
+                    key, value = cookie.strip().split('=', 1)
+                    cookies[key] = value
+        return cookies
+
+    @staticmethod
+    def _build_headers() -> Dict[str, str]:
+        """Build the hardcoded Sprinklr headers (as per api-communication.md - DO NOT CHANGE)."""
+        return {
+            'accept': 'text/event-stream',
+            'accept-language': 'en-US,en;q=0.9',
+            'baggage': settings.SPRINKLR_BAGGAGE,
+            'cache-control': 'no-cache',
+            'content-type': 'application/json',
+            'origin': 'https://space-p0-lst-poc.sprinklr.com',
+            'pragma': 'no-cache',
+            'priority': 'u=1, i',
+            'referer': 'https://space-p0-lst-poc.sprinklr.com/research/insights/listening/dashboard/6837f747ace369431e594a71/tab/17?DATE_RANGE_CONFIG=%7B%22dateRange%22%3A%7B%22option%22%3A%22LAST_30_DAYS%22%7D%2C%22timezone%22%3A%22Asia%2FKolkata%22%2C%22previousDateRange%22%3A%7B%22option%22%3A%22PREVIOUS_PERIOD_OPTION%22%7D%7D',
+            'sec-ch-ua': '"Google Chrome";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
+            'sec-ch-ua-mobile': '?0',
+            'sec-ch-ua-platform': '"macOS"',
+            'sec-fetch-dest': 'empty',
+            'sec-fetch-mode': 'cors',
+            'sec-fetch-site': 'same-origin',
+            'sentry-trace': settings.SPRINKLR_SENTRY_TRACE,
+            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
+            'x-csrf-token': settings.SPRINKLR_X_CSRF_TOKEN,
+            'x-request-id': settings.SPRINKLR_X_REQUEST_ID,
+            'x-user-context': settings.SPRINKLR_X_USER_CONTEXT
+        }
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a new pooled AsyncClient with the configured limits and timeouts."""
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.limits,
+            timeout=self.timeout,
+            headers=self.headers,
+            cookies=self.cookies,
+        )
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared AsyncClient, creating it on first use.
+
+        Returns:
+            Pooled httpx.AsyncClient bound to the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                logger.info("Event loop changed - recreating Sprinklr HTTP client")
+            self._client = self._create_client()
+            self._loop = loop
+            logger.info("Created pooled Sprinklr HTTP client")
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and release pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("✅ Sprinklr HTTP client closed")
+        self._client = None
+        self._loop = None
+
+
+# Global Sprinklr client setup instance
+sprinklr_client_setup = SprinklrClientSetup()
+
+
+def get_sprinklr_client() -> httpx.AsyncClient:
+    """
+    Get the global pooled Sprinklr HTTP client.
+
+    Returns:
+        httpx.AsyncClient instance
+    """
+    return sprinklr_client_setup.get_client()
+
+
+async def close_sprinklr_client() -> None:
+    """
+    Close the global Sprinklr HTTP client.
+    Should be called during application shutdown.
+    """
+    await sprinklr_client_setup.aclose()
@@ -4,134 +4,723 @@ This module Consists of the List of Functions to Fetch Data from Different APIs,
 """
 
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Union
 from langchain.tools import tool
 import logging
 import httpx
 import json
 import asyncio # Added import for asyncio.sleep
-import os
 import sys
-from src.utils.files_helper import import_module_from_file
-
-# Get path to config directory
-current_dir = os.path.dirname(os.path.abspath(__file__))
-config_path = os.path.join(current_dir, '..', 'config')
-settings_module = import_module_from_file(os.path.join(config_path, 'settings.py'), 'settings')
-settings = settings_module.settings
+from src.config.settings import settings
+from src.setup.sprinklr_client_setup import get_sprinklr_client
+from src.utils.hits_helper import fast_json_loads, merge_and_dedupe_hits, proportional_limit, split_time_window, subtract_windows
+from src.utils.hit_stream_parser import HitStreamParser
+from src.utils.hit_store import HitStore
+from src.utils.hit_cache import get_hit_cache, make_cache_key, make_query_key
+from src.utils.fetch_window_index import FetchedWindowIndex
+from src.utils.filters_helper import build_api_filters
+from src.utils.single_flight import SingleFlight
+from src.utils.rate_limiter import AdaptiveRateLimiter, jittered_backoff, parse_retry_after
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.metrics import observe_stage
+from src.setup.admission_setup import admission_controller
+from src.utils.admission import OverloadedError
 
 logger = logging.getLogger(__name__)
 
+# API URL from api-communication.md (overridable, e.g. to target the local mock server)
+SPRINKLR_MENTIONS_API_URL = settings.SPRINKLR_MENTIONS_API_URL
+
+# Default reporting window (epoch ms) used for every request
+DEFAULT_FROM_TIME = 1746988200000
+DEFAULT_UPTO_TIME = 1749580199999
+
+MAX_RETRIES = 3
+
+# Coalesces identical concurrent fetches into one upstream request
+sprinklr_fetch_flight = SingleFlight("sprinklr_fetch")
+
+# Windows already fetched (and cached) per canonical query, for delta fetches
+fetched_window_index = FetchedWindowIndex(
+    max_queries=settings.DELTA_FETCH_MAX_QUERIES,
+    ttl_seconds=settings.HIT_CACHE_TTL_SECONDS,
+)
+
+# Shared by every caller so the combined request rate stays within budget
+sprinklr_rate_limiter = AdaptiveRateLimiter(
+    "sprinklr",
+    rate_per_second=settings.SPRINKLR_RATE_LIMIT_PER_SECOND,
+    burst=settings.SPRINKLR_RATE_LIMIT_BURST,
+    min_rate_per_second=settings.SPRINKLR_RATE_LIMIT_MIN_PER_SECOND,
+)
+
+# Fails fast while the Sprinklr API is unhealthy instead of stacking timeouts
+sprinklr_circuit_breaker = CircuitBreaker(
+    "sprinklr",
+    failure_threshold=settings.SPRINKLR_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.SPRINKLR_CIRCUIT_RESET_SECONDS,
+)
+
+
+class SprinklrFetchError(Exception):
+    """Raised when a Sprinklr get-mentions request fails after all retries."""
+
+
+async def _acquire_request_slot() -> None:
+    """
+    Pass the circuit breaker and wait for a rate-limiter token before a request.
+
+    Raises:
+        SprinklrFetchError: If the circuit is open
+    """
+    try:
+        sprinklr_circuit_breaker.before_call()
+    except CircuitOpenError as e:
+        raise SprinklrFetchError(str(e)) from e
+
+    try:
+        await sprinklr_rate_limiter.acquire()
+    except BaseException:
+        sprinklr_circuit_breaker.release_probe()
+        raise
+
+
+def _record_success() -> None:
+    """Feed a successful response back into the breaker and limiter."""
+    sprinklr_circuit_breaker.record_success()
+    sprinklr_rate_limiter.on_success()
+
+
+def _handle_error_status(response: httpx.Response, attempt: int) -> float:
+    """
+    Record a non-2xx response and decide whether to retry.
+
+    Args:
+        response: The failed response
+        attempt: Zero-based attempt number
+
+    Returns:
+        Seconds to sleep before the next attempt
+
+    Raises:
+        SprinklrFetchError: If the status is not retryable, retries are exhausted
+            or Retry-After asks for a longer wait than we are willing to block for
+    """
+    status = response.status_code
+    retry_after = None
+
+    if status == 429:
+        # Throttling: slow every caller down, but the API itself is healthy
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        sprinklr_rate_limiter.on_throttle(retry_after)
+        sprinklr_circuit_breaker.release_probe()
+    elif status >= 500:
+        sprinklr_circuit_breaker.record_failure()
+    else:
+        # Other 4xx are request problems - retrying will not help
+        sprinklr_circuit_breaker.record_success()
+        raise SprinklrFetchError(f"HTTP {status}: {response.text[:200]}")
+
+    if attempt == MAX_RETRIES - 1:
+        raise SprinklrFetchError(f"HTTP {status} after {MAX_RETRIES} attempts")
+    return _retry_delay(attempt, retry_after)
+
+
+def _retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before the next attempt.
+
+    Args:
+        attempt: Zero-based attempt number that just failed
+        retry_after: Seconds requested by a Retry-After header, if any
+
+    Returns:
+        Seconds to sleep
+
+    Raises:
+        SprinklrFetchError: If Retry-After exceeds SPRINKLR_MAX_RETRY_AFTER_SECONDS
+    """
+    if retry_after is not None:
+        if retry_after > settings.SPRINKLR_MAX_RETRY_AFTER_SECONDS:
+            raise SprinklrFetchError(f"Sprinklr asked to retry after {retry_after:.0f}s - giving up")
+        # The shared limiter is paused until Retry-After elapses, so no extra sleep is needed
+        return 0.0
+    return jittered_backoff(attempt, settings.SPRINKLR_BACKOFF_BASE_SECONDS, settings.SPRINKLR_BACKOFF_MAX_SECONDS)
+
+
+def _build_request_body(
+    query: str,
+    number_of_messages: int,
+    from_time: int,
+    upto_time: int,
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Build the get-mentions request body for a single time window."""
+    # Generate unique request ID and key
+    request_key = "25fac0b8-b533-4959-9434-c8d230eb539d"
+
+    return {
+        "filters": [
+            {
+                "field": "QUERY",
+                "values": [
+                    query
+                ]
+            },
+            # Source/country/language/gender filters from the data collector
+            *(api_filters or [])
+        ],
+        "report": "SPRINKSIGHTS",
+        "reportingEngine": "LISTENING",
+        "fromTime": from_time,
+        "uptoTime": upto_time,
+        "applyAccessibilityFilters": True,
+        "key": request_key,
+        "timezone": "Asia/Kolkata",
+        "tzOffset": -19800000,
+        "generateDescriptiveSummary": False,
+        "numberOfMessages": number_of_messages,
+        "bucketMessageCount": f"{int(number_of_messages / 10)}",
+    }
+
+
+async def _fetch_window(
+    query: str,
+    number_of_messages: int,
+    from_time: int,
+    upto_time: int,
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch hits for a single time window with retries.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        number_of_messages: Number of messages to request
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        api_filters: Additional get-mentions filter clauses
+
+    Returns:
+        List of hits for the window
+
+    Raises:
+        SprinklrFetchError: If the request keeps failing or the response cannot be parsed
+    """
+    request_body = _build_request_body(query, number_of_messages, from_time, upto_time, api_filters)
+
+    # Shared pooled client - headers and cookies are configured once on the client
+    client = get_sprinklr_client()
+    with observe_stage("fetch", "window") as stage:
+        for attempt in range(MAX_RETRIES):
+            await _acquire_request_slot()
+            try:
+                async with admission_controller.slot("fetch"):
+                    response = await client.post(SPRINKLR_MENTIONS_API_URL, json=request_body)
+            except httpx.RequestError as e:
+                sprinklr_circuit_breaker.record_failure()
+                logger.error(f"Sprinklr API request error: {e}")
+                if attempt == MAX_RETRIES - 1:
+                    raise SprinklrFetchError(f"Request error after {MAX_RETRIES} attempts: {e}") from e
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+            except BaseException:
+                sprinklr_circuit_breaker.release_probe()
+                raise
+
+            if not response.is_success:
+                logger.error(f"Sprinklr API request failed with status {response.status_code}: {response.text[:500]}") # Log snippet of error
+                await asyncio.sleep(_handle_error_status(response, attempt))
+                continue
+
+            _record_success()
+            try:
+                # Parse JSON response straight from the raw bytes (orjson when available)
+                response_data = fast_json_loads(response.content)
+            except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+                logger.error(f"Error decoding Sprinklr API JSON response: {e}. Response text: {response.text[:500]}")
+                raise SprinklrFetchError(f"Invalid JSON response: {e}") from e # Cannot parse response
+
+            # The response is an array of objects as per api-communication.md
+            hits = response_data if isinstance(response_data, list) else []
+            stage.items = len(hits)
+            stage.payload_bytes = len(response.content)
+            return hits
+
+        raise SprinklrFetchError("Sprinklr fetch exhausted retries")
+
+
+async def _fetch_sharded(
+    query: str,
+    number_of_messages: int,
+    from_time: int,
+    upto_time: int,
+    shards: int,
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Fetch a window as N concurrent sub-window requests and merge the results.
+
+    Failed shards are logged and skipped so one bad sub-window does not
+    discard the hits fetched for the others. Admission rejections are not
+    shard failures: they are raised so the request is answered with 503.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        number_of_messages: Total number of messages to return
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        shards: Number of sub-windows
+        api_filters: Additional get-mentions filter clauses
+
+    Returns:
+        Tuple of (merged hits deduplicated on mention id, whether every shard succeeded)
+
+    Raises:
+        OverloadedError: If the fetch stage rejected a shard
+    """
+    windows = split_time_window(from_time, upto_time, shards)
+    per_shard = max(1, -(-number_of_messages // len(windows)))  # ceil division
+
+    logger.info(f"Fetching {len(windows)} shards of {per_shard} messages (concurrency={settings.SPRINKLR_SHARD_CONCURRENCY})")
+    results = _raise_overload(await _fetch_windows(query, [(start, end, per_shard) for start, end in windows], api_filters))
+
+    shard_hits = []
+    failed = 0
+    for window, result in zip(windows, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning(f"Shard {window[0]}-{window[1]} failed: {result}")
+            continue
+        shard_hits.append(result)
+
+    if failed:
+        logger.warning(f"{failed}/{len(windows)} shards failed - returning partial results")
+
+    return merge_and_dedupe_hits(shard_hits, limit=number_of_messages), failed == 0
+
+
+async def _fetch_windows(
+    query: str,
+    windows: List[Tuple[int, int, int]],
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> List[Any]:
+    """
+    Fetch several (from_time, upto_time, limit) windows concurrently.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        windows: Windows to fetch
+        api_filters: Additional get-mentions filter clauses
+
+    Returns:
+        Per-window hit lists, or the exception raised for that window
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.SPRINKLR_SHARD_CONCURRENCY))
+
+    async def fetch_one(window):
+        async with semaphore:
+            return await _fetch_window(query, window[2], window[0], window[1], api_filters)
+
+    return await asyncio.gather(*(fetch_one(w) for w in windows), return_exceptions=True)
+
+
+def _raise_overload(results: List[Any]) -> List[Any]:
+    """Re-raise an admission rejection from per-window results (other errors stay per window)."""
+    for result in results:
+        if isinstance(result, OverloadedError):
+            raise result
+    return results
+
+
+def _request_extra(api_filters: Optional[List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Request parameters beyond query/window/limit that change the result set (part of cache keys)."""
+    return {"filters": api_filters} if api_filters else None
+
+
+async def _cache_window(
+    query: str,
+    from_time: int,
+    upto_time: int,
+    limit: int,
+    hits: List[Dict[str, Any]],
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Cache a completely fetched window and index it for later delta fetches."""
+    if not settings.HIT_CACHE_ENABLED:
+        return
+    extra = _request_extra(api_filters)
+    await get_hit_cache().aput(make_cache_key(query, from_time, upto_time, limit, extra), hits)
+    if settings.DELTA_FETCH_ENABLED and hits:
+        fetched_window_index.record(make_query_key(query, extra), from_time, upto_time, limit)
+
+
+async def _fetch_delta(
+    query: str,
+    number_of_messages: int,
+    from_time: int,
+    upto_time: int,
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+    """
+    Serve a window from cached sub-windows of the same query plus fetches of the uncovered sub-ranges.
+
+    Each part contributes hits in proportion to its share of the window, as
+    with sharded fetches. A cached window is only reused if it was fetched
+    densely enough for that share (or holds every mention in its range).
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        number_of_messages: Total number of messages to return
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        api_filters: Additional get-mentions filter clauses
+
+    Returns:
+        Tuple of (merged hits, whether every uncovered sub-range was fetched),
+        or None if no cached window can be reused
+    """
+    extra = _request_extra(api_filters)
+    query_key = make_query_key(query, extra)
+    parts = []  # (window start, hits)
+    covered = []
+
+    for window in fetched_window_index.covering_windows(query_key, from_time, upto_time):
+        window_from, window_upto, window_limit = window
+        hits = await get_hit_cache().aget(make_cache_key(query, window_from, window_upto, window_limit, extra))
+        if hits is None:
+            fetched_window_index.forget(query_key, window)
+            continue
+        share = proportional_limit(number_of_messages, window_from, window_upto, from_time, upto_time)
+        if len(hits) < share and len(hits) >= window_limit:
+            continue  # Truncated sample sparser than this request needs
+        parts.append((window_from, hits[:share]))
+        covered.append((window_from, window_upto))
+
+    if not covered:
+        return None
+
+    gaps = [
+        (start, end, proportional_limit(number_of_messages, start, end, from_time, upto_time))
+        for start, end in subtract_windows(from_time, upto_time, covered)
+    ]
+    logger.info(f"Delta fetch: reusing {len(covered)} cached windows, fetching {len(gaps)} uncovered sub-ranges")
+
+    failed = 0
+    for gap, result in zip(gaps, _raise_overload(await _fetch_windows(query, gaps, api_filters))):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning(f"Delta sub-range {gap[0]}-{gap[1]} failed: {result}")
+            continue
+        parts.append((gap[0], result))
+        await _cache_window(query, gap[0], gap[1], gap[2], result, api_filters)
+
+    parts.sort(key=lambda part: part[0])
+    return merge_and_dedupe_hits((hits for _, hits in parts), limit=number_of_messages), failed == 0
+
+
+async def _read_stream(
+    client: httpx.AsyncClient,
+    request_body: Dict[str, Any],
+    parser: HitStreamParser,
+    queue: asyncio.Queue,
+    attempt: int
+) -> Optional[float]:
+    """
+    Download one streamed response under a fetch slot, queueing hits as they are parsed.
+
+    Args:
+        client: Shared Sprinklr HTTP client
+        request_body: get-mentions request body
+        parser: Incremental parser for this attempt
+        queue: Queue that receives each parsed hit
+        attempt: Zero-based attempt number (for the retry delay)
+
+    Returns:
+        Seconds to wait before retrying, or None when the body was read completely
+
+    Raises:
+        OverloadedError: If the fetch stage is saturated
+        SprinklrFetchError: For non-retryable error statuses
+    """
+    async with admission_controller.slot("fetch"), client.stream("POST", SPRINKLR_MENTIONS_API_URL, json=request_body) as response:
+        if not response.is_success:
+            await response.aread()
+            logger.error(f"Sprinklr API stream failed with status {response.status_code}")
+            return _handle_error_status(response, attempt)
+        _record_success()
+        async for chunk in response.aiter_text():
+            for hit in parser.feed(chunk):
+                queue.put_nowait(hit)
+    for hit in parser.close():
+        queue.put_nowait(hit)
+    return None
+
+
+async def stream_sprinklr_data(
+    query: str,
+    limit: int = 0,
+    from_time: int = DEFAULT_FROM_TIME,
+    upto_time: int = DEFAULT_UPTO_TIME,
+    api_filters: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream hits from the Sprinklr API as they are parsed off the wire.
+
+    The response body is parsed incrementally, so consumers can start text
+    extraction and embedding while the download is still in progress.
+    Requests go through the shared rate limiter and circuit breaker and are
+    retried only until the first hit has been yielded; a failure after that
+    ends the stream early with the hits already delivered. The fetch
+    admission slot covers only the download, not the consumer's work.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        limit: Number of messages to request. If 0, defaults to 500.
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        api_filters: Additional get-mentions filter clauses (see build_api_filters)
+
+    Yields:
+        Hit dictionaries in response order
+    """
+    number_of_messages = limit if limit > 0 else 500
+
+    cache_key = make_cache_key(query, from_time, upto_time, number_of_messages, _request_extra(api_filters))
+    if settings.HIT_CACHE_ENABLED:
+        cached_hits = await get_hit_cache().aget(cache_key)
+        if cached_hits is not None:
+            logger.info(f"Hit cache HIT - streaming {len(cached_hits)} cached hits without calling Sprinklr")
+            for hit in cached_hits:
+                yield hit
+            return
+
+    request_body = _build_request_body(query, number_of_messages, from_time, upto_time, api_filters)
+    client = get_sprinklr_client()
+
+    logger.info(f"Streaming Sprinklr data for query: {query} and with numberOfMessages: {number_of_messages}")
+
+    yielded = 0
+    for attempt in range(MAX_RETRIES):
+        parser = HitStreamParser()
+        streamed_hits = []
+        try:
+            await _acquire_request_slot()
+        except SprinklrFetchError as e:
+            logger.error(f"Sprinklr API stream rejected: {e}")
+            return
+
+        try:
+            # The download runs in its own task so the fetch slot is released as
+            # soon as the body is read, not held while the consumer processes hits
+            queue: asyncio.Queue = asyncio.Queue()
+            reader = asyncio.create_task(_read_stream(client, request_body, parser, queue, attempt))
+            reader.add_done_callback(lambda _: queue.put_nowait(None))
+            try:
+                while (hit := await queue.get()) is not None:
+                    streamed_hits.append(hit)
+                    yielded += 1
+                    yield hit
+                delay = reader.result()
+            finally:
+                reader.cancel()
+
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+
+            logger.info(f"Successfully streamed {yielded} hits from Sprinklr API.")
+            # Only complete streams are cached
+            await _cache_window(query, from_time, upto_time, number_of_messages, streamed_hits, api_filters)
+            return
+
+        except SprinklrFetchError as e:
+            logger.error(f"Sprinklr API stream failed: {e}")
+            return
+        except (httpx.RequestError, ValueError) as e:
+            sprinklr_circuit_breaker.record_failure()
+            logger.error(f"Sprinklr API stream error: {e}")
+
+            if yielded:
+                logger.warning(f"Stream interrupted after {yielded} hits - returning partial results")
+                return
+            if attempt == MAX_RETRIES - 1:
+                return
+            await asyncio.sleep(_retry_delay(attempt))
+        except BaseException:
+            sprinklr_circuit_breaker.release_probe()
+            raise
+
+
+async def _get_hits(
+    query: str,
+    number_of_messages: int,
+    from_time: int,
+    upto_time: int,
+    shards: int,
+    api_filters: Optional[List[Dict[str, Any]]] = None,
+    as_store: bool = False
+) -> Union[List[Dict[str, Any]], HitStore]:
+    """
+    Resolve a fetch through the hit cache and single-flight group.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        number_of_messages: Number of messages to request
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        shards: Number of parallel sub-windows (<= 1 for a single request)
+        api_filters: Additional get-mentions filter clauses
+        as_store: Return a HitStore; cached payloads are then parsed straight into columns
+
+    Returns:
+        HitStore if as_store, else a list of hits. Cache hits are decoded for
+        this caller alone; callers that joined one single-flight fetch get
+        separate lists over the same hit dicts, so treat the hits as read-only.
+
+    Raises:
+        SprinklrFetchError: If the upstream fetch fails
+    """
+    # Content-addressed cache - sharding does not change the result set, so it is not part of the key
+    cache_key = make_cache_key(query, from_time, upto_time, number_of_messages, _request_extra(api_filters))
+    if settings.HIT_CACHE_ENABLED and as_store:
+        payload = await get_hit_cache().aget_payload(cache_key)
+        if payload is not None:
+            store = await asyncio.to_thread(HitStore.from_json, payload)
+            logger.info(f"Hit cache HIT - projected {len(store)} cached hits into columns without calling Sprinklr")
+            return store
+    elif settings.HIT_CACHE_ENABLED:
+        cached_hits = await get_hit_cache().aget(cache_key)
+        if cached_hits is not None:
+            logger.info(f"Hit cache HIT - returning {len(cached_hits)} cached hits without calling Sprinklr")
+            return cached_hits
+
+    async def fetch() -> List[Dict[str, Any]]:
+        logger.info(f"Fetching Sprinklr data for query: {query} and with numberOfMessages: {number_of_messages}")
+        delta = None
+        if settings.HIT_CACHE_ENABLED and settings.DELTA_FETCH_ENABLED:
+            delta = await _fetch_delta(query, number_of_messages, from_time, upto_time, api_filters)
+
+        if delta is not None:
+            hits, complete = delta
+        elif shards > 1 and number_of_messages >= settings.SPRINKLR_SHARD_MIN_MESSAGES:
+            hits, complete = await _fetch_sharded(query, number_of_messages, from_time, upto_time, shards, api_filters)
+        else:
+            hits, complete = await _fetch_window(query, number_of_messages, from_time, upto_time, api_filters), True
+
+        logger.info(f"Successfully fetched {len(hits)} hits from Sprinklr API.")
+        # Partial (degraded) results are not cached
+        if complete:
+            await _cache_window(query, from_time, upto_time, number_of_messages, hits, api_filters)
+        return hits
+
+    if not settings.SPRINKLR_SINGLE_FLIGHT_ENABLED:
+        hits = await fetch()
+    else:
+        # Identical concurrent requests share one upstream call; each caller gets its own list
+        hits = list(await sprinklr_fetch_flight.do(cache_key, fetch))
+    return HitStore.from_hits(hits) if as_store else hits
+
+
+async def _resolve_hits(
+    query: str,
+    limit: int,
+    shards: int,
+    from_time: int,
+    upto_time: int,
+    filters: Optional[Dict[str, Any]],
+    as_store: bool
+) -> Union[List[Dict[str, Any]], HitStore]:
+    """
+    Apply the tool defaults and fetch, reporting errors as an empty result.
+
+    Raises:
+        OverloadedError: If the fetch stage is saturated
+    """
+    numberOfMessages = limit if limit > 0 else 500  # Default to 500 messages
+    shards = shards if shards > 0 else settings.SPRINKLR_FETCH_SHARDS
+
+    try:
+        # Covers cache hits, delta and sharded fetches; per-request timings are under "window"
+        with observe_stage("fetch", "get_sprinklr_data") as stage:
+            hits = await _get_hits(
+                query,
+                numberOfMessages,
+                from_time or DEFAULT_FROM_TIME,
+                upto_time or DEFAULT_UPTO_TIME,
+                shards,
+                build_api_filters(filters),
+                as_store
+            )
+            stage.items = len(hits)
+        return hits
+
+    except OverloadedError:
+        raise  # Answered with 503 + Retry-After, not as "no data"
+    except SprinklrFetchError as e:
+        logger.error(f"Sprinklr fetch failed: {e} (circuit={sprinklr_circuit_breaker.state})")
+    except Exception as e:
+        logger.error(f"An unexpected error occurred while fetching Sprinklr data: {e}")
+    return HitStore.from_hits([]) if as_store else []
+
+
+async def fetch_hit_store(
+    query: str,
+    limit: int = 0,
+    shards: int = 0,
+    from_time: int = 0,
+    upto_time: int = 0,
+    filters: Optional[Dict[str, Any]] = None
+) -> HitStore:
+    """
+    Fetch hits like get_sprinklr_data, but into a compact HitStore.
+
+    Cached windows are parsed from the serialized cache payload straight into
+    columns, so the full list of hit dicts is never built for them.
+
+    Args:
+        query: The boolean_keyword_query for the Sprinklr API
+        limit: Number of messages to request. If 0, defaults to 500.
+        shards: Number of parallel time sub-windows. If 0, uses SPRINKLR_FETCH_SHARDS.
+        from_time: Window start in epoch ms. If 0, uses the default reporting window.
+        upto_time: Window end in epoch ms. If 0, uses the default reporting window.
+        filters: Source/country/language/gender filters (filters.json keys) applied by the API
+
+    Returns:
+        HitStore of the fetched hits (empty if an error occurs)
+
+    Raises:
+        OverloadedError: If the fetch stage is saturated
+    """
+    return await _resolve_hits(query, limit, shards, from_time, upto_time, filters, as_store=True)
+
+
 @tool("Get Sprinklr Data")
 async def get_sprinklr_data(
     query: str, 
-    limit: int = 0
+    limit: int = 0,
+    shards: int = 0,
+    from_time: int = 0,
+    upto_time: int = 0,
+    filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Fetch data from Sprinklr API based on a query and optional filters.
 
         Args:
             query: The boolean_keyword_query for the Sprinklr API.
-            limit: The page_size for the request. If 0 or not provided, defaults to 10.
+            limit: The page_size for the request. If 0 or not provided, defaults to 500.
+            shards: Number of parallel time sub-windows. If 0, uses SPRINKLR_FETCH_SHARDS.
+            from_time: Window start in epoch ms. If 0, uses the default reporting window.
+            upto_time: Window end in epoch ms. If 0, uses the default reporting window.
+            filters: Source/country/language/gender filters (filters.json keys) applied by the API.
 
         Returns:
             A list of hits from the Sprinklr API response, or an empty list if an error occurs.
+
+        Raises:
+            OverloadedError: If the fetch stage is saturated
         """
-        
-        # API URL from api-communication.md
-        api_url = "https://space-p0-lst-poc.sprinklr.com/ui/rest/chatgpt/stream/get-mentions/9004/MESSAGE_STREAM_SUMMARIZATION_STREAM"
-        numberOfMessages = limit if limit > 0 else 500  # Default to 10 as per api-communication.md
-        
-        # Generate unique request ID and key
-        request_key = "25fac0b8-b533-4959-9434-c8d230eb539d"
-        # Hardcoded headers as per api-communication.md - DO NOT CHANGE
-        headers = {
-            'accept': 'text/event-stream',
-            'accept-language': 'en-US,en;q=0.9',
-            'baggage': settings.SPRINKLR_BAGGAGE,
-            'cache-control': 'no-cache',
-            'content-type': 'application/json',
-            'origin': 'https://space-p0-lst-poc.sprinklr.com',
-            'pragma': 'no-cache',
-            'priority': 'u=1, i',
-            'referer': 'https://space-p0-lst-poc.sprinklr.com/research/insights/listening/dashboard/6837f747ace369431e594a71/tab/17?DATE_RANGE_CONFIG=%7B%22dateRange%22%3A%7B%22option%22%3A%22LAST_30_DAYS%22%7D%2C%22timezone%22%3A%22Asia%2FKolkata%22%2C%22previousDateRange%22%3A%7B%22option%22%3A%22PREVIOUS_PERIOD_OPTION%22%7D%7D',
-            'sec-ch-ua': '"Google Chrome";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"macOS"',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'sentry-trace': settings.SPRINKLR_SENTRY_TRACE,
-            'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-            'x-csrf-token': settings.SPRINKLR_X_CSRF_TOKEN,
-            'x-request-id': settings.SPRINKLR_X_REQUEST_ID,
-            'x-user-context': settings.SPRINKLR_X_USER_CONTEXT
-        }
-
-        request_body = {
-            "filters": [
-                {
-                    "field": "QUERY",
-                    "values": [
-                        query
-                    ]
-                }
-            ],
-            "report": "SPRINKSIGHTS",
-            "reportingEngine": "LISTENING",
-            "fromTime": 1746988200000,
-            "uptoTime": 1749580199999,
-            "applyAccessibilityFilters": True,
-            "key": request_key,
-            "timezone": "Asia/Kolkata",
-            "tzOffset": -19800000,
-            "generateDescriptiveSummary": False,
-            "numberOfMessages": numberOfMessages,
-            "bucketMessageCount": f"{int(numberOfMessages / 10)}",
-        }
-
-        # Parse cookies from settings
-        cookies = {}
-        if settings.SPRINKLR_COOKIES:
-            # Parse cookie string format
-            for cookie in settings.SPRINKLR_COOKIES.split(';'):
-                if '=' in cookie:
-                    key, value = cookie.strip().split('=', 1)
-                    cookies[key] = value
-
-        logger.info(f"Fetching Sprinklr data for query: {query} and with numberOfMessages: {numberOfMessages}")
-
-        async with httpx.AsyncClient(timeout=90, cookies=cookies) as client:
-            for attempt in range(3):
-                try:
-                    response = await client.post(api_url, json=request_body, headers=headers)
-                    response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
-
-                    # Parse JSON response
-                    response_data = response.json()
-                    
-                    # The response is an array of objects as per api-communication.md
-                    hits = response_data if isinstance(response_data, list) else []
-
-                    logger.info(f"Successfully fetched {len(hits)} hits from Sprinklr API.")
-                    return hits
-
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"Sprinklr API request failed with status {e.response.status_code}: {e.response.text}") # Log snippet of error
-                    if attempt == 2:  # max_retries - 1
-                        return [] # Return empty list after max retries
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                except httpx.RequestError as e:
-                    logger.error(f"Sprinklr API request error: {e}")
-                    if attempt == 2:  # max_retries - 1
-                        return []
-                    await asyncio.sleep(2 ** attempt)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Error decoding Sprinklr API JSON response: {e}. Response text: {response.text}")
-                    return [] # Cannot parse response
-                except Exception as e:
-                    logger.error(f"An unexpected error occurred while fetching Sprinklr data: {e}")
-                    return []
-        return [] # Should not be reached if retries are handled correctly
+        return await _resolve_hits(query, limit, shards, from_time, upto_time, filters, as_store=False)
 
 
 class GetTools:
@@ -0,0 +1,238 @@
+"""
+Per-stage admission control for expensive workflow stages.
+
+LLM calls, Sprinklr fetches, embedding passes and BERTopic fits each get a
+StageLimiter: at most max_concurrency executions run at once, further callers
+wait in strict FIFO order, and when max_waiting callers are already queued (or
+a caller has waited max_wait_seconds) the call is rejected with
+OverloadedError instead of making every request slower:
+
+    async with admission_controller.slot("embedding"):
+        embeddings = await asyncio.to_thread(model.encode, documents)
+
+The API also checks the limiters before starting a run, so a saturated
+server answers 503 immediately. Wait times, queue depth, in-flight counts and
+rejections are exported through /api/metrics.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from src.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+admission_wait_seconds = metrics_registry.histogram(
+    "insights_admission_wait_seconds", "Time spent waiting for a stage slot", ("stage",)
+)
+admission_rejected_total = metrics_registry.counter(
+    "insights_admission_rejected_total", "Stage admissions rejected because of overload", ("stage", "reason")
+)
+admission_in_flight = metrics_registry.gauge(
+    "insights_admission_in_flight", "Stage executions holding a slot", ("stage",)
+)
+admission_waiting = metrics_registry.gauge(
+    "insights_admission_waiting", "Callers waiting for a stage slot", ("stage",)
+)
+
+
+class OverloadedError(Exception):
+    """Raised when a stage cannot admit more work."""
+
+    def __init__(self, stage: str, reason: str, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.stage = stage
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class StageLimiter:
+    """
+    Concurrency limit with a bounded FIFO wait queue for one stage.
+    """
+
+    def __init__(self, stage: str, max_concurrency: int, max_waiting: int = 0, max_wait_seconds: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            stage: Stage name (used in errors and metrics)
+            max_concurrency: Executions allowed at once
+            max_waiting: Callers allowed to wait for a slot; further callers are rejected
+            max_wait_seconds: Longest a caller waits before being rejected (None waits indefinitely)
+        """
+        self.stage = stage
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_waiting = max(0, max_waiting)
+        self.max_wait_seconds = max_wait_seconds
+        self._in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self._wait_times = deque(maxlen=256)
+        self.stats = {"admitted": 0, "rejected_queue_full": 0, "rejected_wait_timeout": 0}
+
+    @property
+    def saturated(self) -> bool:
+        """True when a new caller would be rejected immediately."""
+        return self._in_flight >= self.max_concurrency and len(self._waiters) >= self.max_waiting
+
+    def _publish(self) -> None:
+        admission_in_flight.set(self._in_flight, stage=self.stage)
+        admission_waiting.set(len(self._waiters), stage=self.stage)
+
+    def _reject(self, reason: str, message: str) -> OverloadedError:
+        self.stats[f"rejected_{reason}"] += 1
+        admission_rejected_total.inc(stage=self.stage, reason=reason)
+        logger.warning(f"🚦 Rejected {self.stage} call: {message}")
+        return OverloadedError(self.stage, reason, message, retry_after=self._retry_after())
+
+    def _retry_after(self) -> float:
+        """Suggested client back-off from recent queue waits."""
+        wait_times = list(self._wait_times)
+        return round(max(1.0, sum(wait_times) / len(wait_times)) if wait_times else 1.0, 1)
+
+    def _record_wait(self, seconds: float) -> None:
+        self._wait_times.append(seconds)
+        admission_wait_seconds.observe(seconds, stage=self.stage)
+        self.stats["admitted"] += 1
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot in FIFO order.
+
+        Raises:
+            OverloadedError: If the wait queue is full or the wait timed out
+        """
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            self._record_wait(0.0)
+            self._publish()
+            return
+        if len(self._waiters) >= self.max_waiting:
+            raise self._reject("queue_full", f"{self.stage} is at capacity ({self._in_flight} running, {len(self._waiters)} waiting)")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; pass it on
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            self._publish()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("wait_timeout", f"{self.stage} wait exceeded {self.max_wait_seconds}s")
+            raise
+        # The releasing caller transferred its slot to us (in_flight unchanged)
+        self._record_wait(time.perf_counter() - start)
+
+    def _release_slot(self) -> None:
+        """Hand the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def release(self) -> None:
+        """Release a slot acquired with acquire()."""
+        self._release_slot()
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dictionary with limits, current load, counters and queue wait times
+        """
+        wait_times = list(self._wait_times)
+        stats = dict(self.stats)
+        stats.update({
+            "max_concurrency": self.max_concurrency,
+            "max_waiting": self.max_waiting,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "avg_queue_wait_seconds": round(sum(wait_times) / len(wait_times), 3) if wait_times else 0.0,
+            "max_queue_wait_seconds": round(max(wait_times), 3) if wait_times else 0.0,
+        })
+        return stats
+
+
+class AdmissionController:
+    """
+    Named stage limiters; stages without a limiter are not limited.
+    """
+
+    def __init__(self, limiters: Iterable[StageLimiter] = ()):
+        """
+        Initialize the controller.
+
+        Args:
+            limiters: Stage limiters to register
+        """
+        self._limiters: Dict[str, StageLimiter] = {limiter.stage: limiter for limiter in limiters}
+
+    def limiter(self, stage: str) -> Optional[StageLimiter]:
+        """Get a stage's limiter, if the stage is limited."""
+        return self._limiters.get(stage)
+
+    @asynccontextmanager
+    async def slot(self, stage: str) -> AsyncIterator[None]:
+        """
+        Hold a slot of a stage for the duration of the block.
+
+        Args:
+            stage: Stage name (llm, fetch, embedding, clustering)
+
+        Raises:
+            OverloadedError: If the stage rejects the call
+        """
+        limiter = self._limiters.get(stage)
+        if limiter is None:
+            yield
+            return
+        async with limiter.slot():
+            yield
+
+    def check(self, stages: Optional[Iterable[str]] = None) -> None:
+        """
+        Reject new work up front while any of the stages is saturated.
+
+        Args:
+            stages: Stages the work will need (default: all)
+
+        Raises:
+            OverloadedError: For the first saturated stage
+        """
+        for stage in stages if stages is not None else list(self._limiters):
+            limiter = self._limiters.get(stage)
+            if limiter is not None and limiter.saturated:
+                raise limiter._reject("queue_full", f"{stage} is at capacity; try again later")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics for every stage.
+
+        Returns:
+            Dictionary of stage name to limiter statistics
+        """
+        return {stage: limiter.get_stats() for stage, limiter in self._limiters.items()}
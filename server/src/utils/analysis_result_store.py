@@ -0,0 +1,137 @@
+"""
+Cross-thread store of finished theme analyses.
+
+Different conversations regularly converge on the same boolean query for the
+same brand and window, and each would redo the fetch, embedding, BERTopic
+clustering and per-theme boolean query generation. The store keeps the
+output of DataAnalyzerAgent.analyze_hits_and_state under a key built from the
+canonical boolean query, the resolved time window, the API filters, the
+analyzer configuration and the conversation context the LLM theme generation
+reads (refined query, keywords, ...), so a repeated dashboard is answered from
+memory without handing one conversation another's themes.
+
+Entries are shared by every conversation, bounded by count (least recently
+used dropped first) and expire after a TTL. Results are copied on the way in
+and out so one conversation's theme edits never leak into another's.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.hit_cache import make_query_key
+
+logger = logging.getLogger(__name__)
+
+
+def make_analysis_key(
+    boolean_query: str,
+    time_window: Optional[Tuple[int, int]],
+    api_filters: Any = None,
+    analyzer_config: Optional[Dict[str, Any]] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build the key of an analysis.
+
+    Args:
+        boolean_query: Boolean query the hits were fetched with
+        time_window: Resolved (from_time, upto_time) window, or None for the default window
+        api_filters: Sprinklr API filters the hits were fetched with
+        analyzer_config: Analyzer settings that change the result
+        context: State fields that shape theme generation (refined query, keywords, ...)
+
+    Returns:
+        Hex digest identifying the analysis
+    """
+    return make_query_key(boolean_query, extra={
+        "time_window": list(time_window) if time_window else None,
+        "filters": api_filters or [],
+        "analyzer": analyzer_config or {},
+        "context": context or {},
+    })
+
+
+class AnalysisResultStore:
+    """
+    Bounded, TTL-expiring store of analysis results keyed by make_analysis_key().
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 6 * 60 * 60):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum analyses kept
+            ttl_seconds: Seconds after which an analysis is recomputed
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0, "expired": 0}
+
+    def _lookup(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Find a live entry and mark it recently used (caller must hold the lock)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if now - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def contains(self, key: str) -> bool:
+        """Check for a live analysis without counting a hit or miss."""
+        with self._lock:
+            return self._lookup(key, time.time()) is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an analysis.
+
+        Args:
+            key: Key from make_analysis_key()
+
+        Returns:
+            A private copy of the stored result, or None if missing or expired
+        """
+        with self._lock:
+            value = self._lookup(key, time.time())
+            self.stats["hits" if value is not None else "misses"] += 1
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store an analysis, replacing any previous result for the key.
+
+        Args:
+            key: Key from make_analysis_key()
+            result: Analysis output (themes, analysis_summary, ...)
+        """
+        value = copy.deepcopy(result)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), value)
+            self.stats["puts"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store counters.
+
+        Returns:
+            Dictionary with entry count and hit/miss/eviction counters
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        return stats
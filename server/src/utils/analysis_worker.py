@@ -0,0 +1,213 @@
+"""
+Embedding and BERTopic work executed in analysis worker processes.
+
+init_worker loads the sentence-transformer model once per worker, so calls
+only carry model names, texts and arrays. The *_shared variants receive the
+corpus and embedding matrices as shared memory handles (see shared_arrays)
+and write embeddings into a caller-owned output segment, so no large payload
+is pickled. Topic assignments come back as int32 arrays, which pickle as a
+single buffer. Everything here is module-level so the process pool can pickle
+it by reference.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from bertopic import BERTopic
+
+from src.utils.cluster_stability import assignment_stability
+from src.utils.shared_arrays import SharedArrayHandle, SharedTextsHandle, attach_array, load_texts, write_array
+
+logger = logging.getLogger(__name__)
+
+# Models loaded in this process, by name
+_models: Dict[str, Any] = {}
+
+
+def init_worker(embedding_model_name: str, torch_threads: int = 0) -> None:
+    """
+    Prepare a worker process: cap its torch threads and preload the embedding model.
+
+    Args:
+        embedding_model_name: Sentence-transformer model to preload
+        torch_threads: Intra-op threads per worker (0 keeps the torch default)
+    """
+    if torch_threads > 0:
+        import torch
+        torch.set_num_threads(torch_threads)
+    get_embedding_model(embedding_model_name)
+
+
+def get_embedding_model(model_name: str) -> Any:
+    """Get a sentence-transformer model, loading it on first use in this process."""
+    model = _models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        logger.info(f"Loading SentenceTransformer model in analysis worker: {model_name}")
+        model = _models[model_name] = SentenceTransformer(model_name)
+    return model
+
+
+def encode_texts(model_name: str, texts: List[str], encode_kwargs: Dict[str, Any]) -> np.ndarray:
+    """
+    Embed texts with a preloaded model.
+
+    Args:
+        model_name: Sentence-transformer model name
+        texts: Texts to embed
+        encode_kwargs: Extra arguments for encode (e.g. batch_size)
+
+    Returns:
+        float32 array of shape (len(texts), dim)
+    """
+    embeddings = get_embedding_model(model_name).encode(texts, convert_to_numpy=True, **encode_kwargs)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def cluster_topics(
+    docs: List[str],
+    embeddings: Optional[np.ndarray],
+    embedding_model: Any,
+    nr_topics: Any = "auto",
+    min_topic_size: int = 3
+) -> Tuple[List[int], np.ndarray, BERTopic]:
+    """
+    Fit a fresh BERTopic model on documents.
+
+    Args:
+        docs: List of document strings
+        embeddings: Optional precomputed document embeddings (skips re-encoding)
+        embedding_model: Model BERTopic uses when embeddings are not given
+        nr_topics: BERTopic nr_topics ("auto" lets BERTopic merge topics)
+        min_topic_size: Minimum documents per topic
+
+    Returns:
+        Tuple of (topics, probabilities, topic_model)
+
+    Raises:
+        RuntimeError: If clustering fails
+    """
+    try:
+        logger.info(f"Performing initial clustering on {len(docs)} documents")
+
+        # Fit a fresh topic model to the data (one per fit, so concurrent fits do not share state)
+        topic_model = BERTopic(embedding_model=embedding_model, nr_topics=nr_topics, min_topic_size=min_topic_size)
+        topics, probs = topic_model.fit_transform(docs, embeddings=embeddings)
+
+        # Update topics with documents for better representation
+        topic_model.update_topics(docs, topics)
+
+        logger.info(f"Initial clustering complete: {len(set(topics))} topics found")
+        return topics, probs, topic_model
+
+    except IndexError as e:
+        # Handle BERTopic clustering failure when no topics can be found
+        logger.warning(f"BERTopic could not find meaningful topics in the documents: {e}")
+        logger.info("Creating fallback clustering with single topic assignment")
+
+        # Create fallback clustering where all documents belong to topic 0
+        fallback_topics = [0] * len(docs)
+        fallback_probs = np.ones((len(docs),)) * 0.5  # Moderate confidence
+
+        # Create a new topic model instance for consistency
+        fallback_model = BERTopic(
+            embedding_model=embedding_model,
+            nr_topics=1,  # Force single topic
+            min_topic_size=1
+        )
+
+        return fallback_topics, fallback_probs, fallback_model
+
+    except Exception as e:
+        logger.error(f"Error in initial clustering: {e}")
+        raise RuntimeError(f"Clustering failed: {e}") from e
+
+
+def fit_topics(
+    model_name: str,
+    docs: List[str],
+    embeddings: Optional[np.ndarray],
+    nr_topics: Any,
+    min_topic_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit BERTopic with the worker's preloaded model and return only the assignments.
+
+    The fitted model stays in the worker; shipping it back would cost more
+    than the fit's results.
+
+    Args:
+        model_name: Sentence-transformer model name
+        docs: List of document strings
+        embeddings: Optional precomputed document embeddings
+        nr_topics: BERTopic nr_topics
+        min_topic_size: Minimum documents per topic
+
+    Returns:
+        Tuple of (int32 topics, probabilities)
+    """
+    topics, probs, _ = cluster_topics(docs, embeddings, get_embedding_model(model_name), nr_topics, min_topic_size)
+    return np.asarray(topics, dtype=np.int32), np.asarray(probs)
+
+
+def encode_texts_shared(
+    model_name: str,
+    texts: SharedTextsHandle,
+    out: SharedArrayHandle,
+    encode_kwargs: Dict[str, Any]
+) -> None:
+    """
+    Embed a shared corpus into a shared output array.
+
+    Args:
+        model_name: Sentence-transformer model name
+        texts: Handle to the corpus
+        out: Handle to a float32 (len(texts), dim) output array
+        encode_kwargs: Extra arguments for encode (e.g. batch_size)
+    """
+    write_array(out, encode_texts(model_name, load_texts(texts), encode_kwargs))
+
+
+def fit_topics_shared(
+    model_name: str,
+    docs: SharedTextsHandle,
+    embeddings: Optional[SharedArrayHandle],
+    nr_topics: Any,
+    min_topic_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit BERTopic on a shared corpus and (optionally) shared embeddings.
+
+    The embeddings are used in place, without a copy in the worker.
+
+    Args:
+        model_name: Sentence-transformer model name
+        docs: Handle to the corpus
+        embeddings: Handle to the document embeddings (None lets BERTopic encode)
+        nr_topics: BERTopic nr_topics
+        min_topic_size: Minimum documents per topic
+
+    Returns:
+        Tuple of (int32 topics, probabilities)
+    """
+    texts = load_texts(docs)
+    if embeddings is None:
+        return fit_topics(model_name, texts, None, nr_topics, min_topic_size)
+    with attach_array(embeddings) as shared_embeddings:
+        return fit_topics(model_name, texts, shared_embeddings, nr_topics, min_topic_size)
+
+
+def assignment_stability_shared(embeddings: SharedArrayHandle, reference_count: int) -> float:
+    """
+    Run the adaptive-sample stability check on shared embeddings.
+
+    Args:
+        embeddings: Handle to the grown sample's embeddings
+        reference_count: Number of leading rows from the previous round
+
+    Returns:
+        Adjusted Rand index of the reference documents' assignments
+    """
+    with attach_array(embeddings) as shared_embeddings:
+        return assignment_stability(shared_embeddings, reference_count)
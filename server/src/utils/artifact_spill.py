@@ -0,0 +1,283 @@
+"""
+Memory-mapped on-disk spill of per-thread hits, documents and embeddings.
+
+Each conversation's latest tool run is written to its own directory as flat
+files: UTF-8 blobs with int64 offsets arrays for hit texts, hit ids and
+extracted documents, the HitStore's int64/int32 columns, and a float32 (or
+float16) embedding matrix. A meta.json written last marks the spill complete.
+
+Reading a spill maps the files instead of loading them (mmap for the blobs,
+np.memmap for the arrays), so theme refine/modify loops and resumes after a
+restart reuse the corpus without refetching, re-embedding or copying it into
+RAM; the OS page cache keeps hot pages in memory.
+
+Layout: <root>/<sha256(thread_id)>/<run_id>/...
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from src.utils.hit_store import STRING_ERRORS, HitStore
+from src.utils.thread_artifact_store import ThreadArtifacts
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+SPILL_FORMAT_VERSION = 1
+
+
+class MappedTexts(Sequence):
+    """Read-only sequence of strings backed by a UTF-8 blob and an offsets array."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], offsets: np.ndarray):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MappedTexts index out of range")
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._buffer[start:end].decode("utf-8", STRING_ERRORS)
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield self._buffer[start:end].decode("utf-8", STRING_ERRORS)
+
+
+def _encode_texts(texts: Sequence[str]):
+    """Pack strings into a UTF-8 blob and an int64 offsets array."""
+    encoded = [text.encode("utf-8", STRING_ERRORS) for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+def _map_bytes(path: Path) -> Union[bytes, mmap.mmap]:
+    """Map a blob read-only (empty files cannot be mapped)."""
+    if path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_array(path: Path, dtype: str, shape: tuple) -> np.ndarray:
+    """Map an array read-only (empty arrays cannot be mapped)."""
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class ArtifactSpill:
+    """
+    Writes and maps per-thread artifact spills under a root directory.
+    """
+
+    def __init__(self, root: Union[str, Path], embedding_dtype: str = "float32", ttl_seconds: int = 24 * 60 * 60):
+        """
+        Initialize the spill.
+
+        Args:
+            root: Directory holding one subdirectory per thread
+            embedding_dtype: "float32" or "float16" for the embedding matrix
+            ttl_seconds: Age after which spills are removed by prune()
+        """
+        if embedding_dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding dtype: {embedding_dtype}")
+        self.root = Path(root)
+        self.embedding_dtype = embedding_dtype
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"writes": 0, "loads": 0, "misses": 0, "errors": 0}
+
+    def _thread_dir(self, thread_id: str) -> Path:
+        return self.root / hashlib.sha256(thread_id.encode("utf-8")).hexdigest()[:32]
+
+    def write(self, thread_id: str, artifacts: ThreadArtifacts) -> Optional[ThreadArtifacts]:
+        """
+        Spill a run's artifacts, replacing the thread's previous spill.
+
+        Args:
+            thread_id: Conversation thread id
+            artifacts: Artifacts with a HitStore as hits
+
+        Returns:
+            The same artifacts backed by the mapped files, or None if they
+            could not be spilled (the caller keeps the in-memory version)
+        """
+        hits = artifacts.hits
+        if not isinstance(hits, HitStore):
+            return None
+
+        thread_dir = self._thread_dir(thread_id)
+        run_dir = thread_dir / artifacts.run_id
+        tmp_dir = thread_dir / f".{artifacts.run_id}.tmp"
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+
+            meta = {
+                "version": SPILL_FORMAT_VERSION,
+                "run_id": artifacts.run_id,
+                "hits": len(hits),
+                "id_offsets": len(hits.id_offsets),
+                "categories": hits.categories,
+                "documents": None,
+                "embeddings": None,
+            }
+            (tmp_dir / "hit_text.bin").write_bytes(hits.text_buffer)
+            (tmp_dir / "hit_ids.bin").write_bytes(hits.id_buffer)
+            np.ascontiguousarray(hits.text_offsets, dtype=np.int64).tofile(tmp_dir / "hit_text_offsets.i64")
+            np.ascontiguousarray(hits.id_offsets, dtype=np.int64).tofile(tmp_dir / "hit_id_offsets.i64")
+            np.ascontiguousarray(hits.created_time, dtype=np.int64).tofile(tmp_dir / "created_time.i64")
+            for name, codes in hits.categorical_codes.items():
+                np.ascontiguousarray(codes, dtype=np.int32).tofile(tmp_dir / f"codes_{name}.i32")
+
+            if artifacts.documents is not None:
+                blob, offsets = _encode_texts(artifacts.documents)
+                (tmp_dir / "documents.bin").write_bytes(blob)
+                offsets.tofile(tmp_dir / "document_offsets.i64")
+                meta["documents"] = len(artifacts.documents)
+
+            if artifacts.embeddings is not None:
+                embeddings = np.asarray(artifacts.embeddings)
+                np.ascontiguousarray(embeddings, dtype=self.embedding_dtype).tofile(tmp_dir / "embeddings.bin")
+                meta["embeddings"] = {"shape": list(embeddings.shape), "dtype": self.embedding_dtype}
+
+            # meta.json is written last: a spill without it is incomplete
+            (tmp_dir / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            shutil.rmtree(run_dir, ignore_errors=True)
+            os.replace(tmp_dir, run_dir)
+
+            # Only the latest run of a thread is kept
+            for other in thread_dir.iterdir():
+                if other != run_dir:
+                    shutil.rmtree(other, ignore_errors=True)
+
+            self.stats["writes"] += 1
+            return self._load_run(run_dir)
+        except (OSError, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Could not spill artifacts of thread {thread_id}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+    def _load_run(self, run_dir: Path) -> ThreadArtifacts:
+        """Map a complete run directory into ThreadArtifacts."""
+        meta = json.loads((run_dir / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("version") != SPILL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported spill format version: {meta.get('version')}")
+
+        count = meta["hits"]
+        hits = HitStore(
+            text_buffer=_map_bytes(run_dir / "hit_text.bin"),
+            text_offsets=_map_array(run_dir / "hit_text_offsets.i64", "int64", (count + 1,)),
+            id_buffer=_map_bytes(run_dir / "hit_ids.bin"),
+            id_offsets=_map_array(run_dir / "hit_id_offsets.i64", "int64", (meta["id_offsets"],)),
+            created_time=_map_array(run_dir / "created_time.i64", "int64", (count,)),
+            categorical_codes={
+                name: _map_array(run_dir / f"codes_{name}.i32", "int32", (count,))
+                for name in meta["categories"]
+            },
+            categories=meta["categories"],
+        )
+
+        documents = None
+        if meta["documents"] is not None:
+            documents = MappedTexts(
+                _map_bytes(run_dir / "documents.bin"),
+                _map_array(run_dir / "document_offsets.i64", "int64", (meta["documents"] + 1,)),
+            )
+
+        embeddings = None
+        if meta["embeddings"] is not None:
+            embeddings = _map_array(run_dir / "embeddings.bin", meta["embeddings"]["dtype"], tuple(meta["embeddings"]["shape"]))
+
+        return ThreadArtifacts(meta["run_id"], hits, documents, embeddings)
+
+    def load(self, thread_id: str, run_id: Optional[str] = None) -> Optional[ThreadArtifacts]:
+        """
+        Map a thread's spilled artifacts.
+
+        Args:
+            thread_id: Conversation thread id
+            run_id: Expected run id (None accepts the latest run)
+
+        Returns:
+            Mapped artifacts, or None if no complete, unexpired spill exists
+        """
+        thread_dir = self._thread_dir(thread_id)
+        if run_id is not None:
+            candidates = [thread_dir / run_id]
+        elif thread_dir.is_dir():
+            candidates = [run_dir for run_dir in thread_dir.iterdir() if not run_dir.name.startswith(".")]
+        else:
+            candidates = []
+
+        for run_dir in candidates:
+            meta_path = run_dir / META_FILE
+            try:
+                if not meta_path.is_file() or time.time() - meta_path.stat().st_mtime > self.ttl_seconds:
+                    continue
+                artifacts = self._load_run(run_dir)
+            except (OSError, ValueError, KeyError) as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Could not map spilled artifacts in {run_dir}: {e}")
+                continue
+            self.stats["loads"] += 1
+            return artifacts
+
+        self.stats["misses"] += 1
+        return None
+
+    def delete(self, thread_id: str) -> None:
+        """Remove a thread's spill."""
+        shutil.rmtree(self._thread_dir(thread_id), ignore_errors=True)
+
+    def prune(self) -> int:
+        """
+        Remove spills older than the TTL.
+
+        Returns:
+            Number of thread directories removed
+        """
+        if not self.root.is_dir():
+            return 0
+        removed = 0
+        now = time.time()
+        for thread_dir in self.root.iterdir():
+            try:
+                if thread_dir.is_dir() and now - thread_dir.stat().st_mtime > self.ttl_seconds:
+                    shutil.rmtree(thread_dir, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"Pruned {removed} expired artifact spills from {self.root}")
+        return removed
+
+    def get_stats(self) -> dict:
+        """
+        Get spill counters.
+
+        Returns:
+            Dictionary with write/load/miss/error counts
+        """
+        return dict(self.stats)
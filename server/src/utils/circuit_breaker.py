@@ -0,0 +1,126 @@
+"""
+Circuit breaker for outbound API calls.
+
+After repeated upstream failures the breaker opens and calls fail fast
+instead of piling up timeouts. Once the reset timeout elapses a single probe
+call is let through (half-open); its outcome closes or re-opens the circuit.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open - retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a single half-open probe.
+
+    Callers wrap each upstream attempt as:
+        breaker.before_call()          # raises CircuitOpenError when open
+        ... do the call ...
+        breaker.record_success() / breaker.record_failure()
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Name used in logs and stats
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        self.stats = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "times_opened": 0,
+        }
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already running
+        """
+        if self.state == OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_timeout:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"[{self.name}] Circuit half-open - allowing a probe request")
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit if it was half-open."""
+        self.stats["successes"] += 1
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info(f"[{self.name}] Circuit closed - upstream recovered")
+        self.state = CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold or on a failed probe."""
+        self.stats["failures"] += 1
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.stats["times_opened"] += 1
+                logger.warning(f"[{self.name}] Circuit opened after {self._consecutive_failures} consecutive failures")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot when the call ended without a verdict (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and counters.
+
+        Returns:
+            Dictionary with state, consecutive failures, seconds until a probe and counters
+        """
+        stats = dict(self.stats)
+        retry_in = 0.0
+        if self.state == OPEN:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        stats.update({
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_in_seconds": round(retry_in, 3),
+        })
+        return stats
@@ -0,0 +1,49 @@
+"""
+Cheap clustering stability check for adaptive-sample fetching.
+
+Instead of running BERTopic after every fetch round, a small k-means is fit
+on the previous sample and on the grown sample. The previous documents are
+labelled by both models and the agreement of the two labellings is measured
+with the adjusted Rand index. A high score means the extra mentions did not
+move the theme assignments, so fetching more is unlikely to change the themes.
+"""
+
+import logging
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import adjusted_rand_score
+
+logger = logging.getLogger(__name__)
+
+
+def _fit_kmeans(embeddings: np.ndarray, n_clusters: int, seed: int) -> MiniBatchKMeans:
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed, n_init=3, batch_size=1024)
+    return model.fit(embeddings)
+
+
+def assignment_stability(embeddings: np.ndarray, reference_count: int, n_clusters: int = 8, seed: int = 42) -> float:
+    """
+    Measure how much growing a sample changes the cluster assignment of its first documents.
+
+    Args:
+        embeddings: Embeddings of the grown sample; the first `reference_count`
+            rows are the previous sample
+        reference_count: Size of the previous sample
+        n_clusters: Clusters used for the check (capped by the sample size)
+        seed: Random seed for k-means
+
+    Returns:
+        Adjusted Rand index in [-1, 1] (1.0 = identical assignments)
+    """
+    n_clusters = max(2, min(n_clusters, reference_count // 10))
+    if reference_count < 2 * n_clusters or len(embeddings) <= reference_count:
+        return 0.0
+
+    reference = embeddings[:reference_count]
+    reference_labels = _fit_kmeans(reference, n_clusters, seed).labels_
+    grown_labels = _fit_kmeans(embeddings, n_clusters, seed).predict(reference)
+
+    score = float(adjusted_rand_score(reference_labels, grown_labels))
+    logger.info(f"Cluster stability {reference_count} -> {len(embeddings)} docs: ARI={score:.3f}")
+    return score
@@ -0,0 +1,91 @@
+"""
+Process-wide registry of heavy components (models, RAG indexes, agents, the workflow).
+
+Each component is registered with a factory and created once, on first use,
+then shared by everything that asks for it:
+
+    component_registry.register("embedding_model", load_embedding_model)
+    model = component_registry.get("embedding_model")
+
+Factories may fetch their own dependencies from the registry, so building the
+workflow pulls in the shared LLM, embedding model and agents instead of each
+constructor building private copies. Creation errors propagate to the caller,
+and a failed component is retried on the next get().
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentRegistry:
+    """
+    Named, lazily created singletons shared across the process.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._components: Dict[str, Any] = {}
+        self._creation_seconds: Dict[str, float] = {}
+        # Re-entrant: factories resolve their dependencies while the lock is held
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register the factory for a component (ignored if it is already registered).
+
+        Args:
+            name: Component name
+            factory: Zero-argument function that builds the component
+        """
+        with self._lock:
+            self._factories.setdefault(name, factory)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a component, creating it on first use.
+
+        Args:
+            name: Component name
+
+        Returns:
+            The shared component instance
+
+        Raises:
+            KeyError: If no factory is registered under the name
+        """
+        component = self._components.get(name)
+        if component is not None:
+            return component
+        with self._lock:
+            if name in self._components:
+                return self._components[name]
+            if name not in self._factories:
+                raise KeyError(f"No component registered under '{name}'")
+            started = time.perf_counter()
+            component = self._factories[name]()
+            self._components[name] = component
+            self._creation_seconds[name] = time.perf_counter() - started
+            logger.info(f"🧩 Created component '{name}' in {self._creation_seconds[name]:.2f}s")
+            return component
+
+    def is_created(self, name: str) -> bool:
+        """Check whether a component has been created."""
+        return name in self._components
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Dictionary with registered and created components and their creation times
+        """
+        with self._lock:
+            return {
+                "registered": sorted(self._factories),
+                "created": sorted(self._components),
+                "creation_seconds": {name: round(seconds, 3) for name, seconds in self._creation_seconds.items()},
+            }
@@ -0,0 +1,112 @@
+"""
+Index of time windows already fetched per canonical query.
+
+When a refinement only widens the time range ("make it last 60 days"), the
+windows fetched for the previous round are still in the hit cache. This index
+remembers which (from_time, upto_time, limit) windows were fetched for each
+canonical query (normalized boolean query plus request filters), so the tool
+can fetch only the uncovered sub-ranges and merge them with the cached ones.
+
+Only metadata is kept here; the hits themselves live in the hit cache.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (from_time, upto_time, limit)
+FetchedWindow = Tuple[int, int, int]
+
+
+class FetchedWindowIndex:
+    """
+    Bounded LRU of fetched windows per canonical query, with TTL expiry.
+    """
+
+    def __init__(self, max_queries: int = 64, max_windows_per_query: int = 16, ttl_seconds: int = 6 * 60 * 60):
+        """
+        Initialize the index.
+
+        Args:
+            max_queries: Maximum canonical queries tracked
+            max_windows_per_query: Maximum windows remembered per query (oldest dropped first)
+            ttl_seconds: Seconds a window is considered reusable (should match the hit cache TTL)
+        """
+        self.max_queries = max_queries
+        self.max_windows_per_query = max_windows_per_query
+        self.ttl_seconds = ttl_seconds
+        self._windows: "OrderedDict[str, Dict[FetchedWindow, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, query_key: str, from_time: int, upto_time: int, limit: int) -> None:
+        """
+        Remember that a window was fetched completely and cached.
+
+        Args:
+            query_key: Canonical query key
+            from_time: Window start (epoch ms)
+            upto_time: Window end (epoch ms)
+            limit: Number of messages requested for the window
+        """
+        with self._lock:
+            windows = self._windows.setdefault(query_key, {})
+            windows.pop((from_time, upto_time, limit), None)
+            windows[(from_time, upto_time, limit)] = time.time()
+            while len(windows) > self.max_windows_per_query:
+                windows.pop(next(iter(windows)))
+
+            self._windows.move_to_end(query_key)
+            while len(self._windows) > self.max_queries:
+                self._windows.popitem(last=False)
+
+    def forget(self, query_key: str, window: FetchedWindow) -> None:
+        """Drop a window whose hits are no longer in the cache."""
+        with self._lock:
+            self._windows.get(query_key, {}).pop(window, None)
+
+    def covering_windows(self, query_key: str, from_time: int, upto_time: int) -> List[FetchedWindow]:
+        """
+        Pick non-overlapping fetched windows that lie inside a requested window.
+
+        Larger windows are preferred, so the fewest cache reads cover the most time.
+
+        Args:
+            query_key: Canonical query key
+            from_time: Requested window start (epoch ms)
+            upto_time: Requested window end (epoch ms)
+
+        Returns:
+            Reusable windows sorted by start time
+        """
+        now = time.time()
+        with self._lock:
+            windows = self._windows.get(query_key)
+            if not windows:
+                return []
+            self._windows.move_to_end(query_key)
+            for window in [w for w, fetched_at in windows.items() if now - fetched_at > self.ttl_seconds]:
+                del windows[window]
+            candidates = [w for w in windows if from_time <= w[0] and w[1] <= upto_time]
+
+        chosen: List[FetchedWindow] = []
+        for window in sorted(candidates, key=lambda w: w[1] - w[0], reverse=True):
+            if all(window[1] < other[0] or window[0] > other[1] for other in chosen):
+                chosen.append(window)
+        return sorted(chosen)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get index size.
+
+        Returns:
+            Dictionary with tracked query and window counts
+        """
+        with self._lock:
+            return {
+                "queries": len(self._windows),
+                "windows": sum(len(windows) for windows in self._windows.values()),
+            }
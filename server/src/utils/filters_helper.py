@@ -0,0 +1,189 @@
+"""
+Helper functions for translating workflow state into Sprinklr API-side filters.
+
+The DataCollectorAgent extracts `filters` (source, country, language, gender
+values from filters.json) and the refiner/collector carry a time range
+("last 60 days", `time_range: LAST_30_DAYS`). These helpers turn both into
+get-mentions request parameters, so excluded mentions are never downloaded.
+"""
+
+import json
+import logging
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FILTERS_JSON_PATH = Path(__file__).parent.parent / "knowledge_base" / "filters.json"
+
+# filters.json key -> get-mentions filter field
+API_FILTER_FIELDS = {
+    "source": "SOURCE",
+    "country": "COUNTRY",
+    "language": "LANGUAGE",
+    "gender": "GENDER",
+}
+
+# Aliases the LLM tends to use for filters.json keys
+FILTER_KEY_ALIASES = {
+    "sources": "source",
+    "channel": "source",
+    "channels": "source",
+    "platform": "source",
+    "platforms": "source",
+    "countries": "country",
+    "region": "country",
+    "languages": "language",
+    "lang": "language",
+    "genders": "gender",
+}
+
+DAY_MS = 24 * 60 * 60 * 1000
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# Sprinklr request timezone (Asia/Kolkata); windows are aligned to its day boundaries
+TZ_OFFSET_MS = 19800000
+
+_TIME_RANGE_TOKEN = re.compile(r"^LAST_(\d+)_(DAY|WEEK|MONTH|YEAR)S?$", re.IGNORECASE)
+_TIME_RANGE_TEXT = re.compile(r"\b(?:last|past|previous)\s+(\d+)?\s*(day|week|month|year)s?\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def load_allowed_filter_values() -> Dict[str, Dict[str, str]]:
+    """
+    Load allowed filter values from filters.json.
+
+    Returns:
+        Mapping of filter key to {lower-cased value: canonical value}
+    """
+    try:
+        with open(FILTERS_JSON_PATH, "r", encoding="utf-8") as f:
+            available_filters = json.load(f)["filters"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Could not load filters from {FILTERS_JSON_PATH}: {e}")
+        return {}
+    return {
+        key: {str(value).lower(): str(value) for value in values}
+        for key, values in available_filters.items()
+        if isinstance(values, list)
+    }
+
+
+def _filter_pairs(filters: Any) -> List[Tuple[Any, Any]]:
+    """Normalize a filter mapping or a list of "field: value" strings into (key, values) pairs."""
+    if isinstance(filters, dict):
+        return list(filters.items())
+    pairs = []
+    if isinstance(filters, list):
+        for item in filters:
+            if isinstance(item, str) and ":" in item:
+                key, value = item.split(":", 1)
+                pairs.append((key, value))
+            elif isinstance(item, dict) and "field" in item:
+                pairs.append((item["field"], item.get("values", item.get("value"))))
+    return pairs
+
+
+def build_api_filters(filters: Any) -> List[Dict[str, Any]]:
+    """
+    Translate state `filters` into get-mentions filter clauses.
+
+    Only keys and values present in filters.json are sent; anything else is
+    logged and dropped rather than risking an API error.
+
+    Args:
+        filters: Filter mapping from DashboardState (values may be strings or
+            lists), or a list of "field: value" strings
+
+    Returns:
+        Sorted list of {"field": ..., "values": [...]} clauses
+    """
+    allowed = load_allowed_filter_values()
+    clauses = {}
+    for raw_key, raw_values in _filter_pairs(filters):
+        key = str(raw_key).strip().lower()
+        key = FILTER_KEY_ALIASES.get(key, key)
+        if key not in API_FILTER_FIELDS:
+            continue
+
+        values = raw_values if isinstance(raw_values, (list, tuple, set)) else [raw_values]
+        canonical = []
+        for value in values:
+            match = allowed.get(key, {}).get(str(value).strip().lower())
+            if match is None:
+                logger.warning(f"Ignoring unsupported {key} filter value: {value}")
+            elif match not in canonical:
+                canonical.append(match)
+
+        if canonical:
+            field = API_FILTER_FIELDS[key]
+            clauses[field] = sorted(set(clauses.get(field, [])) | set(canonical))
+
+    return [{"field": field, "values": values} for field, values in sorted(clauses.items())]
+
+
+def parse_time_range_days(value: Any) -> Optional[int]:
+    """
+    Parse a relative time range into a number of days.
+
+    Accepts tokens such as `LAST_30_DAYS` / `LAST_2_WEEKS` and free text such as
+    "over the last 60 days" or "past month".
+
+    Args:
+        value: Time range token or text
+
+    Returns:
+        Number of days, or None if no time range is recognised
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    match = _TIME_RANGE_TOKEN.match(value.strip())
+    if match is None:
+        match = _TIME_RANGE_TEXT.search(value)
+    if match is None:
+        return None
+
+    count = int(match.group(1)) if match.group(1) else 1
+    days = count * UNIT_DAYS[match.group(2).lower()]
+    return days if days > 0 else None
+
+
+def resolve_time_window(state: Dict[str, Any], now_ms: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+    Resolve the refined time range in the workflow state to an epoch-ms window.
+
+    Precedence: an explicit `time_range` filter, then a duration in the
+    refined query, then the `time_range` default applied by the collector.
+    The window ends at the end of the current day (request timezone), so
+    requests made on the same day share cache entries.
+
+    Args:
+        state: Workflow state (filters, refined_query, defaults_applied)
+        now_ms: Current time in epoch ms (defaults to now)
+
+    Returns:
+        (from_time, upto_time) inclusive window, or None if no range is known
+    """
+    defaults_applied = state.get("defaults_applied") or {}
+
+    days = None
+    for key, value in _filter_pairs(state.get("filters")):
+        if str(key).strip().lower() == "time_range":
+            days = parse_time_range_days(str(value).strip())
+    if days is None:
+        days = parse_time_range_days(state.get("refined_query"))
+    if days is None and isinstance(defaults_applied, dict):
+        days = parse_time_range_days(defaults_applied.get("time_range"))
+    if days is None:
+        return None
+
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    day_start = (now_ms + TZ_OFFSET_MS) // DAY_MS * DAY_MS - TZ_OFFSET_MS
+    upto_time = day_start + DAY_MS - 1
+    from_time = upto_time - days * DAY_MS + 1
+    return from_time, upto_time
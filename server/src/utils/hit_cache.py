@@ -0,0 +1,352 @@
+"""
+Persistent Hit Cache for Sprinklr Fetches
+
+This module provides a content-addressed cache in front of the Sprinklr
+get-mentions tool so that HITL refine loops, repeated dashboards and
+abandoned-then-resumed analyses that end in the same request skip the network.
+
+Layers:
+- In-memory LRU of recently used compressed hit lists (bounded by entry count)
+- On-disk SQLite store of the same compressed payloads (bounded by total bytes)
+
+Both layers hold serialized payloads, never hit dicts: every lookup decodes a
+fresh list, so callers can't mutate cached hits or keep them alive.
+
+Entries are keyed by the normalized boolean query, time window, limit and any
+extra request parameters, and expire after a TTL.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace in a boolean query so formatting differences share a cache entry."""
+    return " ".join((query or "").split())
+
+
+def make_cache_key(query: str, from_time: int, upto_time: int, limit: int, extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a content-addressed key for a fetch request.
+
+    Args:
+        query: Boolean query
+        from_time: Window start (epoch ms)
+        upto_time: Window end (epoch ms)
+        limit: Number of messages requested
+        extra: Additional request parameters that change the result (e.g. filters)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = {
+        "query": normalize_query(query),
+        "from_time": int(from_time),
+        "upto_time": int(upto_time),
+        "limit": int(limit),
+        "extra": extra or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def make_query_key(query: str, extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a key identifying a canonical query regardless of time window and limit.
+
+    Args:
+        query: Boolean query
+        extra: Additional request parameters that change the result (e.g. filters)
+
+    Returns:
+        Hex digest identifying the query
+    """
+    payload = {"query": normalize_query(query), "extra": extra or {}}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class HitCache:
+    """
+    Two-level (memory LRU + SQLite) TTL cache for Sprinklr hit lists.
+
+    Disk operations run in a worker thread through the async API so they never
+    block the event loop. Hit/miss/eviction counters are kept for monitoring.
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        ttl_seconds: int = None,
+        max_memory_entries: int = None,
+        max_disk_bytes: int = None,
+    ):
+        """
+        Initialize the hit cache.
+
+        Args:
+            db_path: SQLite file path (defaults to settings)
+            ttl_seconds: Entry time-to-live (defaults to settings)
+            max_memory_entries: Maximum hit lists kept in memory (defaults to settings)
+            max_disk_bytes: Maximum total compressed bytes on disk (defaults to settings)
+        """
+        self.db_path = db_path or settings.HIT_CACHE_DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.HIT_CACHE_TTL_SECONDS
+        self.max_memory_entries = max_memory_entries if max_memory_entries is not None else settings.HIT_CACHE_MEMORY_ENTRIES
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else settings.HIT_CACHE_MAX_DISK_MB * 1024 * 1024
+
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+        }
+        logger.info(f"HitCache initialized (db={self.db_path}, ttl={self.ttl_seconds}s, memory_entries={self.max_memory_entries})")
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Open the SQLite store lazily (caller must hold the lock)."""
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hit_cache (
+                    key TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_hit_cache_last_access ON hit_cache(last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, created_at: float, payload: bytes) -> None:
+        """Insert a compressed payload into the memory LRU and evict beyond capacity (caller must hold the lock)."""
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = (created_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        """Find the compressed payload for a key in memory or on disk, counting hits and misses."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, payload = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return payload
+                del self._memory[key]
+                self.stats["expired"] += 1
+
+            try:
+                conn = self._get_conn()
+                row = conn.execute(
+                    "SELECT created_at, payload FROM hit_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+
+                created_at, payload = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM hit_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    self.stats["expired"] += 1
+                    self.stats["misses"] += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE hit_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?", (now, key)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Hit cache read failed: {e}")
+                self.stats["misses"] += 1
+                return None
+
+            payload = bytes(payload)
+            self.stats["disk_hits"] += 1
+            self._remember(key, created_at, payload)
+            return payload
+
+    def get_payload(self, key: str) -> Optional[bytes]:
+        """
+        Look up the serialized hit list without decoding it.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            UTF-8 JSON array of the cached hits, or None on miss/expiry
+        """
+        payload = self._lookup(key)
+        if payload is None:
+            return None
+        try:
+            return zlib.decompress(payload)
+        except zlib.error as e:
+            logger.error(f"Hit cache entry is corrupt: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up a cached hit list.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Freshly decoded hit list owned by the caller, or None on miss/expiry
+        """
+        payload = self.get_payload(key)
+        if payload is None:
+            return None
+        try:
+            return json.loads(payload)
+        except ValueError as e:
+            logger.error(f"Hit cache entry is corrupt: {e}")
+            return None
+
+    def put(self, key: str, hits: List[Dict[str, Any]]) -> None:
+        """
+        Store a hit list. Empty lists are not cached (they usually mean a failed fetch).
+
+        The hits are serialized immediately; later changes to them don't reach the cache.
+
+        Args:
+            key: Cache key from make_cache_key
+            hits: Hits returned for the request
+        """
+        if not hits:
+            return
+
+        now = time.time()
+        try:
+            payload = zlib.compress(json.dumps(hits, separators=(",", ":")).encode("utf-8"), 3)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Hit list is not JSON serializable - not caching: {e}")
+            return
+
+        with self._lock:
+            self._remember(key, now, payload)
+            try:
+                conn = self._get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO hit_cache (key, created_at, last_access, hit_count, size_bytes, payload) "
+                    "VALUES (?, ?, ?, 0, ?, ?)",
+                    (key, now, now, len(payload), payload),
+                )
+                self._evict_disk(conn, now)
+                conn.commit()
+                self.stats["writes"] += 1
+            except sqlite3.Error as e:
+                logger.error(f"Hit cache write failed: {e}")
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least-recently-used rows until under the size cap."""
+        expired = conn.execute("DELETE FROM hit_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        if expired > 0:
+            self.stats["expired"] += expired
+
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM hit_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        for key, size_bytes in conn.execute("SELECT key, size_bytes FROM hit_cache ORDER BY last_access ASC").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            conn.execute("DELETE FROM hit_cache WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size_bytes
+            self.stats["disk_evictions"] += 1
+
+    async def aget(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Async lookup - disk access runs in a worker thread."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aget_payload(self, key: str) -> Optional[bytes]:
+        """Async serialized lookup - disk access and decompression run in a worker thread."""
+        return await asyncio.to_thread(self.get_payload, key)
+
+    async def aput(self, key: str, hits: List[Dict[str, Any]]) -> None:
+        """Async store - compression and disk access run in a worker thread."""
+        await asyncio.to_thread(self.put, key, hits)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and hit ratio
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Remove every cached entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM hit_cache")
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Hit cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global hit cache instance
+hit_cache = HitCache()
+
+
+def get_hit_cache() -> HitCache:
+    """
+    Get the global hit cache instance.
+
+    Returns:
+        HitCache instance
+    """
+    return hit_cache
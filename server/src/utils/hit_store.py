@@ -0,0 +1,266 @@
+"""
+Compact Columnar Hit Store
+
+After a fetch, only a handful of fields of each Sprinklr hit are ever used
+(text, and for some paths id, source and timestamps). Keeping 5000 full hit
+dicts alive between the tool node and the analyzer/theme-modifier loop costs
+far more memory than those fields need.
+
+HitStore projects hits into columns:
+- text and ids: one contiguous UTF-8 buffer each plus an int64 offsets array
+- created time: int64 epoch-ms array (-1 when missing)
+- source / language / country: int32 category codes plus a category table
+
+It iterates as lightweight dicts, so code written against lists of hits
+(e.g. DataAnalyzerAgent._extract_documents_from_hits) keeps working, and it
+offers iter_texts() as a zero-parse fast path.
+
+Strings are stored with the "surrogatepass" error handler, so texts carrying
+lone UTF-16 surrogates (seen in scraped social posts) round-trip unchanged
+instead of aborting the build.
+"""
+
+import codecs
+import logging
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.utils.hit_stream_parser import HitStreamParser
+from src.utils.hits_helper import MENTION_ID_KEYS
+
+logger = logging.getLogger(__name__)
+
+# Candidate source keys for each projected column, in order of preference
+TIME_KEYS = ("createdTime", "created_time", "snCreatedTime", "publishedTime", "timestamp")
+# Keeps lone surrogates encodable (and decodable) in the UTF-8 buffers
+STRING_ERRORS = "surrogatepass"
+CATEGORICAL_KEYS = {
+    "source": ("source", "snType", "channel"),
+    "language": ("language", "lang"),
+    "country": ("country", "countryCode"),
+}
+
+
+def _first_value(hit: Dict[str, Any], keys: Iterable[str]) -> Any:
+    """Return the first non-empty value among the candidate keys."""
+    for key in keys:
+        value = hit.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+class _StringColumnBuilder:
+    """Append-only builder for a contiguous UTF-8 buffer with offsets."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, value: Optional[str]) -> None:
+        if value:
+            self.buffer += value.encode("utf-8", STRING_ERRORS)
+        self.offsets.append(len(self.buffer))
+
+    def build(self):
+        return bytes(self.buffer), np.frombuffer(self.offsets, dtype=np.int64).copy()
+
+
+class HitStoreBuilder:
+    """
+    Incrementally project hits into a HitStore.
+
+    Used by streaming consumers so hits never need to be held as a list of dicts.
+    """
+
+    def __init__(self):
+        self._texts = _StringColumnBuilder()
+        self._ids = _StringColumnBuilder()
+        self._created_time = array("q")
+        self._categories: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_KEYS}
+        self._codes: Dict[str, array] = {name: array("i") for name in CATEGORICAL_KEYS}
+        self.count = 0
+
+    def append(self, hit: Dict[str, Any]) -> None:
+        """
+        Project one hit into the columns.
+
+        Args:
+            hit: Hit dictionary from the Sprinklr API
+        """
+        if not isinstance(hit, dict):
+            return
+
+        text = hit.get("text")
+        self._texts.append(str(text) if text else None)
+
+        hit_id = _first_value(hit, MENTION_ID_KEYS)
+        self._ids.append(str(hit_id) if hit_id is not None else None)
+
+        created_time = _first_value(hit, TIME_KEYS)
+        try:
+            self._created_time.append(int(created_time) if created_time is not None else -1)
+        except (TypeError, ValueError):
+            self._created_time.append(-1)
+
+        for name, keys in CATEGORICAL_KEYS.items():
+            value = _first_value(hit, keys)
+            if value is None:
+                self._codes[name].append(-1)
+                continue
+            table = self._categories[name]
+            code = table.setdefault(str(value), len(table))
+            self._codes[name].append(code)
+
+        self.count += 1
+
+    def extend(self, hits: Iterable[Dict[str, Any]]) -> None:
+        """Project every hit in an iterable."""
+        for hit in hits:
+            self.append(hit)
+
+    def build(self) -> "HitStore":
+        """Freeze the builder into an immutable HitStore."""
+        text_buffer, text_offsets = self._texts.build()
+        id_buffer, id_offsets = self._ids.build()
+        return HitStore(
+            text_buffer=text_buffer,
+            text_offsets=text_offsets,
+            id_buffer=id_buffer,
+            id_offsets=id_offsets,
+            created_time=np.frombuffer(self._created_time, dtype=np.int64).copy() if self.count else np.empty(0, dtype=np.int64),
+            categorical_codes={
+                name: np.frombuffer(codes, dtype=np.int32).copy() if self.count else np.empty(0, dtype=np.int32)
+                for name, codes in self._codes.items()
+            },
+            categories={name: list(table.keys()) for name, table in self._categories.items()},
+        )
+
+
+class HitStore:
+    """
+    Immutable columnar container for fetched hits.
+
+    Iterating yields dicts with the projected fields (`id`, `text`,
+    `created_time`, `source`, `language`, `country`), which is what the
+    analyzer and theme modifier consume.
+    """
+
+    def __init__(
+        self,
+        text_buffer: bytes,
+        text_offsets: np.ndarray,
+        id_buffer: bytes,
+        id_offsets: np.ndarray,
+        created_time: np.ndarray,
+        categorical_codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+    ):
+        self.text_buffer = text_buffer
+        self.text_offsets = text_offsets
+        self.id_buffer = id_buffer
+        self.id_offsets = id_offsets
+        self.created_time = created_time
+        self.categorical_codes = categorical_codes
+        self.categories = categories
+
+    @classmethod
+    def from_hits(cls, hits: Iterable[Dict[str, Any]]) -> "HitStore":
+        """
+        Build a store from an iterable of hit dicts.
+
+        Args:
+            hits: Hits from the Sprinklr API
+
+        Returns:
+            HitStore holding the projected columns
+        """
+        builder = HitStoreBuilder()
+        builder.extend(hits)
+        return builder.build()
+
+    @classmethod
+    def from_json(cls, payload: Any, chunk_size: int = 1 << 16) -> "HitStore":
+        """
+        Parse a serialized JSON array of hits straight into columns.
+
+        The payload is decoded and parsed one chunk at a time and each hit is
+        projected as soon as it is read, so the full list of hit dicts never
+        exists at once.
+
+        Args:
+            payload: JSON array (or SSE body) as bytes or str
+            chunk_size: Bytes (or characters) parsed per step
+
+        Returns:
+            HitStore holding the projected columns
+
+        Raises:
+            ValueError: If the payload is truncated or malformed
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parser = HitStreamParser()
+        builder = HitStoreBuilder()
+        for start in range(0, len(payload), chunk_size):
+            chunk = payload[start:start + chunk_size]
+            builder.extend(parser.feed(decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk))
+        builder.extend(parser.feed(decoder.decode(b"", final=True)))
+        builder.extend(parser.close())
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.text_offsets) - 1
+
+    def _string(self, buffer: bytes, offsets: np.ndarray, index: int) -> str:
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        return buffer[start:end].decode("utf-8", STRING_ERRORS)
+
+    def text(self, index: int) -> str:
+        """Get the text of hit `index` ("" when the hit had no text)."""
+        return self._string(self.text_buffer, self.text_offsets, index)
+
+    def hit_id(self, index: int) -> Optional[str]:
+        """Get the mention id of hit `index` (None when the hit had no id)."""
+        value = self._string(self.id_buffer, self.id_offsets, index)
+        return value or None
+
+    def category(self, name: str, index: int) -> Optional[str]:
+        """Get the categorical value `name` of hit `index`."""
+        code = int(self.categorical_codes[name][index])
+        return self.categories[name][code] if code >= 0 else None
+
+    def iter_texts(self) -> Iterator[str]:
+        """Iterate over hit texts without materializing dicts."""
+        buffer = self.text_buffer
+        offsets = self.text_offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield buffer[start:end].decode("utf-8", STRING_ERRORS)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("HitStore index out of range")
+        created_time = int(self.created_time[index])
+        hit = {
+            "id": self.hit_id(index),
+            "text": self.text(index),
+            "created_time": created_time if created_time >= 0 else None,
+        }
+        for name in self.categorical_codes:
+            hit[name] = self.category(name, index)
+        return hit
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns."""
+        total = len(self.text_buffer) + len(self.id_buffer)
+        total += self.text_offsets.nbytes + self.id_offsets.nbytes + self.created_time.nbytes
+        total += sum(codes.nbytes for codes in self.categorical_codes.values())
+        return total
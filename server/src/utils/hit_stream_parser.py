@@ -0,0 +1,174 @@
+"""
+Incremental parser for the Sprinklr get-mentions response body.
+
+The get-mentions endpoint is requested with `accept: text/event-stream` and
+returns either a JSON array of hit objects or SSE frames whose `data:` lines
+carry hits (or arrays of hits). This parser accepts the body in arbitrary
+text chunks as they arrive and emits each complete hit as soon as it has been
+read, so downstream work can start before the download finishes and the full
+raw body never has to sit in memory next to the parsed list.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+
+class HitStreamParser:
+    """
+    Push-style incremental parser producing hit dictionaries.
+
+    Usage:
+        parser = HitStreamParser()
+        for chunk in chunks:
+            for hit in parser.feed(chunk):
+                ...
+        parser.close()  # raises ValueError on a truncated body
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._mode = None  # "array", "sse" or "object"
+        self._done = False
+        self._sse_data: List[str] = []
+        self.hits_parsed = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Feed the next chunk of response text.
+
+        Args:
+            chunk: Decoded text chunk from the response body
+
+        Returns:
+            List of hits completed by this chunk (possibly empty)
+        """
+        if self._done or not chunk:
+            return []
+
+        self._buffer += chunk
+
+        if self._mode is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            first = stripped[0]
+            if first == "[":
+                self._mode = "array"
+                self._pos = self._buffer.index("[") + 1
+            elif first == "{":
+                self._mode = "object"
+            else:
+                self._mode = "sse"
+
+        if self._mode == "array":
+            hits = self._parse_array()
+        elif self._mode == "sse":
+            hits = self._parse_sse(final=False)
+        else:
+            hits = []  # A top-level object is not a hit list; validated in close()
+
+        self.hits_parsed += len(hits)
+        return hits
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Signal end of stream and flush any remaining hits.
+
+        Returns:
+            Hits completed by the end of the stream
+
+        Raises:
+            ValueError: If the body ended in the middle of a JSON value
+        """
+        hits = []
+        if self._mode == "sse":
+            hits = self._parse_sse(final=True)
+        elif self._mode == "array" and not self._done:
+            raise ValueError(f"Truncated get-mentions response after {self.hits_parsed} hits")
+        elif self._mode == "object":
+            try:
+                json.loads(self._buffer)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid get-mentions response: {e}") from e
+            logger.warning("get-mentions response was a JSON object, not a hit list - no hits parsed")
+
+        self._buffer = ""
+        self._pos = 0
+        self._done = True
+        self.hits_parsed += len(hits)
+        return hits
+
+    def _parse_array(self) -> List[Dict[str, Any]]:
+        """Decode every complete element currently buffered inside the top-level array."""
+        hits = []
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+
+        while pos < length:
+            char = buffer[pos]
+            if char in _WHITESPACE or char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                self._done = True
+                pos += 1
+                break
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Element not complete yet - wait for more data
+            if isinstance(value, dict):
+                hits.append(value)
+            pos = end
+
+        # Drop consumed text so the buffer only holds the incomplete tail
+        self._buffer = buffer[pos:]
+        self._pos = 0
+        return hits
+
+    def _parse_sse(self, final: bool) -> List[Dict[str, Any]]:
+        """Decode every complete SSE event currently buffered."""
+        hits = []
+        lines = self._buffer.split("\n")
+        # Keep the trailing partial line unless the stream has ended
+        self._buffer = "" if final else lines.pop()
+
+        for line in lines:
+            line = line.rstrip("\r")
+            if line.startswith("data:"):
+                self._sse_data.append(line[5:].lstrip())
+            elif not line:
+                hits.extend(self._flush_sse_event())
+
+        if final:
+            hits.extend(self._flush_sse_event())
+        return hits
+
+    def _flush_sse_event(self) -> List[Dict[str, Any]]:
+        """Decode the data payload of one SSE event into hits."""
+        if not self._sse_data:
+            return []
+        payload = "\n".join(self._sse_data)
+        self._sse_data = []
+
+        if not payload or payload == "[DONE]":
+            return []
+        try:
+            value = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping undecodable SSE event: {payload[:200]}")
+            return []
+
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+        if isinstance(value, dict):
+            return [value]
+        return []
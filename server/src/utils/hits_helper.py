@@ -0,0 +1,236 @@
+"""
+Helper functions for working with Sprinklr mention hits.
+
+Provides fast JSON decoding of get-mentions bodies, time-window splitting for
+sharded fetches and merge/dedupe of hit lists coming from several requests for
+the same boolean query.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Keys that carry a stable mention identifier in get-mentions responses, in order of preference
+MENTION_ID_KEYS = ("id", "messageId", "universalMessageId", "umId", "sn_id")
+
+
+def fast_json_loads(data: Any) -> Any:
+    """
+    Decode JSON with orjson when available, falling back to the stdlib decoder.
+
+    Args:
+        data: JSON document as bytes or str
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_mention_id(hit: Dict[str, Any]) -> Optional[str]:
+    """
+    Get a stable identifier for a mention hit.
+
+    Args:
+        hit: Single hit from the Sprinklr API
+
+    Returns:
+        The mention id, a content hash of the text if no id field is present,
+        or None if the hit has neither
+    """
+    if not isinstance(hit, dict):
+        return None
+
+    for key in MENTION_ID_KEYS:
+        value = hit.get(key)
+        if value:
+            return str(value)
+
+    text = hit.get("text")
+    if text:
+        return "text:" + hashlib.sha1(str(text).encode("utf-8", "surrogatepass")).hexdigest()
+    return None
+
+
+def merge_and_dedupe_hits(hit_lists: Iterable[List[Dict[str, Any]]], limit: int = 0) -> List[Dict[str, Any]]:
+    """
+    Merge several hit lists, keeping the first occurrence of every mention.
+
+    Args:
+        hit_lists: Hit lists in priority order
+        limit: Maximum number of hits to return (0 for no limit)
+
+    Returns:
+        Merged, deduplicated hit list
+    """
+    seen = set()
+    merged = []
+    duplicates = 0
+
+    for hits in hit_lists:
+        for hit in hits or []:
+            mention_id = get_mention_id(hit)
+            if mention_id is not None:
+                if mention_id in seen:
+                    duplicates += 1
+                    continue
+                seen.add(mention_id)
+            merged.append(hit)
+            if limit and len(merged) >= limit:
+                if duplicates:
+                    logger.info(f"Dropped {duplicates} duplicate hits while merging")
+                return merged
+
+    if duplicates:
+        logger.info(f"Dropped {duplicates} duplicate hits while merging")
+    return merged
+
+
+def split_time_window(from_time: int, upto_time: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split an inclusive epoch-millisecond window into contiguous sub-windows.
+
+    Args:
+        from_time: Window start (ms, inclusive)
+        upto_time: Window end (ms, inclusive)
+        shards: Number of sub-windows to produce
+
+    Returns:
+        List of (from_time, upto_time) tuples covering the window without overlap
+    """
+    if shards <= 1 or upto_time <= from_time:
+        return [(from_time, upto_time)]
+
+    span = upto_time - from_time + 1
+    shards = min(shards, span)
+    step = span // shards
+
+    windows = []
+    start = from_time
+    for i in range(shards):
+        end = upto_time if i == shards - 1 else start + step - 1
+        windows.append((start, end))
+        start = end + 1
+    return windows
+
+
+def subtract_windows(from_time: int, upto_time: int, covered: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Get the parts of an inclusive window not covered by other windows.
+
+    Args:
+        from_time: Window start (ms, inclusive)
+        upto_time: Window end (ms, inclusive)
+        covered: Already-covered (from_time, upto_time) windows
+
+    Returns:
+        Uncovered (from_time, upto_time) sub-windows in ascending order
+    """
+    gaps = []
+    cursor = from_time
+    for start, end in sorted(covered):
+        if end < cursor or start > upto_time:
+            continue
+        if start > cursor:
+            gaps.append((cursor, start - 1))
+        cursor = max(cursor, end + 1)
+        if cursor > upto_time:
+            break
+    if cursor <= upto_time:
+        gaps.append((cursor, upto_time))
+    return gaps
+
+
+def proportional_limit(limit: int, from_time: int, upto_time: int, total_from: int, total_upto: int) -> int:
+    """
+    Share of a message limit that a sub-window gets, proportional to its length.
+
+    Args:
+        limit: Message limit for the whole window
+        from_time: Sub-window start (ms, inclusive)
+        upto_time: Sub-window end (ms, inclusive)
+        total_from: Whole window start (ms, inclusive)
+        total_upto: Whole window end (ms, inclusive)
+
+    Returns:
+        Rounded-up message limit for the sub-window (at least 1)
+    """
+    span = upto_time - from_time + 1
+    total_span = max(1, total_upto - total_from + 1)
+    return max(1, -(-limit * span // total_span))  # ceil division
+
+
+def sample_schedule(initial_size: int, max_size: int, growth_factor: float) -> List[int]:
+    """
+    Cumulative sample sizes of the adaptive sampling rounds.
+
+    Args:
+        initial_size: Mentions in the first round
+        max_size: Upper bound on the sample
+        growth_factor: Multiplier applied to the sample size each round
+
+    Returns:
+        Strictly increasing sample sizes, the last one equal to max_size
+    """
+    max_size = max(1, max_size)
+    sizes = [max(1, min(initial_size, max_size))]
+    while sizes[-1] < max_size:
+        sizes.append(min(max_size, max(sizes[-1] + 1, int(sizes[-1] * growth_factor))))
+    return sizes
+
+
+def plan_sample_rounds(
+    from_time: int,
+    upto_time: int,
+    sizes: List[int],
+    slices_per_round: int
+) -> List[List[Tuple[int, int, int]]]:
+    """
+    Plan disjoint fetches for adaptive sampling rounds.
+
+    The window is split into len(sizes) * slices_per_round sub-windows and
+    round r takes every len(sizes)-th one starting at r, so each round's
+    sub-windows are spread across the whole window and no mention is fetched
+    by two rounds. A round's limits add up to its increment over the previous
+    round's sample size.
+
+    Args:
+        from_time: Window start (ms, inclusive)
+        upto_time: Window end (ms, inclusive)
+        sizes: Cumulative sample sizes from sample_schedule()
+        slices_per_round: Sub-windows fetched per round
+
+    Returns:
+        Per round, a list of (from_time, upto_time, limit) fetches
+    """
+    rounds = len(sizes)
+    windows = split_time_window(from_time, upto_time, rounds * max(1, slices_per_round))
+    plan = []
+    previous = 0
+    for index, size in enumerate(sizes):
+        group = windows[index::rounds]
+        increment = size - previous
+        previous = size
+        if not group:
+            plan.append([])
+            continue
+        base, extra = divmod(increment, len(group))
+        plan.append([
+            (start, end, base + (1 if position < extra else 0))
+            for position, (start, end) in enumerate(group)
+            if base + (1 if position < extra else 0) > 0
+        ])
+    return plan
@@ -0,0 +1,221 @@
+"""
+Bounded background job queue for long-running workflow requests.
+
+A /api/process request can spend minutes in fetches, BERTopic and LLM calls.
+In job mode the request only enqueues the work and returns a job id; a fixed
+number of worker tasks drain the queue, and clients poll the job for its
+status and result (including HITL interrupt payloads). The queue is bounded
+so bursts are rejected early instead of piling up, and each conversation has
+at most one active job because a LangGraph thread cannot run twice at once.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobRejectedError(Exception):
+    """Raised when a job cannot be accepted."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Job:
+    """One unit of queued work and its outcome."""
+
+    def __init__(self, func: Callable[[], Awaitable[Any]], key: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+        self.func = func
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the job for API responses.
+
+        Returns:
+            Dictionary with id, status, timings and, once finished, result or error
+        """
+        now = time.time()
+        return {
+            "job_id": self.job_id,
+            "key": self.key,
+            "status": self.status,
+            "queue_wait_seconds": round((self.started_at or now) - self.submitted_at, 3),
+            "run_seconds": round((self.finished_at or now) - self.started_at, 3) if self.started_at else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Fixed pool of worker tasks draining a bounded FIFO queue of jobs.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 64, result_ttl_seconds: int = 3600, max_retained_jobs: int = 1000):
+        """
+        Initialize the queue (workers start with start()).
+
+        Args:
+            max_workers: Jobs executed concurrently
+            max_queue_size: Jobs allowed to wait; further submissions are rejected
+            result_ttl_seconds: Seconds finished jobs stay available for polling
+            max_retained_jobs: Maximum finished jobs kept for polling (oldest dropped first)
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_retained_jobs = max_retained_jobs
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active_keys: Dict[str, str] = {}
+        self._running = 0
+        self._wait_times = deque(maxlen=256)
+        self.stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0}
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.max_workers)]
+        logger.info(f"Job queue started with {self.max_workers} workers (queue size {self.max_queue_size})")
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs are marked failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        for job in self._jobs.values():
+            if not job.done:
+                self._finish(job, FAILED, error="Server shutting down")
+
+    def _prune(self) -> None:
+        """Drop finished jobs past their TTL or beyond the retention bound."""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished:
+            if now - job.finished_at > self.result_ttl_seconds:
+                del self._jobs[job.job_id]
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - self.max_retained_jobs)]:
+            del self._jobs[job.job_id]
+
+    def submit(self, func: Callable[[], Awaitable[Any]], key: Optional[str] = None) -> Job:
+        """
+        Enqueue a job.
+
+        Args:
+            func: Zero-argument coroutine factory doing the work
+            key: Optional serialization key (e.g. thread_id); one active job per key
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobRejectedError: If the queue is not running or full, or the key has an active job
+        """
+        if self._queue is None:
+            raise JobRejectedError("not_started", "Job queue is not running")
+        if key is not None and key in self._active_keys:
+            self.stats["rejected"] += 1
+            raise JobRejectedError("key_busy", f"Job {self._active_keys[key]} is still active for {key}")
+
+        job = Job(func, key)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise JobRejectedError("queue_full", f"Job queue is full ({self.max_queue_size} waiting)")
+
+        self._prune()
+        self._jobs[job.job_id] = job
+        if key is not None:
+            self._active_keys[key] = job.job_id
+        self.stats["submitted"] += 1
+        return job
+
+    def active_job(self, key: str) -> Optional[Job]:
+        """Get the queued or running job for a key, if any."""
+        job_id = self._active_keys.get(key)
+        return self._jobs.get(job_id) if job_id else None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id (None once pruned or unknown)."""
+        return self._jobs.get(job_id)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.func = None
+        if job.key is not None and self._active_keys.get(job.key) == job.job_id:
+            del self._active_keys[job.key]
+        self.stats[status] += 1
+
+    async def _worker(self, index: int) -> None:
+        """Run queued jobs one at a time."""
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.submitted_at)
+            self._running += 1
+            try:
+                result = await job.func()
+                self._finish(job, SUCCEEDED, result=result)
+            except asyncio.CancelledError:
+                self._finish(job, FAILED, error="Cancelled")
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.job_id} failed: {e}")
+                self._finish(job, FAILED, error=str(e))
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth, concurrency and wait time statistics.
+
+        Returns:
+            Dictionary with counters, queue depth, running jobs and queue wait times
+        """
+        wait_times = list(self._wait_times)
+        stats = dict(self.stats)
+        stats.update({
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            "running": self._running,
+            "retained_jobs": len(self._jobs),
+            "avg_queue_wait_seconds": round(sum(wait_times) / len(wait_times), 3) if wait_times else 0.0,
+            "max_queue_wait_seconds": round(max(wait_times), 3) if wait_times else 0.0,
+        })
+        return stats
@@ -0,0 +1,183 @@
+"""
+Off-thread, structured logging for the API.
+
+Handlers that write to stdout and files are slow, and calling them on the
+event loop thread adds their I/O to every request. configure_logging() gives
+the root logger a single QueueHandler. A QueueListener thread owns the
+stream/file handlers and does the formatting and writing:
+
+    listener = configure_logging(level="INFO", json_format=True, log_file="api.log")
+    ...
+    listener.stop()    # flushes queued records on shutdown
+
+Each record carries the id of the request it was logged under (request_id_var,
+set by the API middleware), so JSON lines from concurrent requests can be
+told apart. StateSummary renders a workflow state as a size-capped summary
+and is meant for debug-level logging only.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+# Id of the API request being handled ("-" outside requests)
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default="-")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+@contextmanager
+def bind_request_id(request_id: str) -> Iterator[None]:
+    """
+    Attribute log records in the block to a request (e.g. inside a background job).
+
+    Args:
+        request_id: Request id to attach
+    """
+    token = request_id_var.set(request_id)
+    try:
+        yield
+    finally:
+        request_id_var.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (runs on the thread that logged)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        # exc_text is pre-rendered when the record went through the queue
+        exception = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exception:
+            payload["exception"] = exception
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _PreparingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that only merges args into the message on the calling thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default prepare() runs the handler's formatter on the caller;
+        # formatting (timestamps, JSON) is left to the listener thread instead
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", json_format: bool = False, log_file: Optional[str] = None, use_queue: bool = True) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure the root logger.
+
+    Args:
+        level: Root log level name
+        json_format: Emit JSON lines instead of the plain text format
+        log_file: Optional file receiving the same records as stdout
+        use_queue: Hand records to a listener thread instead of writing inline
+
+    Returns:
+        The started QueueListener (stop it on shutdown), or None without a queue
+    """
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level.upper())
+
+    if not use_queue:
+        for handler in handlers:
+            handler.addFilter(RequestIdFilter())
+            root.addHandler(handler)
+        return None
+
+    queue_handler = _PreparingQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestIdFilter())
+    root.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _summarize_value(value: Any, max_item_chars: int) -> Any:
+    """Keep short values; replace bulky ones by their size and truncate long strings."""
+    if isinstance(value, str):
+        return value if len(value) <= max_item_chars else value[:max_item_chars] + f"...(+{len(value) - max_item_chars} chars)"
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple, Mapping)) and len(value) <= 20:
+        rendered = json.dumps(value, ensure_ascii=False, default=str)
+        if len(rendered) <= max_item_chars:
+            return value
+    if isinstance(value, Mapping):
+        return f"<dict keys={len(value)}>"
+    if hasattr(value, "__len__"):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+class StateSummary:
+    """
+    Lazily rendered, size-capped summary of a workflow state.
+
+    Nothing is computed unless the record is actually emitted, so passing it
+    as a logging argument is cheap when DEBUG is disabled:
+
+        logger.debug("State before Data Analyzer: %s", StateSummary(state))
+    """
+
+    def __init__(self, state: Mapping[str, Any], max_chars: int = 2000, max_item_chars: int = 200):
+        """
+        Initialize the summary.
+
+        Args:
+            state: Workflow state
+            max_chars: Maximum length of the rendered summary
+            max_item_chars: Maximum length of each string value
+        """
+        self.state = state
+        self.max_chars = max_chars
+        self.max_item_chars = max_item_chars
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize each non-empty field."""
+        return {
+            key: _summarize_value(value, self.max_item_chars)
+            for key, value in (self.state or {}).items()
+            if value is not None and not (isinstance(value, (str, list, dict)) and not value)
+        }
+
+    def __str__(self) -> str:
+        text = json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars] + f"...(+{len(text) - self.max_chars} chars)"
+        return text
@@ -0,0 +1,296 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+A small registry of counters, gauges and histograms with labels, rendered in
+the Prometheus text format by GET /api/metrics. Stage timing goes through
+observe_stage(), which records one latency histogram and one outcome counter
+labelled by stage kind (node, llm, fetch, embedding, clustering) and name:
+
+    with observe_stage("fetch", "window") as stage:
+        hits = ...
+        stage.items = len(hits)
+        stage.payload_bytes = len(response.content)
+
+The graph node currently executing is tracked in a context variable, so LLM
+calls made by an agent are attributed to the node that issued them.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+try:
+    import resource
+except ImportError:    # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers millisecond cache reads up to multi-minute BERTopic runs
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+COUNT_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 2500, 5000, 10000, 50000)
+BYTES_BUCKETS = (1024, 16 * 1024, 128 * 1024, 1024 ** 2, 8 * 1024 ** 2, 32 * 1024 ** 2, 128 * 1024 ** 2)
+
+# Graph node currently executing (used to label LLM calls)
+current_node: contextvars.ContextVar = contextvars.ContextVar("current_node", default="none")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base for labelled metrics."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render HELP/TYPE lines and samples."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"] + self._samples()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution with sum and count per label set."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # [per-bucket counts..., +Inf count, sum]
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(state[-2]) if state else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), state[:-1]):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {_format_value(bucket_count)}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-1])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class: Type[_Metric], name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_class) or existing.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} already registered with a different type or labels")
+                return existing
+            metric = metric_class(name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text (version 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
+
+stage_duration = metrics_registry.histogram(
+    "insights_stage_duration_seconds", "Duration of workflow stages", ("kind", "name")
+)
+stage_total = metrics_registry.counter(
+    "insights_stage_total", "Workflow stage executions by outcome", ("kind", "name", "outcome")
+)
+stage_items = metrics_registry.histogram(
+    "insights_stage_items", "Items (hits, documents) handled per stage execution", ("kind", "name"), buckets=COUNT_BUCKETS
+)
+stage_payload_bytes = metrics_registry.histogram(
+    "insights_stage_payload_bytes", "Payload bytes handled per stage execution", ("kind", "name"), buckets=BYTES_BUCKETS
+)
+process_cpu_seconds = metrics_registry.counter("process_cpu_seconds_total", "Total user and system CPU time spent in seconds")
+process_max_rss_bytes = metrics_registry.gauge("process_max_resident_memory_bytes", "Peak resident memory of the process in bytes")
+# Serializes the read-and-advance of the CPU counter between concurrent renders
+_process_metrics_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Get the global metrics registry.
+
+    Returns:
+        MetricsRegistry instance
+    """
+    return metrics_registry
+
+
+class StageObservation:
+    """Sizes recorded by the code inside observe_stage()."""
+
+    def __init__(self):
+        self.items: Optional[int] = None
+        self.payload_bytes: Optional[int] = None
+
+
+@contextmanager
+def observe_stage(kind: str, name: str, interrupt_types: Tuple[Type[BaseException], ...] = ()) -> Iterator[StageObservation]:
+    """
+    Time a stage and count its outcome.
+
+    Args:
+        kind: Stage kind (node, llm, fetch, embedding, clustering)
+        name: Stage name (node name, agent node, request kind, ...)
+        interrupt_types: Exceptions that signal a pause rather than a failure
+            (counted with outcome "interrupted", e.g. LangGraph's GraphInterrupt)
+
+    Yields:
+        StageObservation whose items/payload_bytes the caller may set
+    """
+    observation = StageObservation()
+    outcome = "success"
+    start = time.perf_counter()
+    try:
+        yield observation
+    except interrupt_types:
+        outcome = "interrupted"
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        stage_duration.observe(time.perf_counter() - start, kind=kind, name=name)
+        stage_total.inc(kind=kind, name=name, outcome=outcome)
+        if observation.items is not None:
+            stage_items.observe(observation.items, kind=kind, name=name)
+        if observation.payload_bytes is not None:
+            stage_payload_bytes.observe(observation.payload_bytes, kind=kind, name=name)
+
+
+def render_metrics() -> str:
+    """
+    Refresh process metrics and render the global registry.
+
+    Returns:
+        Prometheus exposition text
+    """
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        with _process_metrics_lock:
+            # Advance the counter by the CPU time used since the last render
+            process_cpu_seconds.inc(max(0.0, usage.ru_utime + usage.ru_stime - process_cpu_seconds.value()))
+        process_max_rss_bytes.set(usage.ru_maxrss * 1024)    # ru_maxrss is in KiB on Linux
+    return metrics_registry.render()
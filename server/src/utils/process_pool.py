@@ -0,0 +1,173 @@
+"""
+Warm process pool for CPU-bound work called from async code.
+
+BERTopic fits and sentence-transformer encodes hold the GIL for long stretches,
+so running them in threads still slows down the event loop serving health
+checks, history reads and other conversations. WarmProcessPool runs them in
+worker processes instead:
+
+    embeddings = await pool.run(encode_texts, model_name, documents, {})
+
+Workers run an initializer once (e.g. to load models), and start() spawns and
+initializes all of them up front so the first request does not pay the model
+load. Functions and arguments must be picklable; keep inputs and outputs to
+plain lists and numpy arrays. If a worker dies (e.g. killed for memory) the
+pool is recreated and the affected calls fail with RuntimeError.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_pid(delay: float = 0.0) -> int:
+    """Identify the worker process (used to warm the pool)."""
+    if delay:
+        time.sleep(delay)
+    return os.getpid()
+
+
+class WarmProcessPool:
+    """
+    Process pool with preloaded workers, usable from async code.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Sequence[Any] = (),
+        start_method: str = "spawn"
+    ):
+        """
+        Initialize the pool (processes start with start() or on first use).
+
+        Args:
+            name: Pool name used in logs
+            max_workers: Number of worker processes
+            initializer: Function run once in every worker (e.g. to load models)
+            initargs: Arguments for the initializer
+            start_method: multiprocessing start method ("spawn" avoids forking a process with live threads)
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._task_times = deque(maxlen=256)
+        self._worker_pids = set()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "restarts": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+            return self._executor
+
+    def _discard_executor(self, broken: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next call starts fresh workers."""
+        with self._lock:
+            if self._executor is not broken:
+                return    # Already replaced by a concurrent call
+            self._executor = None
+            self._worker_pids.clear()
+            self.stats["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """
+        Spawn every worker and wait until their initializers have run.
+
+        Raises:
+            RuntimeError: If a worker fails to start
+        """
+        started = time.perf_counter()
+        # Each warm-up call holds its worker briefly, so every call needs its own process
+        pids = await asyncio.gather(*(self.run(_worker_pid, 0.2) for _ in range(self.max_workers)))
+        self._worker_pids.update(pids)
+        logger.info(f"⚙️ {self.name} pool ready: {len(set(pids))} workers in {time.perf_counter() - started:.1f}s")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a function in a worker process.
+
+        Args:
+            func: Picklable (module-level) function
+            *args: Picklable arguments
+
+        Returns:
+            The function's return value
+
+        Raises:
+            RuntimeError: If the worker process died while running the call
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        self.stats["submitted"] += 1
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            self.stats["failed"] += 1
+            logger.error(f"❌ {self.name} pool worker died; restarting the pool: {e}")
+            self._discard_executor(executor)
+            raise RuntimeError(f"{self.name} worker process died") from e
+        except BaseException:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        self._task_times.append(time.perf_counter() - started)
+        self.stats["completed"] += 1
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._worker_pids.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info(f"{self.name} pool stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with size, load, counters and task durations
+        """
+        task_times = list(self._task_times)
+        stats = dict(self.stats)
+        stats.update({
+            "max_workers": self.max_workers,
+            "running": self._executor is not None,
+            "warm_workers": len(self._worker_pids),
+            "in_flight": self._in_flight,
+            "avg_task_seconds": round(sum(task_times) / len(task_times), 3) if task_times else 0.0,
+        })
+        return stats
@@ -0,0 +1,173 @@
+"""
+Adaptive token-bucket rate limiting for outbound API calls.
+
+One limiter instance is shared by every caller of an upstream API so the
+combined request rate stays under a budget. The refill rate backs off
+multiplicatively when the upstream throttles (HTTP 429) and recovers
+additively on success. A Retry-After pause stops every caller, not just the
+one that was throttled.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait (never negative), or None if absent/unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Random delay in [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Async token bucket with AIMD rate adaptation.
+
+    Waiters are served in FIFO order (asyncio.Lock is fair), so a burst of
+    callers queues up instead of all retrying at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        burst: int,
+        min_rate_per_second: float = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name used in logs and stats
+            rate_per_second: Maximum (and initial) refill rate
+            burst: Bucket capacity
+            min_rate_per_second: Floor for the adaptive rate (defaults to 10% of the maximum)
+        """
+        self.name = name
+        self.max_rate = max(0.001, float(rate_per_second))
+        self.min_rate = min(self.max_rate, min_rate_per_second if min_rate_per_second else self.max_rate / 10)
+        self.rate = self.max_rate
+        self.capacity = max(1.0, float(burst))
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+        self.stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        break
+                    await asyncio.sleep((1.0 - self._tokens) / self.rate)
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        self.stats["acquired"] += 1
+        self.stats["total_wait_seconds"] += waited
+        return waited
+
+    def on_success(self) -> None:
+        """Additively raise the rate back towards the maximum."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Halve the rate and optionally pause every caller.
+
+        Args:
+            retry_after: Seconds the upstream asked us to wait, if given
+        """
+        self.stats["throttled"] += 1
+        self._refill(time.monotonic())
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(f"[{self.name}] Throttled by upstream - rate now {self.rate:.2f}/s" + (f", paused {retry_after:.1f}s" if retry_after else ""))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter state and counters.
+
+        Returns:
+            Dictionary with current rate, available tokens, queued callers and counters
+        """
+        stats = dict(self.stats)
+        stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+        stats.update({
+            "rate_per_second": round(self.rate, 3),
+            "max_rate_per_second": self.max_rate,
+            "tokens": round(min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate), 3),
+            "queued": self._waiting,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+        })
+        return stats
@@ -0,0 +1,233 @@
+"""
+Shared-memory transfer of corpora and embedding matrices to worker processes.
+
+Pickling 5000 texts and an N x 384 embedding matrix for every pool call copies
+them several times (serialize, pipe, deserialize). Instead the caller writes
+them once into multiprocessing.shared_memory segments and only small handles
+(segment name, shape, dtype, text count) cross the process boundary:
+
+    with SharedMemoryScope() as scope:
+        out = scope.allocate_array((len(texts), 384), np.float32)
+        await pool.run(encode_texts_shared, model_name, scope.share_texts(texts), out, {})
+        embeddings = scope.read_array(out)
+
+Lifetime: the caller's SharedMemoryScope creates every segment and unlinks all
+of them when the block exits, even if the call failed or was cancelled.
+Workers only attach. An unlinked segment stays readable by a worker that still
+has it mapped, and its memory is freed once the worker closes it. Segments are
+also registered with the multiprocessing resource tracker, so they are removed
+if the server process dies.
+
+A text corpus is one segment: an int64 offset table (count + 1 entries)
+followed by the UTF-8 bytes of all texts.
+"""
+
+import logging
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArrayHandle(NamedTuple):
+    """Picklable reference to an array stored in a shared memory segment."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedTextsHandle(NamedTuple):
+    """Picklable reference to a text corpus stored in a shared memory segment."""
+    name: str
+    count: int
+
+
+def _view(shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+class SharedMemoryScope:
+    """
+    Owner of the shared memory segments used by one or more pool calls.
+    """
+
+    def __init__(self):
+        self._segments: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> "SharedMemoryScope":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _create(self, size: int) -> shared_memory.SharedMemory:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+        self._segments.append(shm)
+        return shm
+
+    def allocate_array(self, shape: Sequence[int], dtype=np.float32) -> SharedArrayHandle:
+        """
+        Create an uninitialized shared array for a worker to fill.
+
+        Args:
+            shape: Array shape
+            dtype: Array dtype
+
+        Returns:
+            Handle to pass to the worker
+        """
+        shape = tuple(int(dim) for dim in shape)
+        dtype = np.dtype(dtype)
+        shm = self._create(int(np.prod(shape)) * dtype.itemsize)
+        return SharedArrayHandle(shm.name, shape, dtype.str)
+
+    def share_array(self, array: np.ndarray) -> SharedArrayHandle:
+        """
+        Copy an array into a new shared segment.
+
+        Args:
+            array: Array to share
+
+        Returns:
+            Handle to pass to the worker
+        """
+        array = np.asarray(array)
+        handle = self.allocate_array(array.shape, array.dtype)
+        _view(self._segments[-1], handle.shape, handle.dtype)[...] = array
+        return handle
+
+    def share_texts(self, texts: Sequence[str]) -> SharedTextsHandle:
+        """
+        Write a text corpus into a new shared segment.
+
+        Args:
+            texts: Texts to share
+
+        Returns:
+            Handle to pass to the worker
+        """
+        encoded = [text.encode("utf-8", errors="surrogatepass") for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        table_bytes = offsets.nbytes
+        shm = self._create(table_bytes + int(offsets[-1]))
+        _view(shm, offsets.shape, offsets.dtype.str)[...] = offsets
+        shm.buf[table_bytes:table_bytes + int(offsets[-1])] = b"".join(encoded)
+        return SharedTextsHandle(shm.name, len(encoded))
+
+    def read_array(self, handle: SharedArrayHandle) -> np.ndarray:
+        """
+        Copy a shared array (e.g. a worker's output) into process memory.
+
+        Args:
+            handle: Handle created by this scope
+
+        Returns:
+            Array that stays valid after the scope closes
+        """
+        for shm in self._segments:
+            if shm.name == handle.name:
+                return np.array(_view(shm, handle.shape, handle.dtype))
+        raise KeyError(f"Shared segment {handle.name} does not belong to this scope")
+
+    def close(self) -> None:
+        """Close and unlink every segment created by this scope."""
+        segments, self._segments = self._segments, []
+        for shm in segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to release shared segment {shm.name}: {e}")
+
+
+# Worker side: segments whose views were still referenced when released
+_deferred_close: List[shared_memory.SharedMemory] = []
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    """Close a worker's mapping, deferring it while arrays still point into it."""
+    try:
+        shm.close()
+    except BufferError:
+        _deferred_close.append(shm)
+
+
+def _retry_deferred() -> None:
+    for shm in list(_deferred_close):
+        try:
+            shm.close()
+            _deferred_close.remove(shm)
+        except BufferError:
+            pass
+
+
+@contextmanager
+def attach_array(handle: SharedArrayHandle) -> Iterator[np.ndarray]:
+    """
+    Map a shared array in a worker without copying it.
+
+    The view must not be used after the block. While something still
+    references it (the `as` target, a fitted model) the mapping stays open
+    and is closed on a later attach.
+
+    Args:
+        handle: Handle received from the owning process
+
+    Yields:
+        Array backed by the shared segment (writable, for output arrays)
+    """
+    _retry_deferred()
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        view = _view(shm, handle.shape, handle.dtype)
+        yield view
+        del view
+    finally:
+        _release(shm)
+
+
+def write_array(handle: SharedArrayHandle, array: np.ndarray) -> None:
+    """
+    Copy a worker's result into a shared output array.
+
+    Args:
+        handle: Output handle allocated by the owning process
+        array: Result with the handle's shape
+    """
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        _view(shm, handle.shape, handle.dtype)[...] = array
+    finally:
+        _release(shm)
+
+
+def load_texts(handle: SharedTextsHandle) -> List[str]:
+    """
+    Decode a shared text corpus in a worker.
+
+    Args:
+        handle: Handle received from the owning process
+
+    Returns:
+        List of texts
+    """
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        offsets = _view(shm, (handle.count + 1,), "<i8").tolist()
+        table_bytes = (handle.count + 1) * 8
+        data = shm.buf[table_bytes:table_bytes + offsets[-1]]
+        try:
+            return [
+                str(data[start:end], "utf-8", "surrogatepass")
+                for start, end in zip(offsets, offsets[1:])
+            ]
+        finally:
+            data.release()
+    finally:
+        _release(shm)
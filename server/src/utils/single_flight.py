@@ -0,0 +1,85 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight execution
+instead of each running it. Used in front of the Sprinklr fetch so bursts of
+identical dashboard requests send a single upstream request.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key.
+
+    The first caller for a key starts the work as a separate task; callers that
+    arrive while it is running await the same task. The task is shielded, so a
+    cancelled caller (e.g. a dropped HTTP request) does not cancel the fetch for
+    the others. Errors are propagated to every waiter.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        """
+        Initialize the coalescing group.
+
+        Args:
+            name: Name used in logs and stats
+        """
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once per key among concurrent callers.
+
+        Args:
+            key: Identity of the request (callers with equal keys are merged)
+            func: Zero-argument coroutine factory performing the work
+
+        Returns:
+            The shared result of func
+        """
+        self.stats["calls"] += 1
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            logger.info(f"[{self.name}] Coalesced request onto in-flight call {key[:12]}")
+        else:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(self._run(key, func))
+            self._in_flight[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Execute func and remove the key once it settles."""
+        try:
+            return await func()
+        except BaseException:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with calls, executions, coalesced count and in-flight keys
+        """
+        stats = dict(self.stats)
+        stats["in_flight"] = len(self._in_flight)
+        return stats
@@ -0,0 +1,160 @@
+"""
+Speculative work started while a conversation waits on a HITL interrupt.
+
+Most answers to the query verification step are approvals, and everything
+after it (boolean query generation, the Sprinklr fetch, embedding) depends
+only on state that is already known when the interrupt is raised. The
+registry runs that work as a background task per thread, tagged with a
+fingerprint of the state it was derived from. After approval the graph
+adopts the result if the fingerprint still matches; on refinement the task
+is cancelled and its result discarded.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def state_fingerprint(state: Dict[str, Any], keys: Iterable[str]) -> str:
+    """
+    Hash the state fields a speculative run depends on.
+
+    Args:
+        state: Workflow state
+        keys: Fields that determine the speculative result
+
+    Returns:
+        Hex digest identifying the inputs
+    """
+    payload = json.dumps({key: state.get(key) for key in keys}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SpeculativeRun:
+    """A background task computing results for one thread and fingerprint."""
+
+    def __init__(self, fingerprint: str, task: asyncio.Task):
+        self.fingerprint = fingerprint
+        self.task = task
+        self.started_at = time.time()
+
+
+class SpeculationRegistry:
+    """
+    Bounded, TTL-expiring registry of speculative runs keyed by thread_id.
+
+    Each thread has at most one run; starting a run with a new fingerprint
+    cancels the previous one.
+    """
+
+    def __init__(self, max_runs: int = 16, ttl_seconds: int = 600):
+        """
+        Initialize the registry.
+
+        Args:
+            max_runs: Maximum threads with a speculative run (oldest cancelled first)
+            ttl_seconds: Seconds after which an unclaimed run is cancelled
+        """
+        self.max_runs = max_runs
+        self.ttl_seconds = ttl_seconds
+        self._runs: "OrderedDict[str, SpeculativeRun]" = OrderedDict()
+        self.stats = {"started": 0, "adopted": 0, "discarded": 0, "mismatched": 0, "failed": 0, "expired": 0}
+
+    def _drop(self, thread_id: str, reason: str) -> None:
+        run = self._runs.pop(thread_id, None)
+        if run is None:
+            return
+        if not run.task.done():
+            run.task.cancel()
+        self.stats[reason] += 1
+
+    def _expire(self) -> None:
+        now = time.time()
+        for thread_id in [t for t, run in self._runs.items() if now - run.started_at > self.ttl_seconds]:
+            self._drop(thread_id, "expired")
+        while len(self._runs) > self.max_runs:
+            self._drop(next(iter(self._runs)), "expired")
+
+    def start(self, thread_id: str, fingerprint: str, func: Callable[[], Awaitable[Dict[str, Any]]]) -> bool:
+        """
+        Start a speculative run unless one with the same fingerprint exists.
+
+        Args:
+            thread_id: Conversation thread id
+            fingerprint: Fingerprint of the state the run is derived from
+            func: Zero-argument coroutine factory producing the result
+
+        Returns:
+            True if a new run was started
+        """
+        run = self._runs.get(thread_id)
+        if run is not None:
+            if run.fingerprint == fingerprint:
+                return False
+            self._drop(thread_id, "discarded")
+
+        task = asyncio.ensure_future(func())
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())    # Mark exceptions as retrieved
+        self._runs[thread_id] = SpeculativeRun(fingerprint, task)
+        self.stats["started"] += 1
+        self._expire()
+        logger.info(f"🔮 Started speculative run for thread {thread_id}")
+        return True
+
+    async def result(self, thread_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a thread's speculative result without claiming it.
+
+        Args:
+            thread_id: Conversation thread id
+            fingerprint: Fingerprint of the current state
+
+        Returns:
+            The result, or None if there is no run for this state or it failed
+        """
+        run = self._runs.get(thread_id)
+        if run is None:
+            return None
+        if run.fingerprint != fingerprint:
+            self._drop(thread_id, "mismatched")
+            return None
+        try:
+            return await asyncio.shield(run.task)
+        except asyncio.CancelledError:
+            if run.task.cancelled():
+                return None
+            raise
+        except Exception as e:
+            logger.warning(f"Speculative run for thread {thread_id} failed: {e}")
+            if self._runs.get(thread_id) is run:
+                self._drop(thread_id, "failed")
+            return None
+
+    def adopt(self, thread_id: str) -> None:
+        """Release a run whose result has been used by the graph."""
+        if self._runs.pop(thread_id, None) is not None:
+            self.stats["adopted"] += 1
+            logger.info(f"🔮 Adopted speculative run for thread {thread_id}")
+
+    def discard(self, thread_id: str) -> None:
+        """Cancel a thread's run (e.g. when the user refined the query)."""
+        if thread_id in self._runs:
+            self._drop(thread_id, "discarded")
+            logger.info(f"🔮 Discarded speculative run for thread {thread_id}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get speculation counters.
+
+        Returns:
+            Dictionary with outcome counters and the number of pending runs
+        """
+        stats = dict(self.stats)
+        stats["pending"] = len(self._runs)
+        return stats
@@ -0,0 +1,183 @@
+"""
+Per-thread store for fetched hits and derived analysis artifacts.
+
+Hits are kept out of the LangGraph state (checkpoints would explode), but
+the workflow object is shared by every conversation. This store keeps each
+conversation's hits, documents and embeddings under its thread_id and the
+run id of the tool execution that produced them. Concurrent conversations
+therefore never see each other's data. The artifacts stay available across
+the data analyzer, theme refine and theme modifier loop.
+
+Memory is bounded by entry count and total bytes (least recently used
+threads are evicted first), and idle entries expire after a TTL. With a
+spill (see artifact_spill.py) each run is also written to disk and served
+memory-mapped, so evicted entries and runs from before a restart are
+reloaded from disk instead of being refetched.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadArtifacts:
+    """Artifacts of one tool execution within a conversation."""
+
+    def __init__(self, run_id: str, hits: Any, documents: Optional[List[str]] = None, embeddings: Any = None):
+        """
+        Initialize the artifacts.
+
+        Args:
+            run_id: Id of the tool execution that produced the hits
+            hits: HitStore (or list of hits)
+            documents: Extracted documents, if already computed
+            embeddings: Embeddings row-aligned with documents, if already computed
+        """
+        self.run_id = run_id
+        self.hits = hits
+        self.documents = documents
+        self.embeddings = embeddings
+        self.created_at = time.time()
+        self.last_access = self.created_at
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the artifacts."""
+        total = getattr(self.hits, "nbytes", 0)
+        if self.documents:
+            total += sum(len(document) for document in self.documents)
+        total += getattr(self.embeddings, "nbytes", 0)
+        return total
+
+
+class ThreadArtifactStore:
+    """
+    Bounded, TTL-evicting store of ThreadArtifacts keyed by thread_id.
+
+    A thread holds the artifacts of its latest tool execution; readers pass the
+    run id recorded in state so artifacts from a superseded run are never used.
+    """
+
+    def __init__(self, max_threads: int = 32, max_bytes: int = 1024 * 1024 * 1024, ttl_seconds: int = 3600, spill: Any = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_threads: Maximum conversations holding artifacts
+            max_bytes: Maximum approximate bytes across all conversations
+            ttl_seconds: Seconds since last access after which artifacts expire
+            spill: Optional ArtifactSpill backing entries on disk
+        """
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill = spill
+        self._entries: "OrderedDict[str, ThreadArtifacts]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"puts": 0, "hits": 0, "misses": 0, "stale": 0, "evictions": 0, "expired": 0, "spill_loads": 0}
+
+    @staticmethod
+    def new_run_id() -> str:
+        """Generate an id for a tool execution."""
+        return uuid.uuid4().hex
+
+    def _expire(self, now: float) -> None:
+        """Drop idle entries (caller must hold the lock)."""
+        for thread_id in [t for t, entry in self._entries.items() if now - entry.last_access > self.ttl_seconds]:
+            del self._entries[thread_id]
+            self.stats["expired"] += 1
+
+    def _evict(self) -> None:
+        """Evict least recently used threads beyond the bounds (caller must hold the lock)."""
+        total = sum(entry.nbytes for entry in self._entries.values())
+        # The most recent entry is never evicted for size alone
+        while len(self._entries) > self.max_threads or (total > self.max_bytes and len(self._entries) > 1):
+            thread_id, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes
+            self.stats["evictions"] += 1
+            logger.warning(f"Evicted artifacts of thread {thread_id} ({entry.nbytes / 1024 / 1024:.1f} MiB) to stay within bounds")
+
+    def put(self, thread_id: str, artifacts: ThreadArtifacts) -> ThreadArtifacts:
+        """
+        Store the artifacts of a tool execution, replacing the thread's previous run.
+
+        With a spill the artifacts are written to disk first (blocking file I/O;
+        call from a worker thread in async code) and the memory-mapped copy is kept.
+
+        Args:
+            thread_id: Conversation thread id
+            artifacts: Artifacts of the run
+
+        Returns:
+            The stored artifacts (memory-mapped when spilled)
+        """
+        if self.spill is not None:
+            artifacts = self.spill.write(thread_id, artifacts) or artifacts
+        with self._lock:
+            self._expire(time.time())
+            self._entries.pop(thread_id, None)
+            self._entries[thread_id] = artifacts
+            self.stats["puts"] += 1
+            self._evict()
+        return artifacts
+
+    def get(self, thread_id: str, run_id: Optional[str] = None) -> Optional[ThreadArtifacts]:
+        """
+        Get a thread's artifacts, falling back to the spill when they are not in memory.
+
+        Args:
+            thread_id: Conversation thread id
+            run_id: Expected run id (None accepts any run)
+
+        Returns:
+            The artifacts, or None if missing, expired or from a different run
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(thread_id)
+            if entry is not None and (run_id is None or entry.run_id == run_id):
+                entry.last_access = now
+                self._entries.move_to_end(thread_id)
+                self.stats["hits"] += 1
+                return entry
+
+        spilled = self.spill.load(thread_id, run_id) if self.spill is not None else None
+        with self._lock:
+            if spilled is not None:
+                self._entries.pop(thread_id, None)
+                self._entries[thread_id] = spilled
+                self.stats["spill_loads"] += 1
+                self._evict()
+                logger.info(f"Reloaded artifacts of thread {thread_id} from disk")
+                return spilled
+            self.stats["misses" if entry is None else "stale"] += 1
+            return None
+
+    def discard(self, thread_id: str) -> None:
+        """Release a thread's artifacts once its analysis loop has finished."""
+        with self._lock:
+            if self._entries.pop(thread_id, None) is not None:
+                logger.info(f"Released artifacts of thread {thread_id}")
+        if self.spill is not None:
+            self.spill.delete(thread_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store counters.
+
+        Returns:
+            Dictionary with entry count, approximate bytes and counters
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["threads"] = len(self._entries)
+            stats["bytes"] = sum(entry.nbytes for entry in self._entries.values())
+        if self.spill is not None:
+            stats["spill"] = self.spill.get_stats()
+        return stats
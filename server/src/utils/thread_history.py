@@ -0,0 +1,161 @@
+"""
+Per-thread log for bulky conversation history kept out of checkpoints.
+
+Theme HITL interactions and the theme snapshots taken before a modification
+are only needed for inspection and undo, yet storing them in DashboardState
+would copy them into every subsequent checkpoint. This log keeps a bounded
+number of entries per thread instead, with LRU eviction across threads and a
+TTL for idle threads.
+
+With a durable collection (a MongoDB collection next to the checkpoints, one
+document per thread) every entry is also written there, and reads come from
+it, so a resumed conversation keeps its theme history across restarts and
+workers. The in-memory copy is the fallback when the collection is missing
+or unreachable; without a collection the history is lost on restart.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadHistoryLog:
+    """
+    Bounded, TTL-expiring log of history entries keyed by thread_id.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 256,
+        max_entries: int = 20,
+        ttl_seconds: int = 24 * 60 * 60,
+        collection_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            max_threads: Maximum threads with entries in memory (least recently used dropped first)
+            max_entries: Entries kept per thread (oldest dropped first)
+            ttl_seconds: Seconds since the last entry after which a thread's log expires
+            collection_factory: Returns the durable (pymongo) collection; called on first use
+        """
+        self.max_threads = max_threads
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._threads: "OrderedDict[str, deque]" = OrderedDict()
+        self._updated: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._collection_factory = collection_factory
+        self._collection = None
+        self.stats = {"durable_writes": 0, "durable_reads": 0, "durable_errors": 0}
+
+    def _get_collection(self) -> Optional[Any]:
+        """Open the durable collection lazily and make sure its TTL index exists."""
+        if self._collection is None and self._collection_factory is not None:
+            collection = self._collection_factory()
+            # Idle threads expire in the collection just like in memory
+            collection.create_index("updated_at", expireAfterSeconds=self.ttl_seconds)
+            self._collection = collection
+        return self._collection
+
+    def _durable(self, operation: str, action: Callable[[Any], Any]) -> Any:
+        """Run an operation against the durable collection; returns None when unavailable or failing."""
+        try:
+            collection = self._get_collection()
+            if collection is None:
+                return None
+            return action(collection)
+        except Exception as e:
+            self.stats["durable_errors"] += 1
+            logger.error(f"Theme history {operation} failed - using the in-memory log: {e}")
+            return None
+
+    def _expire(self, now: float) -> None:
+        """Drop idle and excess threads (caller must hold the lock)."""
+        for thread_id in [t for t, updated in self._updated.items() if now - updated > self.ttl_seconds]:
+            self._threads.pop(thread_id, None)
+            del self._updated[thread_id]
+        while len(self._threads) > self.max_threads:
+            thread_id, _ = self._threads.popitem(last=False)
+            self._updated.pop(thread_id, None)
+
+    def append(self, thread_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Record an entry for a thread.
+
+        Args:
+            thread_id: Conversation thread id
+            entry: JSON-like entry; a timestamp is added when missing
+        """
+        now = time.time()
+        entry = copy.deepcopy(entry)
+        entry.setdefault("timestamp", now)
+        with self._lock:
+            entries = self._threads.pop(thread_id, None)
+            if entries is None:
+                entries = deque(maxlen=self.max_entries)
+            entries.append(entry)
+            self._threads[thread_id] = entries
+            self._updated[thread_id] = now
+            self._expire(now)
+
+        def push(collection):
+            collection.update_one(
+                {"_id": thread_id},
+                {
+                    "$push": {"entries": {"$each": [entry], "$slice": -self.max_entries}},
+                    "$set": {"updated_at": datetime.now(timezone.utc)},
+                },
+                upsert=True,
+            )
+            return True
+
+        if self._durable("write", push):
+            self.stats["durable_writes"] += 1
+
+    def get(self, thread_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a thread's entries, oldest first.
+
+        Args:
+            thread_id: Conversation thread id
+
+        Returns:
+            List of entries (empty if none or expired)
+        """
+        document = self._durable("read", lambda collection: collection.find_one({"_id": thread_id}) or {})
+        if document is not None:
+            self.stats["durable_reads"] += 1
+            return list(document.get("entries", []))
+        with self._lock:
+            self._expire(time.time())
+            return list(self._threads.get(thread_id, ()))
+
+    def discard(self, thread_id: str) -> None:
+        """Remove a thread's entries."""
+        with self._lock:
+            self._threads.pop(thread_id, None)
+            self._updated.pop(thread_id, None)
+        self._durable("delete", lambda collection: collection.delete_one({"_id": thread_id}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get log size.
+
+        Returns:
+            Dictionary with in-memory thread and entry counts and durable store counters
+        """
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "entries": sum(len(entries) for entries in self._threads.values()),
+                "durable": self._collection_factory is not None,
+                **self.stats,
+            }
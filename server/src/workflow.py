@@ -14,10 +14,12 @@ Key Features:
 import logging
 import json
 import traceback
-from typing import Dict, Any, List, Optional, Union, Literal
+from typing import Dict, Any, Iterable, List, Optional, Union, Literal
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
+import inspect
+import itertools
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
@@ -26,18 +28,24 @@ from langgraph.graph.message import add_messages
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import interrupt, Command
+from langgraph.errors import GraphInterrupt
 
 
 # Import our components
 from src.config.settings import settings
 from src.helpers.states import DashboardState, create_initial_state
-from src.setup.llm_setup import LLMSetup
-from src.tools.get_tool import get_sprinklr_data
-from src.agents.query_refiner_agent import QueryRefinerAgent
-from src.agents.data_collector_agent import DataCollectorAgent
-from src.agents.data_analyzer_agent2 import DataAnalyzerAgent
-from src.agents.query_generator_agent import QueryGeneratorAgent
-from src.agents.theme_modifier_agent import ThemeModifierAgent
+from src.setup.components_setup import component_registry, get_component
+from src.tools.get_tool import DEFAULT_FROM_TIME, DEFAULT_UPTO_TIME, fetch_hit_store, get_sprinklr_data, stream_sprinklr_data
+from src.utils.filters_helper import build_api_filters, resolve_time_window
+from src.utils.hits_helper import plan_sample_rounds, sample_schedule
+from src.utils.thread_artifact_store import ThreadArtifacts, ThreadArtifactStore
+from src.utils.artifact_spill import ArtifactSpill
+from src.utils.speculation import SpeculationRegistry, state_fingerprint
+from src.utils.metrics import current_node, observe_stage
+from src.utils.thread_history import ThreadHistoryLog
+from src.utils.logging_setup import StateSummary
+from src.utils.analysis_result_store import AnalysisResultStore, make_analysis_key
+from src.utils.admission import OverloadedError
 from src.utils.hitl_detection import detect_approval_intent, determine_hitl_action, analyze_theme_query_context
 from src.persistence.mongodb_checkpointer import get_async_mongodb_checkpointer
 import asyncio
@@ -46,6 +54,49 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Per-conversation hits, documents and embeddings (kept out of the checkpointed state)
+thread_artifact_store = ThreadArtifactStore(
+    max_threads=settings.ARTIFACT_STORE_MAX_THREADS,
+    max_bytes=settings.ARTIFACT_STORE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.ARTIFACT_STORE_TTL_SECONDS,
+    spill=ArtifactSpill(
+        settings.ARTIFACT_SPILL_DIR,
+        embedding_dtype=settings.ARTIFACT_SPILL_EMBEDDING_DTYPE,
+        ttl_seconds=settings.ARTIFACT_SPILL_TTL_SECONDS
+    ) if settings.ARTIFACT_SPILL_ENABLED else None
+)
+
+# Query generation and fetches started while the query verification interrupt is pending
+speculation_registry = SpeculationRegistry(
+    max_runs=settings.SPECULATIVE_PREFETCH_MAX_RUNS,
+    ttl_seconds=settings.SPECULATIVE_PREFETCH_TTL_SECONDS
+)
+
+# Finished analyses shared across conversations (same query, window, filters and analyzer settings)
+analysis_result_store = AnalysisResultStore(
+    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS
+)
+
+def _theme_history_collection():
+    """MongoDB collection holding theme history next to the checkpoints"""
+    from pymongo import MongoClient
+    client = MongoClient(settings.MONGODB_URI, serverSelectionTimeoutMS=2000)
+    return client[settings.MONGODB_DATABASE][settings.THEME_HISTORY_COLLECTION]
+
+# Theme HITL decisions and theme backups, kept out of checkpoints but persisted
+theme_history_log = ThreadHistoryLog(
+    max_entries=settings.THEME_HISTORY_MAX_ENTRIES,
+    ttl_seconds=settings.THEME_HISTORY_TTL_SECONDS,
+    collection_factory=_theme_history_collection if settings.THEME_HISTORY_PERSIST else None
+)
+
+# State fields the boolean query and the fetch are derived from
+SPECULATION_STATE_KEYS = (
+    "query", "refined_query", "keywords", "filters", "entities",
+    "industry", "sub_vertical", "use_case", "defaults_applied"
+)
+
 class SprinklrWorkflow:
     """
     Complete Modern LangGraph Workflow Implementation.
@@ -67,23 +118,18 @@ class SprinklrWorkflow:
     def __init__(self, checkpointer=None):
         """Initialize the workflow with all components. If checkpointer is None, must call async_init."""
         logger.info("Initializing Modern Sprinklr Workflow...")
-        # Setup LLM
-        self.llm_setup = LLMSetup()
-        self.llm = self.llm_setup.get_agent_llm("workflow")
-        
-        # Initialize agents
-        self.query_refiner = QueryRefinerAgent(self.llm)
-        self.data_collector = DataCollectorAgent(self.llm)
-        self.data_analyzer = DataAnalyzerAgent(self.llm) 
-        self.query_generator = QueryGeneratorAgent(self.llm)
-        self.theme_modifier_agent = ThemeModifierAgent(self.llm)
+        # Shared LLM and agents (created once per process by the component registry)
+        self.llm = get_component("llm")
+        self.query_refiner = get_component("query_refiner")
+        self.data_collector = get_component("data_collector")
+        self.data_analyzer = get_component("data_analyzer")
+        self.query_generator = get_component("query_generator")
+        self.theme_modifier_agent = get_component("theme_modifier")
         
         # Setup tools
         self.tools = [get_sprinklr_data]
         self.tool_node = ToolNode(self.tools)
         
-        # Initialize current hits storage (separate from state to prevent memory explosion)
-        self._current_hits = []
         self.checkpointer = checkpointer
         self.workflow = None
         if checkpointer is not None:
@@ -95,6 +141,36 @@ class SprinklrWorkflow:
         self.checkpointer = await get_async_mongodb_checkpointer()
         self.workflow = self._build_workflow()
 
+    @staticmethod
+    def _instrument_node(name: str, node):
+        """
+        Wrap a node so its latency and outcome are recorded under /api/metrics.
+
+        The node name is also published in the current_node context variable,
+        so LLM calls made by the node's agent are labelled with it. HITL
+        interrupts are counted as "interrupted", not as errors.
+
+        Args:
+            name: Graph node name
+            node: Async node callable taking state (and optionally config)
+
+        Returns:
+            Async node callable accepting state and config
+        """
+        accepts_config = "config" in inspect.signature(node).parameters
+
+        async def instrumented(state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
+            token = current_node.set(name)
+            try:
+                with observe_stage("node", name, interrupt_types=(GraphInterrupt,)):
+                    if accepts_config:
+                        return await node(state, config)
+                    return await node(state)
+            finally:
+                current_node.reset(token)
+
+        return instrumented
+
     def _build_workflow(self) -> StateGraph:
         """Build the complete LangGraph workflow following the architecture"""
         
@@ -102,16 +178,17 @@ class SprinklrWorkflow:
         workflow = StateGraph(DashboardState)
         
         # Add nodes following the exact architecture flow
-        workflow.add_node("query_refiner", self._query_refiner_node)
-        workflow.add_node("data_collector", self._data_collector_node) 
-        workflow.add_node("hitl_verification", self._hitl_verification_node)
-        workflow.add_node("query_generator", self._query_generator_node)
-        workflow.add_node("tools", self._tool_execution_node)  # Use custom tool node
-        workflow.add_node("data_analyzer", self._data_analyzer_node)
+        workflow.add_node("query_refiner", self._instrument_node("query_refiner", self._query_refiner_node))
+        workflow.add_node("data_collector", self._instrument_node("data_collector", self._data_collector_node))
+        workflow.add_node("hitl_verification", self._instrument_node("hitl_verification", self._hitl_verification_node))
+        workflow.add_node("query_generator", self._instrument_node("query_generator", self._query_generator_node))
+        workflow.add_node("tools", self._instrument_node("tools", self._tool_execution_node))  # Use custom tool node
+        workflow.add_node("data_analyzer", self._instrument_node("data_analyzer", self._data_analyzer_node))
         
         # Add Theme HITL nodes
-        workflow.add_node("theme_hitl_verification", self._theme_hitl_verification_node)
-        workflow.add_node("theme_modifier", self._theme_modifier_node)
+        workflow.add_node("theme_hitl_verification", self._instrument_node("theme_hitl_verification", self._theme_hitl_verification_node))
+        workflow.add_node("theme_modifier", self._instrument_node("theme_modifier", self._theme_modifier_node))
+        workflow.add_node("finalize", self._instrument_node("finalize", self._finalize_node))
         
         # Define the exact architecture flow
         workflow.add_edge(START, "query_refiner")
@@ -139,7 +216,7 @@ class SprinklrWorkflow:
             "theme_hitl_verification",
             self._should_continue_theme_hitl,
             {
-                "continue": END,
+                "continue": "finalize",
                 "modify": "theme_modifier",
                 "refine": "data_analyzer"
             }
@@ -147,6 +224,7 @@ class SprinklrWorkflow:
         
         # Theme modifier goes back to theme HITL for verification
         workflow.add_edge("theme_modifier", "theme_hitl_verification")
+        workflow.add_edge("finalize", END)
         
         # Use MongoDB checkpointer for persistence
         compiled_workflow = workflow.compile(
@@ -170,7 +248,7 @@ class SprinklrWorkflow:
         logger.info("🔍 Step 1: Query Refiner Agent")
         logger.info(" ==================== QUERY REFINER STARTED ====================")
         # Log state BEFORE processing
-        logger.info(f"🔍 Logging state before Query Refiner processing {state}")
+        logger.debug("🔍 Logging state before Query Refiner processing %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         try:
             # Get the current query list from state
@@ -236,7 +314,7 @@ class SprinklrWorkflow:
         logger.info("📊 Step 2: Data Collector Agent")
         logger.info(" ==================== DATA COLLECTOR STARTED ====================")
 
-        logger.info(f"🔍 Logging state before Data Collector processing {state}")
+        logger.debug("🔍 Logging state before Data Collector processing %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         try:
             refined_query = state.get("refined_query", state.get("query")[-1])
@@ -283,7 +361,7 @@ class SprinklrWorkflow:
             # Log state AFTER processing
             logger.info(" ==================== DATA COLLECTOR COMPLETED ====================")
     
-    async def _hitl_verification_node(self, state: DashboardState) -> Dict[str, Any]:
+    async def _hitl_verification_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Step 3: Mandatory HITL Verification - Following helper_hitl_demo_code.py pattern
         - Implements step-based HITL logic for progressive interaction
@@ -297,7 +375,7 @@ class SprinklrWorkflow:
         logger.info("👤 Step 3: Mandatory HITL Verification (Human-in-the-Loop)")
         logger.info(" ==================== HITL VERIFICATION STARTED ====================")
 
-        logger.info(f"Logging State Before HITL Verification: {state}")
+        logger.debug("Logging State Before HITL Verification: %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         step = state.get("hitl_step", 1)  # Default to step 1 for normal verification
         logger.info(f"🔢 HITL Step: {step}")
@@ -333,6 +411,15 @@ class SprinklrWorkflow:
                 "instructions": "Reply 'yes' to approve or provide feedback to refine"
             }
             
+            # Most answers are approvals - prepare the next steps while the user reads.
+            # The node re-runs on resume; a run for the same state is not restarted.
+            if settings.SPECULATIVE_PREFETCH_ENABLED:
+                speculation_registry.start(
+                    self._thread_id(state, config),
+                    state_fingerprint(state, SPECULATION_STATE_KEYS),
+                    lambda: self._speculate(state)
+                )
+            
             # Use interrupt to capture user input
             interrupt(verification_data)
             
@@ -358,6 +445,7 @@ class SprinklrWorkflow:
                 }
             else:
                 logger.info(f"❌ User provided clarification/new requirements - treating as fresh user input")
+                speculation_registry.discard(self._thread_id(state, config))
                 
                 # For clarifications/new requirements, replace the original query entirely
                 # This prevents duplication and loop conditions
@@ -433,7 +521,7 @@ class SprinklrWorkflow:
         logger.warning("⚠️ No explicit routing found from HITL node - defaulting to refine for safety")
         return "refine"
     
-    async def _query_generator_node(self, state: DashboardState) -> Dict[str, Any]:
+    async def _query_generator_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Step 4: Query Generator Agent  
         - Creates Boolean queries using AND/OR/NEAR/NOT operators
@@ -442,12 +530,18 @@ class SprinklrWorkflow:
         logger.info("🔧 Step 4: Query Generator Agent")
         logger.info(" ==================== BOOLEANQUERY GENERATOR STARTED ====================")
         # Log state BEFORE processing
-        logger.info(f"🔍 Logging state before Query Generator processing {state}")
+        logger.debug("🔍 Logging state before Query Generator processing %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         try:
             
-            # Generate Boolean query using correct method
-            boolean_query_result = await self.query_generator({**state})
+            # Adopt the query generated speculatively during HITL verification, if any
+            speculative = await self._speculative_result(state, config)
+            if speculative and speculative.get("boolean_query"):
+                logger.info("🔮 Using speculatively generated Boolean query")
+                boolean_query_result = {"boolean_query": speculative["boolean_query"]}
+            else:
+                # Generate Boolean query using correct method
+                boolean_query_result = await self.query_generator({**state})
             
             boolean_query = boolean_query_result.get("boolean_query", "")
             
@@ -498,36 +592,158 @@ class SprinklrWorkflow:
         finally:
             logger.info(" ==================== BOOLEANQUERY GENERATOR COMPLETED ====================")
 
-    async def _tool_execution_node(self, state: DashboardState) -> Dict[str, Any]:
+    @staticmethod
+    def _thread_id(state: DashboardState, config: Optional[RunnableConfig]) -> str:
+        """Resolve the conversation thread id of a node execution"""
+        configurable = (config or {}).get("configurable", {})
+        return configurable.get("thread_id") or state.get("thread_id") or "default"
+
+    def _analysis_key(self, state: DashboardState) -> str:
+        """Key of the shared analysis for the state's boolean query, window, filters and theme context"""
+        analyzer_config = dict(self.data_analyzer.analysis_config(), adaptive_sampling=settings.ADAPTIVE_SAMPLING_ENABLED)
+        return make_analysis_key(
+            state.get("boolean_query") or "",
+            resolve_time_window(state),
+            build_api_filters(state.get("filters")),
+            analyzer_config,
+            self.data_analyzer.analysis_context(state)
+        )
+
+    async def _speculative_result(self, state: DashboardState, config: Optional[RunnableConfig]) -> Optional[Dict[str, Any]]:
+        """Wait for the speculative run of this thread if it was derived from the current state"""
+        if not settings.SPECULATIVE_PREFETCH_ENABLED:
+            return None
+        return await speculation_registry.result(self._thread_id(state, config), state_fingerprint(state, SPECULATION_STATE_KEYS))
+
+    async def _speculate(self, state: DashboardState) -> Dict[str, Any]:
+        """
+        Run query generation, the Sprinklr fetch and (optionally) embedding ahead of approval.
+
+        Args:
+            state: State at the time the verification interrupt was raised
+
+        Returns:
+            Dictionary with "boolean_query" and, when a query was generated,
+            "time_window", "hits", "documents" and "embeddings"
+        """
+        boolean_query = (await self.query_generator({**state})).get("boolean_query", "")
+        if not boolean_query:
+            return {"boolean_query": ""}
+
+        fetched = await self._fetch_hits(boolean_query, state)
+        if settings.SPECULATIVE_PREFETCH_EMBED and fetched["embeddings"] is None and len(fetched["hits"]):
+            fetched.update(await self.data_analyzer.prepare_documents(fetched["hits"], fetched["documents"]))
+
+        logger.info(f"🔮 Speculative run prepared {len(fetched['hits'])} hits")
+        return {"boolean_query": boolean_query, **fetched}
+
+    async def _fetch_hits(self, boolean_query: str, state: DashboardState) -> Dict[str, Any]:
+        """
+        Fetch hits for a Boolean query with the refined time range and filters applied at the source.
+
+        Args:
+            boolean_query: Boolean query to execute
+            state: Workflow state (filters, refined_query, defaults_applied)
+
+        Returns:
+            Dictionary with "time_window", "hits" (a HitStore) and, when produced
+            while fetching, "documents" and row-aligned "embeddings"
+        """
+        documents = embeddings = None
+        time_window = resolve_time_window(state)
+        filters = state.get("filters") or {}
+        window_args = {"from_time": time_window[0], "upto_time": time_window[1]} if time_window else {}
+        logger.info(f"🛠️ Time window: {time_window or 'default'}, filters: {filters}")
+        
+        if settings.SPRINKLR_STREAM_HITS:
+            # Stream hits straight into the analyzer so text extraction and
+            # embedding overlap with the download
+            prepared = await self.data_analyzer.extract_documents_from_stream(
+                stream_sprinklr_data(boolean_query, limit=5000, api_filters=build_api_filters(filters), **window_args)
+            )
+            hits, documents, embeddings = prepared["hits"], prepared["documents"], prepared["embeddings"]
+        elif settings.ADAPTIVE_SAMPLING_ENABLED:
+            # Grow the sample only while theme assignments keep shifting; each round
+            # fetches only its own disjoint sub-windows, through the cached fetch path
+            sizes = sample_schedule(settings.ADAPTIVE_SAMPLE_INITIAL, settings.ADAPTIVE_SAMPLE_MAX, settings.ADAPTIVE_SAMPLE_GROWTH)
+            plan = plan_sample_rounds(*(time_window or (DEFAULT_FROM_TIME, DEFAULT_UPTO_TIME)), sizes, settings.ADAPTIVE_SAMPLE_SLICES)
+
+            async def fetch_round(index: int) -> Iterable[Dict[str, Any]]:
+                stores = await asyncio.gather(*(
+                    fetch_hit_store(boolean_query, limit=limit, from_time=start, upto_time=end, filters=filters)
+                    for start, end, limit in plan[index]
+                ))
+                return itertools.chain.from_iterable(stores)
+
+            prepared = await self.data_analyzer.collect_adaptive_sample(
+                fetch_round,
+                sizes,
+                stability_threshold=settings.ADAPTIVE_STABILITY_THRESHOLD
+            )
+            hits, documents, embeddings = prepared["hits"], prepared["documents"], prepared["embeddings"]
+        else:
+            # Fetch straight into the compact columnar store; cached windows are
+            # parsed into columns without building the full list of hit dicts
+            hits = await fetch_hit_store(boolean_query, limit=5000, filters=filters, **window_args)
+
+        return {"time_window": time_window, "hits": hits, "documents": documents, "embeddings": embeddings}
+
+    async def _tool_execution_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Step 5: Tool Execution (ToolNode)
         - Executes the Boolean query via Sprinklr API
         - Returns relevant posts/comments data
-        - IMPORTANT: Does NOT store hits in state to prevent memory explosion
+        - IMPORTANT: Does NOT store hits in state to prevent memory explosion;
+          they go to the thread artifact store under this thread and run id
         """
         logger.info("🛠️ Step 5: Tool Execution")
         logger.info(" ==================== TOOL EXECUTION STARTED ====================")
         # Log state BEFORE processing
-        logger.info(f"🔍 Logging state before Tool Execution processing {state}")
+        logger.debug("🔍 Logging state before Tool Execution processing %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         try:
             boolean_query = state.get("boolean_query", "")
+            thread_id = self._thread_id(state, config)
             
             if not boolean_query:
                 logger.error("No Boolean query found for tool execution")
                 error_msg = AIMessage(content="Error: No Boolean query available for data retrieval")
                 return {"messages": [error_msg]}
 
+            # A shared analysis of this query and window makes the fetch unnecessary
+            if settings.ANALYSIS_CACHE_ENABLED and analysis_result_store.contains(self._analysis_key(state)):
+                logger.info("♻️ Shared analysis available for this query - skipping the fetch")
+                speculation_registry.discard(thread_id)
+                await asyncio.to_thread(thread_artifact_store.discard, thread_id)
+                return {
+                    "messages": [AIMessage(content="Tool execution skipped: an analysis of this query and time window is cached")],
+                    "current_stage": "tool_execution_completed",
+                    "next_node": "data_analyzer",
+                    "hits_run_id": None,
+                }
+
             logger.info(f"🛠️ Executing tool with Boolean query: {boolean_query[:100]}")
+
+            # Adopt hits prefetched during HITL verification if they match this query and window
+            speculative = await self._speculative_result(state, config)
+            if (
+                speculative and speculative.get("boolean_query") == boolean_query
+                and speculative.get("time_window") == resolve_time_window(state)
+            ):
+                logger.info("🔮 Using speculatively prefetched hits")
+                fetched = speculative
+                speculation_registry.adopt(thread_id)
+            else:
+                speculation_registry.discard(thread_id)
+                fetched = await self._fetch_hits(boolean_query, state)
+            hits, documents, embeddings = fetched["hits"], fetched["documents"], fetched["embeddings"]
             
-            # Execute the get_sprinklr_data tool using the invoke method (modern LangChain pattern)
-            hits = await get_sprinklr_data.ainvoke({"query": boolean_query, "limit": 5000})
-            
-            logger.info(f"🛠️ Retrieved {len(hits)} hits from Sprinklr API")
+            logger.info(f"🛠️ Retrieved {len(hits)} hits from Sprinklr API ({hits.nbytes / 1024:.0f} KiB columnar)")
             
-            # Store hits temporarily in workflow instance (NOT in state)
-            # This prevents memory explosion in LangGraph state
-            self._current_hits = hits
+            # Store hits per conversation (NOT in state) - this prevents memory explosion
+            # in LangGraph state and keeps concurrent conversations apart
+            run_id = ThreadArtifactStore.new_run_id()
+            await asyncio.to_thread(thread_artifact_store.put, thread_id, ThreadArtifacts(run_id, hits, documents, embeddings))
             
             tool_msg = AIMessage(
                 content=f"Tool execution completed: Retrieved {len(hits)} hits from Sprinklr API"
@@ -537,6 +753,8 @@ class SprinklrWorkflow:
                 "messages": [tool_msg],
                 "current_stage": "tool_execution_completed",
                 "next_node": "data_analyzer",  
+                "hits_run_id": run_id,
+                "hit_count": len(hits),
             }
             
         
@@ -544,6 +762,8 @@ class SprinklrWorkflow:
             
             return result
             
+        except OverloadedError:
+            raise  # Surfaced by the API as 503 instead of an empty result
         except Exception as e:
             logger.error(f"Tool Execution error: {e}")
             error_msg = AIMessage(content=f"Error in tool execution: {str(e)}")
@@ -551,24 +771,56 @@ class SprinklrWorkflow:
         finally:
             logger.info(" ==================== TOOL EXECUTION COMPLETED ====================")
 
-    async def _data_analyzer_node(self, state: DashboardState) -> Dict[str, Any]:
+    async def _data_analyzer_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Step 6: Data Analyzer Agent
-        - Gets hits from workflow instance (NOT from state) to prevent memory explosion
+        - Answers from the shared analysis store when another conversation already
+          analyzed the same boolean query, window and filters
+        - Gets hits from the thread artifact store (NOT from state) to prevent memory explosion
+        - Hits are kept until the theme loop ends, so "refine" can re-run the analysis
         - Processes hits using BERTopic theme analysis
         - Updates themes in state and returns final results
         """
         logger.info("📈 Step 6: Data Analyzer Agent")
         logger.info(" ==================== DATA ANALYZER STARTED ====================")
-        logger.info(f"🔍 Logging state before Data Analyzer processing {state}")
+        logger.debug("🔍 Logging state before Data Analyzer processing %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
         
         try:
-            # Get hits from workflow instance (NOT from state) to prevent memory explosion
-            hits = getattr(self, '_current_hits', [])
+            # Serve repeated dashboards from the shared store; a "refine" request
+            # from theme HITL asks for a fresh analysis and is neither served nor stored
+            analysis_key = self._analysis_key(state)
+            use_shared = settings.ANALYSIS_CACHE_ENABLED and state.get("next_node") != "refine"
+            if use_shared:
+                cached = analysis_result_store.get(analysis_key)
+                if cached is not None:
+                    themes = cached["result"].get("themes", [])
+                    logger.info(f"♻️ Served {len(themes)} themes from the shared analysis store")
+                    return {
+                        "messages": [AIMessage(content=f"Analysis completed: Reused {len(themes)} themes from a cached analysis of {cached['hit_count']} hits")],
+                        "themes": themes,
+                        "hit_count": cached["hit_count"],
+                        "workflow_status": "completed",
+                        "completed_at": datetime.now().isoformat()
+                    }
+            
+            # Get this conversation's hits (NOT from state) to prevent memory explosion
+            thread_id = self._thread_id(state, config)
+            artifacts = await asyncio.to_thread(thread_artifact_store.get, thread_id, state.get("hits_run_id"))
+            fetched_update = {}
+            if artifacts is None and not state.get("hits_run_id") and state.get("boolean_query"):
+                # The fetch was skipped for a shared analysis, but this run needs the hits
+                fetched = await self._fetch_hits(state["boolean_query"], state)
+                artifacts = await asyncio.to_thread(
+                    thread_artifact_store.put,
+                    thread_id,
+                    ThreadArtifacts(ThreadArtifactStore.new_run_id(), fetched["hits"], fetched["documents"], fetched["embeddings"])
+                )
+                fetched_update = {"hits_run_id": artifacts.run_id, "hit_count": len(artifacts.hits)}
+            hits = artifacts.hits if artifacts else []
             
             if not hits:
-                logger.warning("No hits found in workflow instance - returning empty themes")
+                logger.warning("No hits found for this thread - returning empty themes")
                 analysis_msg = AIMessage(content="No data available for analysis")
                 return {
                     "messages": [analysis_msg],
@@ -581,39 +833,49 @@ class SprinklrWorkflow:
             # The hits are NOT stored in LangGraph state to prevent memory explosion
             logger.info(f"🔍 Processing {len(hits)} hits with Data Analyzer Agent...")
             
+            # Extract and embed once per run; the spilled copy is reused by refine loops and resumes
+            if artifacts.documents is None or artifacts.embeddings is None:
+                prepared = await self.data_analyzer.prepare_documents(hits, artifacts.documents)
+                artifacts = await asyncio.to_thread(
+                    thread_artifact_store.put,
+                    thread_id,
+                    ThreadArtifacts(artifacts.run_id, hits, prepared["documents"], prepared["embeddings"])
+                )
+            
             # Call data analyzer with hits and state separately
             themes_result = await self.data_analyzer.analyze_hits_and_state(
                 hits=hits,     # Hits passed separately (NOT stored in state)
-                state=state    # LangGraph state passed separately
+                state=state,   # LangGraph state passed separately
+                documents=artifacts.documents,    # Set when hits were streamed or sampled
+                embeddings=artifacts.embeddings
             )
             
             # Extract themes from result
             themes = themes_result.get("themes", [])
             
-            # Clear hits from workflow instance to free memory
-            if hasattr(self, '_current_hits'):
-                delattr(self, '_current_hits')
-            
             analysis_msg = AIMessage(
                 content=f"Analysis completed: Generated {len(themes)} themes from {len(hits)} hits"
             )
             
+            if use_shared:
+                analysis_result_store.put(analysis_key, {"result": themes_result, "hit_count": len(hits)})
+            
             result = {
                 "messages": [analysis_msg],
                 "themes": themes,  # Update themes state as per requirement
                 "workflow_status": "completed",
-                "completed_at": datetime.now().isoformat()
+                "completed_at": datetime.now().isoformat(),
+                **fetched_update
             }
             
             # Log state AFTER processing
             
             return result
             
+        except OverloadedError:
+            raise  # Surfaced by the API as 503 instead of an empty result
         except Exception as e:
             logger.error(f"Data Analyzer error: {e}")
-            # Clear hits from workflow instance even on error
-            if hasattr(self, '_current_hits'):
-                delattr(self, '_current_hits')
             error_msg = AIMessage(content=f"Error in data analysis: {str(e)}")
             return {
                 "messages": [error_msg],
@@ -624,11 +886,11 @@ class SprinklrWorkflow:
             }
         finally:
             logger.info(" ==================== DATA ANALYZER COMPLETED ====================")
-            logger.info(f"🔍 Logging FINAL STATE {state}")
+            logger.debug("🔍 Logging FINAL STATE %s", StateSummary(state, settings.LOG_STATE_MAX_CHARS))
 
 
 
-    async def _theme_hitl_verification_node(self, state: DashboardState) -> Dict[str, Any]:
+    async def _theme_hitl_verification_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Theme HITL Verification Node after Data Analyzer Agent
         - Implements human-in-the-loop verification for themes
@@ -685,6 +947,7 @@ What would you like to do?
                 analysis = analyze_theme_query_context(user_input, themes)
                 
                 logger.info(f"🤖 Theme analysis result: {analysis}")
+                await self._record_theme_hitl(state, config, 1, analysis, user_input, themes)
                 
                 # Route based on analysis
                 if analysis["primary_action"] == "approval":
@@ -706,7 +969,6 @@ What would you like to do?
                         "theme_modification_intent": modification_data["intent"],
                         "target_theme": modification_data["target_theme"],
                         "theme_modification_details": user_input,
-                        "original_themes": themes.copy(),  # Backup original themes
                         "next_node": "modify",
                         "user_input": user_input
                     }
@@ -742,6 +1004,7 @@ What would you like to do?
                 
                 # Analyze response
                 analysis = analyze_theme_query_context(user_input, themes)
+                await self._record_theme_hitl(state, config, 2, analysis, user_input, themes)
                 
                 if analysis["primary_action"] == "approval":
                     logger.info("✅ User approved modified themes")
@@ -799,7 +1062,7 @@ What would you like to do?
         Routes based on next_node field set by theme HITL verification node.
         
         Returns:
-        - "continue": Proceed to final results
+        - "continue": Proceed to the finalize node
         - "modify": Go to Theme Modifier Agent  
         - "refine": Go back to Data Analyzer Agent for refinement
         """
@@ -815,8 +1078,26 @@ What would you like to do?
         else:
             return "continue"
     
+    async def _finalize_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
+        """
+        Final step once the themes are approved
+        - Releases this conversation's hits, documents and embeddings (memory and spill file);
+          they were only kept so "refine" could re-run the analysis
+        """
+        thread_id = self._thread_id(state, config)
+        await asyncio.to_thread(thread_artifact_store.discard, thread_id)
+        logger.info(f"🧹 Released analysis artifacts for thread {thread_id}")
+        return {"hits_run_id": None}
+    
+    
+    async def _record_theme_hitl(self, state: DashboardState, config: Optional[RunnableConfig], step: int, analysis: Dict[str, Any], user_input: str, themes: List[Dict[str, Any]]) -> None:
+        """Log a theme HITL decision (with a theme backup before modifications) outside checkpointed state"""
+        entry = {"step": step, "action": analysis.get("primary_action"), "user_input": user_input, "theme_count": len(themes)}
+        if analysis.get("primary_action") == "theme_modification":
+            entry["original_themes"] = themes
+        await asyncio.to_thread(theme_history_log.append, self._thread_id(state, config), entry)
     
-    async def _theme_modifier_node(self, state: DashboardState) -> Dict[str, Any]:
+    async def _theme_modifier_node(self, state: DashboardState, config: RunnableConfig = None) -> Dict[str, Any]:
         """
         Theme Modifier Node after Theme HITL Verification
         - Allows user to modify themes based on HITL feedback
@@ -828,7 +1109,7 @@ What would you like to do?
         try:
             # Initialize Theme Modifier Agent if not already done
             if not hasattr(self, 'theme_modifier_agent'):
-                self.theme_modifier_agent = ThemeModifierAgent()
+                self.theme_modifier_agent = get_component("theme_modifier")
             
             # Get modification parameters from state
             intent = state.get("theme_modification_intent", "modify")
@@ -841,10 +1122,11 @@ What would you like to do?
             logger.info(f"📝 User request: {user_request}")
             
             # Get original data if available for re-clustering
-            context_data = getattr(self, '_current_hits', None)
-            if context_data and isinstance(context_data, list):
+            artifacts = await asyncio.to_thread(thread_artifact_store.get, self._thread_id(state, config), state.get("hits_run_id"))
+            context_data = artifacts.hits if artifacts else None
+            if context_data:
                 # Extract text content for theme analysis
-                docs = [hit.get('message', '') for hit in context_data if hit.get('message')]
+                docs = [text for text in context_data.iter_texts() if text]
             else:
                 docs = None
             
@@ -1053,13 +1335,14 @@ What would you like to do?
             config = {"configurable": {"thread_id": thread_id}}
             
             # Get state from memory
-            state = await self.workflow.workflow.aget_state(config)
-            logger.info(f"📜 Retrieved state for thread {thread_id}: {state}")
+            state = await self.workflow.aget_state(config)
+            logger.debug("📜 Retrieved state for thread %s: %s", thread_id, StateSummary(state.values if state else {}, settings.LOG_STATE_MAX_CHARS))
             return {
                 "thread_id": thread_id,
                 "status": "retrieved",
                 "state": state.values if state else {},
                 "messages": state.values.get("messages", []) if state else [],
+                "theme_hitl_history": await asyncio.to_thread(theme_history_log.get, thread_id),
                 "current_step": self._determine_current_step(state.values) if state else "not_found"
             }
             
@@ -1073,8 +1356,8 @@ What would you like to do?
     
 
 
-# Global workflow instance for FastAPI integration
-workflow = SprinklrWorkflow()
+# Global workflow instance for FastAPI integration (created on first use, shared with app.py)
+component_registry.register("workflow", SprinklrWorkflow)
 
 
 
@@ -1094,7 +1377,7 @@ async def get_workflow_history(thread_id: str) -> List[Dict[str, Any]]:
     
     try:
         # Use global workflow instance
-        history_result = await workflow.get_workflow_history(thread_id)
+        history_result = await get_component("workflow").get_workflow_history(thread_id)
         
         # Extract messages for simple response
         messages = history_result.get("messages", [])
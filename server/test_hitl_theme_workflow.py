@@ -98,13 +98,16 @@ class HITLThemeWorkflowTestSuite:
             'target_theme',
             'theme_action',
             'theme_modification_query',
-            'theme_hitl_history',
             'pending_theme_changes'
         ]
         
         for field in required_fields:
             assert field in state, f"Required field '{field}' missing from state"
         
+        # Theme HITL history and theme backups live in the per-thread history log, not in checkpoints
+        for field in ('theme_hitl_history', 'original_themes'):
+            assert field not in state, f"Field '{field}' should not be checkpointed"
+        
         logger.info("✅ All required theme HITL fields present in states")
     
     async def test_hitl_detection(self):
@@ -397,8 +400,7 @@ class HITLThemeWorkflowTestSuite:
             
             required_fields = [
                 'theme_hitl_step', 'theme_modification_intent', 'target_theme',
-                'theme_action', 'theme_modification_query', 'theme_hitl_history',
-                'pending_theme_changes'
+                'theme_action', 'theme_modification_query', 'pending_theme_changes'
             ]
             
             for field in required_fields:
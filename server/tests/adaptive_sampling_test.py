@@ -0,0 +1,80 @@
+"""
+Adaptive sampling tests.
+
+Checks that sampling rounds fetch disjoint sub-windows whose limits add up to
+the round increments, so the mentions downloaded equal the final sample size
+whether the sample stabilizes early or grows to the maximum.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.hits_helper import plan_sample_rounds, sample_schedule
+
+FROM_TIME, UPTO_TIME = 0, 999_999
+# One mention every 50 ms across the window
+CORPUS = [{"id": str(i), "text": f"Battery drains overnight again, mention number {i}", "createdTime": i * 50} for i in range(20_000)]
+
+
+def _fetch_from_corpus(fetched):
+    """Fetch up to `limit` mentions of a sub-window, counting every hit downloaded"""
+    def fetch(start, end, limit):
+        hits = [hit for hit in CORPUS if start <= hit["createdTime"] <= end][:limit]
+        fetched.extend(hit["id"] for hit in hits)
+        return hits
+    return fetch
+
+
+def test_schedule_grows_to_max():
+    assert sample_schedule(1000, 5000, 2.0) == [1000, 2000, 4000, 5000]
+    assert sample_schedule(10, 10, 2.0) == [10]
+    assert sample_schedule(3, 5, 1.0) == [3, 4, 5]
+
+
+def test_rounds_are_disjoint_and_spread_across_the_window():
+    sizes = sample_schedule(1000, 5000, 2.0)
+    plan = plan_sample_rounds(FROM_TIME, UPTO_TIME, sizes, 4)
+
+    windows = sorted((start, end) for fetches in plan for start, end, _ in fetches)
+    assert all(prev_end < start for (_, prev_end), (start, _) in zip(windows, windows[1:]))
+    assert [sum(limit for *_, limit in fetches) for fetches in plan] == [1000, 1000, 2000, 1000]
+    assert all(fetches[0][0] < UPTO_TIME // 4 and fetches[-1][0] > UPTO_TIME // 2 for fetches in plan)
+
+
+@pytest.mark.parametrize("stable_after_rounds, expected_size", [(None, 5000), (2, 2000)])
+def test_mentions_fetched_equal_final_sample(stable_after_rounds, expected_size):
+    pytest.importorskip("bertopic")
+    pytest.importorskip("sentence_transformers")
+    np = pytest.importorskip("numpy")
+    from src.agents.data_analyzer_agent2 import DataAnalyzerAgent
+
+    sizes = sample_schedule(1000, 5000, 2.0)
+    plan = plan_sample_rounds(FROM_TIME, UPTO_TIME, sizes, 4)
+    fetched = []
+    fetch = _fetch_from_corpus(fetched)
+
+    agent = DataAnalyzerAgent.__new__(DataAnalyzerAgent)
+    stability_checks = []
+
+    async def encode(documents, name, batch_size=256):
+        return np.zeros((len(documents), 2), dtype=np.float32)
+
+    async def stability_check(embeddings, previous_count):
+        stability_checks.append(previous_count)
+        return 1.0 if stable_after_rounds and len(stability_checks) + 1 >= stable_after_rounds else 0.0
+
+    agent._aencode = encode
+    agent._stability_check = stability_check
+
+    async def fetch_round(index):
+        return [hit for start, end, limit in plan[index] for hit in fetch(start, end, limit)]
+
+    prepared = asyncio.run(agent.collect_adaptive_sample(fetch_round, sizes, stability_threshold=0.9))
+
+    assert len(prepared["hits"]) == len(prepared["documents"]) == expected_size
+    assert len(fetched) == len(set(fetched)) == expected_size
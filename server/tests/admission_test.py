@@ -0,0 +1,109 @@
+"""
+Admission control tests.
+
+Covers the concurrency bound, FIFO hand-over between waiters, early rejection
+when the wait queue is full, wait timeouts, cancellation of waiters and the
+up-front capacity check.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.admission import AdmissionController, OverloadedError, StageLimiter
+
+
+def test_concurrency_bound_and_fifo_order():
+    async def scenario():
+        limiter = StageLimiter("embedding", max_concurrency=2, max_waiting=10)
+        running = {"now": 0, "max": 0}
+        order = []
+
+        async def work(i):
+            async with limiter.slot():
+                order.append(i)
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+                await asyncio.sleep(0.01)
+                running["now"] -= 1
+
+        tasks = []
+        for i in range(6):
+            tasks.append(asyncio.create_task(work(i)))
+            await asyncio.sleep(0)    # Arrive in order
+        await asyncio.gather(*tasks)
+        return order, running["max"], limiter.get_stats()
+
+    order, max_running, stats = asyncio.run(scenario())
+    assert order == [0, 1, 2, 3, 4, 5]
+    assert max_running == 2
+    assert (stats["admitted"], stats["in_flight"], stats["waiting"]) == (6, 0, 0)
+    assert stats["max_queue_wait_seconds"] > 0
+
+
+def test_rejects_when_queue_full_and_on_timeout():
+    async def scenario():
+        limiter = StageLimiter("clustering", max_concurrency=1, max_waiting=1, max_wait_seconds=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.saturated
+        with pytest.raises(OverloadedError) as queue_full:
+            await limiter.acquire()
+        with pytest.raises(OverloadedError) as timed_out:
+            await waiter
+        release.set()
+        await holder
+        return queue_full.value, timed_out.value, limiter.get_stats()
+
+    queue_full, timed_out, stats = asyncio.run(scenario())
+    assert (queue_full.stage, queue_full.reason) == ("clustering", "queue_full")
+    assert timed_out.reason == "wait_timeout"
+    assert (stats["rejected_queue_full"], stats["rejected_wait_timeout"]) == (1, 1)
+    assert (stats["in_flight"], stats["waiting"]) == (0, 0)
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def scenario():
+        limiter = StageLimiter("llm", max_concurrency=1, max_waiting=5)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.wait_for(queued, 1)    # Slot skips the cancelled waiter
+        limiter.release()
+        return limiter.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["in_flight"], stats["waiting"]) == (0, 0)
+
+
+def test_controller_check_and_unlimited_stages():
+    async def scenario():
+        controller = AdmissionController([StageLimiter("fetch", max_concurrency=1, max_waiting=0)])
+        async with controller.slot("embedding"):    # Not limited
+            pass
+        async with controller.slot("fetch"):
+            with pytest.raises(OverloadedError):
+                controller.check()
+            controller.check(["llm"])
+        controller.check()
+        return controller.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert list(stats) == ["fetch"]
+    assert stats["fetch"]["rejected_queue_full"] == 1
@@ -0,0 +1,69 @@
+"""
+Shared analysis result store tests.
+
+Covers key canonicalization and the theme context in the key, copy isolation
+between conversations, LRU eviction and TTL expiry.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydantic_settings")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+from src.utils.analysis_result_store import AnalysisResultStore, make_analysis_key
+
+WINDOW = (1746988200000, 1749580199999)
+FILTERS = [{"field": "SOURCE", "values": ["TWITTER"]}]
+CONFIG = {"embedding_model": "all-MiniLM-L6-v2", "min_topic_size": 3}
+
+
+def test_key_is_canonical_over_whitespace_only():
+    key = make_analysis_key('("acme"  OR "acme corp")\n AND battery', WINDOW, FILTERS, CONFIG)
+    assert key == make_analysis_key('("acme" OR "acme corp") AND battery', WINDOW, FILTERS, CONFIG)
+    assert key != make_analysis_key('("acme" OR "acme corp") AND battery', (WINDOW[0], WINDOW[1] + 1), FILTERS, CONFIG)
+    assert key != make_analysis_key('("acme" OR "acme corp") AND battery', WINDOW, [], CONFIG)
+    assert key != make_analysis_key('("acme" OR "acme corp") AND battery', WINDOW, FILTERS, dict(CONFIG, min_topic_size=5))
+
+
+def test_key_includes_theme_context():
+    context = {"refined_query": "Battery complaints about Acme phones", "keywords": ["battery", "drain"]}
+    key = make_analysis_key("acme AND battery", WINDOW, FILTERS, CONFIG, context)
+    assert key == make_analysis_key("acme AND battery", WINDOW, FILTERS, CONFIG, dict(context))
+    assert key != make_analysis_key("acme AND battery", WINDOW, FILTERS, CONFIG, dict(context, keywords=["battery"]))
+    assert key != make_analysis_key("acme AND battery", WINDOW, FILTERS, CONFIG, dict(context, use_case="Churn risk"))
+    assert key != make_analysis_key("acme AND battery", WINDOW, FILTERS, CONFIG)
+
+
+def test_results_are_copied_between_conversations():
+    store = AnalysisResultStore()
+    result = {"result": {"themes": [{"name": "Battery drain"}]}, "hit_count": 1200}
+    store.put("k", result)
+    result["result"]["themes"].append({"name": "leaked"})
+
+    first = store.get("k")
+    first["result"]["themes"][0]["name"] = "Edited by thread A"
+    assert store.get("k")["result"]["themes"] == [{"name": "Battery drain"}]
+    assert store.get("missing") is None
+    stats = store.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+def test_lru_eviction_and_ttl():
+    store = AnalysisResultStore(max_entries=2)
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+    assert store.contains("a")    # a is now most recently used
+    store.put("c", {"n": 3})
+    assert not store.contains("b") and store.contains("a") and store.contains("c")
+    assert store.get_stats()["evictions"] == 1
+
+    expiring = AnalysisResultStore(ttl_seconds=0)
+    expiring.put("a", {"n": 1})
+    expiring._entries["a"] = (expiring._entries["a"][0] - 1, expiring._entries["a"][1])
+    assert expiring.get("a") is None
+    assert expiring.get_stats()["expired"] == 1
@@ -0,0 +1,56 @@
+"""
+API overload tests.
+
+Checks that an admission rejection raised inside the Sprinklr fetch reaches the
+client as 503 with Retry-After instead of being reported as an empty result.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("langchain")
+pytest.importorskip("langgraph")
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import app as app_module
+except ImportError as e:    # e.g. an installed langgraph-checkpoint-mongodb other than the pinned one
+    pytest.skip(f"app is not importable here: {e}", allow_module_level=True)
+from src.config.settings import settings
+from src.tools import get_tool
+from src.utils.admission import AdmissionController, StageLimiter
+
+
+class _FetchingGraph:
+    """Graph stand-in whose only step is the real Sprinklr tool call"""
+
+    async def astream(self, graph_input, config=None, stream_mode=None):
+        await get_tool.get_sprinklr_data.ainvoke({"query": "battery", "limit": 100})
+        yield "values", {}
+
+
+class _FetchingWorkflow:
+    workflow = _FetchingGraph()
+
+
+def test_overloaded_fetch_stage_returns_503(monkeypatch):
+    fetch_limiter = StageLimiter("fetch", max_concurrency=1, max_waiting=0)
+    asyncio.run(fetch_limiter.acquire())    # Another request holds the only fetch slot
+    monkeypatch.setattr(get_tool, "admission_controller", AdmissionController([fetch_limiter]))
+    monkeypatch.setattr(app_module, "workflow_instance", _FetchingWorkflow())
+    monkeypatch.setattr(settings, "HIT_CACHE_ENABLED", False)
+
+    response = TestClient(app_module.app).post("/api/process", json={"query": "battery complaints"})
+
+    assert response.status_code == 503
+    assert "fetch" in response.json()["detail"]
+    assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,80 @@
+"""
+Artifact spill tests.
+
+Checks that hits, documents and embeddings round-trip through the
+memory-mapped spill and that the thread artifact store reloads them after
+eviction or a restart.
+"""
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.artifact_spill import ArtifactSpill, MappedTexts
+from src.utils.hit_store import HitStore
+from src.utils.thread_artifact_store import ThreadArtifacts, ThreadArtifactStore
+
+
+HITS = [
+    {"id": "1", "text": "première mention ✓", "createdTime": 1746988200000, "source": "TWITTER"},
+    {"id": "2", "text": "second mention", "source": "FACEBOOK", "language": "en"},
+    {"id": "3", "text": ""},
+]
+
+
+def make_artifacts(run_id="run-1"):
+    embeddings = np.arange(6, dtype=np.float32).reshape(2, 3)
+    return ThreadArtifacts(run_id, HitStore.from_hits(HITS), ["première mention ✓", "cut emoji \ud83d"], embeddings)
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    spill = ArtifactSpill(tmp_path)
+    mapped = spill.write("thread-a", make_artifacts())
+
+    assert isinstance(mapped.embeddings, np.memmap)
+    assert isinstance(mapped.documents, MappedTexts)
+    assert list(mapped.documents) == ["première mention ✓", "cut emoji \ud83d"]
+    assert mapped.documents[-1] == "cut emoji \ud83d"
+    assert list(mapped.hits) == list(HitStore.from_hits(HITS))
+    np.testing.assert_array_equal(mapped.embeddings, np.arange(6).reshape(2, 3))
+
+    reopened = ArtifactSpill(tmp_path).load("thread-a", "run-1")
+    assert list(reopened.hits.iter_texts()) == ["première mention ✓", "second mention", ""]
+    assert spill.load("thread-a", "other-run") is None
+
+
+def test_float16_spill_and_latest_run_only(tmp_path):
+    spill = ArtifactSpill(tmp_path, embedding_dtype="float16")
+    spill.write("thread-a", make_artifacts("run-1"))
+    mapped = spill.write("thread-a", ThreadArtifacts("run-2", HitStore.from_hits(HITS[:1])))
+
+    assert mapped.documents is None and mapped.embeddings is None
+    assert spill.load("thread-a", "run-1") is None
+    assert spill.load("thread-a").run_id == "run-2"
+
+    third = spill.write("thread-b", make_artifacts())
+    assert third.embeddings.dtype == np.float16
+
+    spill.delete("thread-a")
+    assert spill.load("thread-a") is None
+
+
+def test_store_reloads_evicted_and_restarted_threads(tmp_path):
+    store = ThreadArtifactStore(max_threads=1, spill=ArtifactSpill(tmp_path))
+    store.put("a", make_artifacts("run-a"))
+    store.put("b", make_artifacts("run-b"))    # evicts "a" from memory
+
+    reloaded = store.get("a", "run-a")
+    assert reloaded is not None and len(reloaded.hits) == 3
+    assert store.get_stats()["spill_loads"] == 1
+
+    restarted = ThreadArtifactStore(spill=ArtifactSpill(tmp_path))
+    assert restarted.get("b", "run-b").documents[0] == "première mention ✓"
+
+    restarted.discard("b")
+    assert ThreadArtifactStore(spill=ArtifactSpill(tmp_path)).get("b") is None
@@ -0,0 +1,38 @@
+"""
+Cluster stability check tests.
+
+Well-separated synthetic clusters should be reported as stable when the
+sample grows; structureless noise should not.
+"""
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cluster_stability import assignment_stability
+
+
+def test_separated_clusters_are_stable():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(4, 16)) * 10
+    embeddings = np.vstack([centers[i % 4] + rng.normal(scale=0.1, size=16) for i in range(800)])
+
+    assert assignment_stability(embeddings, reference_count=400, n_clusters=4) > 0.95
+
+
+def test_noise_is_not_stable():
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(800, 16))
+
+    assert assignment_stability(embeddings, reference_count=400, n_clusters=8) < 0.85
+
+
+def test_too_small_sample_is_never_stable():
+    embeddings = np.zeros((10, 4))
+    assert assignment_stability(embeddings, reference_count=10) == 0.0
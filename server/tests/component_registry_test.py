@@ -0,0 +1,68 @@
+"""
+Component registry tests.
+
+Covers single creation under concurrent access, dependency resolution between
+factories, retry after a failed factory and unknown component names.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.component_registry import ComponentRegistry
+
+
+def test_component_created_once_across_threads():
+    registry = ComponentRegistry()
+    calls = []
+
+    def load_model():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("embedding_model", load_model)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("embedding_model"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+    assert registry.get_stats()["created"] == ["embedding_model"]
+
+
+def test_factories_share_dependencies():
+    registry = ComponentRegistry()
+    registry.register("llm", object)
+    registry.register("analyzer", lambda: {"llm": registry.get("llm")})
+    registry.register("modifier", lambda: {"llm": registry.get("llm")})
+    registry.register("llm", lambda: "ignored duplicate")
+
+    assert registry.get("analyzer")["llm"] is registry.get("modifier")["llm"] is registry.get("llm")
+
+
+def test_failed_factory_is_retried_and_unknown_names_raise():
+    registry = ComponentRegistry()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("model download failed")
+        return "model"
+
+    registry.register("flaky", flaky)
+    with pytest.raises(RuntimeError):
+        registry.get("flaky")
+    assert not registry.is_created("flaky")
+    assert registry.get("flaky") == "model"
+    with pytest.raises(KeyError):
+        registry.get("missing")
@@ -0,0 +1,43 @@
+"""
+Fetched window index tests.
+
+Covers choosing reusable windows for delta fetches and the LRU/TTL bounds.
+"""
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.fetch_window_index import FetchedWindowIndex
+
+
+def test_covering_windows_prefers_large_contained_windows():
+    index = FetchedWindowIndex()
+    index.record("q", 50, 99, 500)
+    index.record("q", 60, 69, 500)    # inside the larger window
+    index.record("q", 0, 9, 500)
+    index.record("q", 90, 120, 500)   # extends past the request
+    index.record("other", 0, 99, 500)
+
+    assert index.covering_windows("q", 0, 99) == [(0, 9, 500), (50, 99, 500)]
+    assert index.covering_windows("missing", 0, 99) == []
+
+
+def test_forget_and_bounds():
+    index = FetchedWindowIndex(max_queries=1, max_windows_per_query=1)
+    index.record("q", 0, 9, 500)
+    index.record("q", 10, 19, 500)
+    assert index.covering_windows("q", 0, 99) == [(10, 19, 500)]
+
+    index.forget("q", (10, 19, 500))
+    assert index.covering_windows("q", 0, 99) == []
+
+    index.record("other", 0, 9, 500)
+    assert index.get_stats()["queries"] == 1
+
+
+def test_expired_windows_are_not_reused():
+    index = FetchedWindowIndex(ttl_seconds=-1)
+    index.record("q", 0, 9, 500)
+    assert index.covering_windows("q", 0, 99) == []
@@ -0,0 +1,63 @@
+"""
+API filter translation tests.
+
+Covers mapping DataCollectorAgent filters onto get-mentions filter clauses and
+resolving the refined time range into an epoch-ms window.
+"""
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.filters_helper import DAY_MS, build_api_filters, parse_time_range_days, resolve_time_window
+
+
+def test_build_api_filters_maps_known_keys_and_values():
+    clauses = build_api_filters({
+        "source": ["twitter", "Reddit"],
+        "Country": "IN",
+        "languages": ["en", "klingon"],
+        "sentiment": "negative",
+    })
+
+    assert clauses == [
+        {"field": "COUNTRY", "values": ["IN"]},
+        {"field": "LANGUAGE", "values": ["en"]},
+        {"field": "SOURCE", "values": ["REDDIT", "TWITTER"]},
+    ]
+    assert build_api_filters(["source: TWITTER", "gender: female"]) == [
+        {"field": "GENDER", "values": ["FEMALE"]},
+        {"field": "SOURCE", "values": ["TWITTER"]},
+    ]
+    assert build_api_filters(None) == []
+    assert build_api_filters({"gender": "robot"}) == []
+
+
+def test_parse_time_range_days_tokens_and_text():
+    assert parse_time_range_days("LAST_30_DAYS") == 30
+    assert parse_time_range_days("LAST_2_WEEKS") == 14
+    assert parse_time_range_days("complaints about Jio over the last 60 days") == 60
+    assert parse_time_range_days("sentiment in the past month") == 30
+    assert parse_time_range_days("overall brand health") is None
+
+
+def test_resolve_time_window_precedence_and_alignment():
+    now_ms = 1749000000000
+    state = {
+        "refined_query": "complaints over the last 60 days",
+        "defaults_applied": {"time_range": "LAST_30_DAYS"},
+        "filters": {},
+    }
+
+    from_time, upto_time = resolve_time_window(state, now_ms)
+    assert upto_time - from_time + 1 == 60 * DAY_MS
+    assert from_time <= now_ms <= upto_time
+    # Requests later the same day resolve to the same window
+    assert resolve_time_window(state, now_ms + 60 * 1000) == (from_time, upto_time)
+
+    state["filters"] = {"time_range": "LAST_7_DAYS"}
+    from_time, upto_time = resolve_time_window(state, now_ms)
+    assert upto_time - from_time + 1 == 7 * DAY_MS
+
+    assert resolve_time_window({"refined_query": "brand health"}, now_ms) is None
@@ -0,0 +1,70 @@
+"""
+Hit cache tests.
+
+Exercises the memory LRU, the SQLite fallback, TTL expiry and the disk size cap
+against a temporary database file.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydantic_settings")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+from src.utils.hit_cache import HitCache, make_cache_key
+
+
+HITS = [{"id": "1", "text": "network down again"}, {"id": "2", "text": "no signal since morning"}]
+
+
+def test_cache_key_ignores_whitespace_but_not_window():
+    key = make_cache_key('("brand X"  OR  brandx)', 1, 2, 500)
+    assert key == make_cache_key('("brand X" OR brandx)', 1, 2, 500)
+    assert key != make_cache_key('("brand X" OR brandx)', 1, 3, 500)
+
+
+def test_memory_then_disk_lookup(tmp_path):
+    cache = HitCache(db_path=str(tmp_path / "hits.sqlite3"), ttl_seconds=60, max_memory_entries=1, max_disk_bytes=10 ** 6)
+    cache.put("a", HITS)
+    cache.put("b", HITS)  # evicts "a" from memory only
+
+    assert cache.get("a") == HITS
+    assert cache.get("missing") is None
+
+    stats = cache.get_stats()
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["memory_evictions"] >= 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = HitCache(db_path=str(tmp_path / "hits.sqlite3"), ttl_seconds=0, max_memory_entries=4, max_disk_bytes=10 ** 6)
+    cache.put("a", HITS)
+
+    time.sleep(0.01)
+    assert cache.get("a") is None
+    assert cache.get_stats()["expired"] >= 1
+
+
+def test_empty_results_are_not_cached(tmp_path):
+    cache = HitCache(db_path=str(tmp_path / "hits.sqlite3"), ttl_seconds=60, max_memory_entries=4, max_disk_bytes=10 ** 6)
+    cache.put("a", [])
+    assert cache.get("a") is None
+
+
+def test_callers_do_not_share_hits_with_the_cache(tmp_path):
+    cache = HitCache(db_path=str(tmp_path / "hits.sqlite3"), ttl_seconds=60, max_memory_entries=4, max_disk_bytes=10 ** 6)
+    hits = [dict(hit) for hit in HITS]
+    cache.put("a", hits)
+    hits[0]["text"] = "changed after caching"
+
+    first = cache.get("a")
+    first[1]["text"] = "changed by a caller"
+
+    assert cache.get("a") == HITS
+    assert cache.get("a")[0] is not cache.get("a")[0]
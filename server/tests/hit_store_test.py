@@ -0,0 +1,82 @@
+"""
+Columnar hit store tests.
+
+Checks that hits projected into a HitStore (from dicts or straight from a
+serialized payload) round-trip through the iterator API used by the data
+analyzer and theme modifier, including texts with lone surrogates.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.hit_store import HitStore, HitStoreBuilder
+
+
+HITS = [
+    {"id": "1", "text": "première mention ✓", "createdTime": 1746988200000, "source": "TWITTER", "language": "fr"},
+    {"messageId": "2", "text": "second mention", "snType": "FACEBOOK"},
+    {"id": "3", "text": None, "source": "TWITTER", "country": "IN"},
+]
+
+
+def test_from_hits_projects_columns():
+    store = HitStore.from_hits(HITS)
+
+    assert len(store) == 3
+    assert list(store.iter_texts()) == ["première mention ✓", "second mention", ""]
+    assert store[0] == {
+        "id": "1",
+        "text": "première mention ✓",
+        "created_time": 1746988200000,
+        "source": "TWITTER",
+        "language": "fr",
+        "country": None,
+    }
+    assert store[1]["id"] == "2"
+    assert store[1]["created_time"] is None
+    assert store[-1]["country"] == "IN"
+    assert store.categories["source"] == ["TWITTER", "FACEBOOK"]
+
+
+def test_iteration_yields_hit_dicts_with_text():
+    store = HitStore.from_hits(HITS)
+    assert [hit["text"] for hit in store] == ["première mention ✓", "second mention", ""]
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_builder_and_from_json_match_from_hits():
+    builder = HitStoreBuilder()
+    for hit in HITS:
+        builder.append(hit)
+
+    built = builder.build()
+    # Tiny chunks split multi-byte characters and hits across parse steps
+    parsed = HitStore.from_json(json.dumps(HITS, ensure_ascii=False).encode("utf-8"), chunk_size=5)
+
+    assert list(built) == list(HitStore.from_hits(HITS)) == list(parsed) == list(HitStore.from_json(json.dumps(HITS)))
+    assert len(HitStore.from_json(b"")) == 0
+    with pytest.raises(ValueError):
+        HitStore.from_json(json.dumps(HITS)[:-10])
+
+
+def test_lone_surrogates_round_trip():
+    hits = [{"id": "1", "text": "broken emoji \ud83d here"}, {"id": "2", "text": "fine"}]
+    store = HitStore.from_json(json.dumps(hits))
+
+    assert store.text(0) == "broken emoji \ud83d here"
+    assert list(store.iter_texts()) == [hit["text"] for hit in hits]
+
+
+def test_empty_store():
+    store = HitStore.from_hits([])
+    assert len(store) == 0
+    assert not store
+    assert list(store.iter_texts()) == []
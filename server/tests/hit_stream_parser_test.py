@@ -0,0 +1,53 @@
+"""
+Incremental get-mentions parser tests.
+
+Feeds response bodies in small chunks to check that hits are emitted as soon
+as they are complete, for both JSON-array and SSE framed bodies.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.hit_stream_parser import HitStreamParser
+
+
+def _feed_in_chunks(parser, body, size):
+    hits = []
+    for i in range(0, len(body), size):
+        hits.extend(parser.feed(body[i:i + size]))
+    hits.extend(parser.close())
+    return hits
+
+
+def test_json_array_body_parsed_incrementally():
+    hits = [{"id": str(i), "text": f"message {i} with {{braces}} and ,commas]"} for i in range(20)]
+    body = json.dumps(hits)
+
+    parser = HitStreamParser()
+    first_chunk_hits = parser.feed(body[:len(body) // 2])
+    assert 0 < len(first_chunk_hits) < len(hits)
+
+    rest = first_chunk_hits + parser.feed(body[len(body) // 2:]) + parser.close()
+    assert rest == hits
+
+
+def test_sse_body_yields_single_hits_and_arrays():
+    body = (
+        'data: {"id": "1", "text": "one"}\n\n'
+        'data: [{"id": "2", "text": "two"}, {"id": "3", "text": "three"}]\n\n'
+        "data: [DONE]\n\n"
+    )
+    hits = _feed_in_chunks(HitStreamParser(), body, 7)
+    assert [hit["id"] for hit in hits] == ["1", "2", "3"]
+
+
+def test_truncated_array_raises_on_close():
+    parser = HitStreamParser()
+    parser.feed('[{"id": "1"}, {"id": ')
+    with pytest.raises(ValueError):
+        parser.close()
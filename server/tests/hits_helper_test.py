@@ -0,0 +1,71 @@
+"""
+Hit helper tests.
+
+Covers JSON decoding, time-window sharding and merge/dedupe of hit lists used
+by the sharded Sprinklr fetch.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.hits_helper import (
+    fast_json_loads,
+    get_mention_id,
+    merge_and_dedupe_hits,
+    proportional_limit,
+    split_time_window,
+    subtract_windows,
+)
+
+
+def test_split_time_window_covers_range_without_overlap():
+    windows = split_time_window(1000, 1999, 4)
+
+    assert len(windows) == 4
+    assert windows[0][0] == 1000
+    assert windows[-1][1] == 1999
+    for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+        assert next_start == prev_end + 1
+
+
+def test_split_time_window_single_shard_returns_full_window():
+    assert split_time_window(1000, 1999, 1) == [(1000, 1999)]
+
+
+def test_merge_and_dedupe_hits_keeps_first_occurrence_and_limit():
+    shard_a = [{"id": "1", "text": "a"}, {"id": "2", "text": "b"}]
+    shard_b = [{"id": "2", "text": "b (dup)"}, {"id": "3", "text": "c"}]
+
+    merged = merge_and_dedupe_hits([shard_a, shard_b])
+    assert [hit["id"] for hit in merged] == ["1", "2", "3"]
+    assert merged[1]["text"] == "b"
+
+    assert len(merge_and_dedupe_hits([shard_a, shard_b], limit=2)) == 2
+
+
+def test_get_mention_id_falls_back_to_text_hash():
+    assert get_mention_id({"id": 42}) == "42"
+    assert get_mention_id({"text": "same"}) == get_mention_id({"text": "same"})
+    assert get_mention_id({}) is None
+
+
+def test_fast_json_loads_accepts_bytes_and_rejects_invalid():
+    assert fast_json_loads(b'[{"id": "1", "text": "hi"}]') == [{"id": "1", "text": "hi"}]
+    with pytest.raises(ValueError):
+        fast_json_loads(b"[{")
+
+
+def test_subtract_windows_returns_uncovered_sub_ranges():
+    assert subtract_windows(0, 99, [(30, 59)]) == [(0, 29), (60, 99)]
+    assert subtract_windows(0, 99, [(0, 49), (50, 99)]) == []
+    assert subtract_windows(0, 99, []) == [(0, 99)]
+    assert subtract_windows(0, 99, [(40, 120), (0, 9)]) == [(10, 39)]
+
+
+def test_proportional_limit_rounds_up():
+    assert proportional_limit(500, 0, 49, 0, 99) == 250
+    assert proportional_limit(5, 0, 0, 0, 99) == 1
@@ -0,0 +1,110 @@
+"""
+Background job queue tests.
+
+Covers bounded concurrency, FIFO execution, early rejection when the queue
+is full or a key is busy, and failure reporting.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.job_queue import JobQueue, JobRejectedError
+
+
+def test_jobs_run_fifo_within_worker_limit():
+    async def scenario():
+        queue = JobQueue(max_workers=2, max_queue_size=10)
+        queue.start()
+        order = []
+        peak = {"running": 0, "max": 0}
+
+        def make(i):
+            async def work():
+                peak["running"] += 1
+                peak["max"] = max(peak["max"], peak["running"])
+                order.append(i)
+                await asyncio.sleep(0.01)
+                peak["running"] -= 1
+                return i * 10
+            return work
+
+        jobs = [queue.submit(make(i)) for i in range(5)]
+        while not all(job.done for job in jobs):
+            await asyncio.sleep(0.005)
+        stats = queue.get_stats()
+        await queue.stop()
+        return jobs, order, peak["max"], stats
+
+    jobs, order, max_running, stats = asyncio.run(scenario())
+    assert order == [0, 1, 2, 3, 4]
+    assert max_running == 2
+    assert [job.result for job in jobs] == [0, 10, 20, 30, 40]
+    assert jobs[-1].to_dict()["queue_wait_seconds"] > 0
+    assert (stats["succeeded"], stats["queue_depth"], stats["running"]) == (5, 0, 0)
+
+
+def test_rejections_and_failures():
+    async def scenario():
+        queue = JobQueue(max_workers=1, max_queue_size=1)
+        with pytest.raises(JobRejectedError):
+            queue.submit(lambda: asyncio.sleep(0))    # not started
+        queue.start()
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        async def failing():
+            raise RuntimeError("LLM unavailable")
+
+        first = queue.submit(blocked, key="thread-1")
+        await asyncio.sleep(0)    # worker picks up the first job
+        with pytest.raises(JobRejectedError) as busy:
+            queue.submit(blocked, key="thread-1")
+        assert busy.value.reason == "key_busy"
+        assert queue.active_job("thread-1") is first
+
+        second = queue.submit(failing, key="thread-2")
+        with pytest.raises(JobRejectedError) as full:
+            queue.submit(blocked)
+        assert full.value.reason == "queue_full"
+
+        release.set()
+        while not second.done:
+            await asyncio.sleep(0.005)
+        stats = queue.get_stats()
+        await queue.stop()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(scenario())
+    assert first.status == "succeeded"
+    assert (second.status, second.error) == ("failed", "LLM unavailable")
+    assert (stats["rejected"], stats["failed"]) == (2, 1)
+
+
+def test_finished_jobs_are_pruned():
+    async def scenario():
+        queue = JobQueue(max_workers=1, max_retained_jobs=1)
+        queue.start()
+
+        async def work():
+            return "ok"
+
+        first = queue.submit(work)
+        while not first.done:
+            await asyncio.sleep(0.005)
+        second = queue.submit(work)
+        while not second.done:
+            await asyncio.sleep(0.005)
+        queue.submit(work)
+        await queue.stop()
+        return queue, first, second
+
+    queue, first, second = asyncio.run(scenario())
+    assert queue.get(first.job_id) is None
+    assert queue.get(second.job_id) is second
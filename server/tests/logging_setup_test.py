@@ -0,0 +1,78 @@
+"""
+Logging setup tests.
+
+Covers queued JSON logging with request ids, exception rendering through
+the queue, and size-capped lazy state summaries.
+"""
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.logging_setup import StateSummary, bind_request_id, configure_logging
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+def test_queued_json_lines_carry_request_ids(restore_root_logger, capsys):
+    listener = configure_logging(level="INFO", json_format=True)
+    logger = logging.getLogger("insights.test")
+    with bind_request_id("req-1"):
+        logger.info("processing %s", "query")
+    logger.debug("dropped")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    listener.stop()
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["request_id"], r["message"]) for r in records] == [("req-1", "processing query"), ("-", "failed")]
+    assert records[0]["level"] == "INFO" and records[0]["logger"] == "insights.test"
+    assert "ValueError: boom" in records[1]["exception"]
+
+
+def test_text_format_without_queue(restore_root_logger, capsys):
+    assert configure_logging(level="INFO", use_queue=False) is None
+    with bind_request_id("req-2"):
+        logging.getLogger("insights.test").info("hello")
+    assert "[req-2] hello" in capsys.readouterr().out
+
+
+def test_state_summary_is_lazy_and_capped():
+    class Exploding(list):
+        def __len__(self):
+            raise AssertionError("summarized eagerly")
+
+    StateSummary({"messages": Exploding()})    # Nothing computed until rendered
+
+    state = {
+        "refined_query": "x" * 1000,
+        "keywords": ["battery", "charging"],
+        "themes": [{"name": f"theme {i}", "description": "d" * 100} for i in range(50)],
+        "filters": {},
+        "boolean_query": None,
+        "hit_count": 1200,
+    }
+    summary = StateSummary(state, max_chars=2000, max_item_chars=50).to_dict()
+    assert summary["keywords"] == ["battery", "charging"]
+    assert summary["themes"] == "<list len=50>"
+    assert summary["refined_query"].startswith("x" * 50) and summary["refined_query"].endswith("(+950 chars)")
+    assert summary["hit_count"] == 1200
+    assert "filters" not in summary and "boolean_query" not in summary
+    assert len(str(StateSummary(state, max_chars=100))) <= 100 + len("...(+9999 chars)")
@@ -0,0 +1,106 @@
+"""
+Metrics registry tests.
+
+Covers Prometheus text rendering, cumulative histogram buckets, label
+validation, stage outcomes recorded by observe_stage() and the process CPU
+counter.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.metrics import (
+    MetricsRegistry, current_node, observe_stage, process_cpu_seconds, render_metrics, stage_items, stage_total
+)
+
+
+class Paused(Exception):
+    pass
+
+
+def test_render_counter_gauge_and_cumulative_histogram():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("path",))
+    requests.inc(path="/a")
+    requests.inc(2, path="/a")
+    registry.gauge("depth", "Queue depth").set(3)
+    latency = registry.histogram("latency_seconds", "Latency", ("path",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, path="/a")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{path="/a"} 3' in lines
+    assert "depth 3" in lines
+    assert 'latency_seconds_bucket{path="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{path="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{path="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{path="/a"} 5.55' in lines
+    assert 'latency_seconds_count{path="/a"} 3' in lines
+
+
+def test_registry_reuses_metrics_and_validates_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("status",))
+    assert registry.counter("jobs_total", "Jobs", ("status",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Jobs", ("status",))
+    with pytest.raises(ValueError):
+        counter.inc(kind="x")
+    registry.counter("escaped_total", "Escaping", ("name",)).inc(name='a"b')
+    assert 'escaped_total{name="a\\"b"} 1' in registry.render()
+
+
+def test_observe_stage_outcomes_and_sizes():
+    before = {outcome: stage_total.value(kind="test", name="stage", outcome=outcome)
+              for outcome in ("success", "error", "interrupted", "cancelled")}
+    items_before = stage_items.count(kind="test", name="stage")
+
+    with observe_stage("test", "stage") as stage:
+        stage.items = 42
+    with pytest.raises(RuntimeError):
+        with observe_stage("test", "stage"):
+            raise RuntimeError("boom")
+    with pytest.raises(Paused):
+        with observe_stage("test", "stage", interrupt_types=(Paused,)):
+            raise Paused()
+
+    async def cancelled():
+        with observe_stage("test", "stage"):
+            await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.ensure_future(cancelled())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    for outcome in before:
+        assert stage_total.value(kind="test", name="stage", outcome=outcome) == before[outcome] + 1
+    assert stage_items.count(kind="test", name="stage") == items_before + 1
+    assert 'insights_stage_duration_seconds_count{kind="test",name="stage"}' in render_metrics()
+
+
+def test_current_node_defaults_and_resets():
+    assert current_node.get() == "none"
+    token = current_node.set("data_analyzer")
+    assert current_node.get() == "data_analyzer"
+    current_node.reset(token)
+    assert current_node.get() == "none"
+
+
+def test_process_cpu_is_a_monotonic_counter():
+    first = render_metrics()
+    sum(i * i for i in range(200000))    # Burn some CPU between scrapes
+    second = render_metrics()
+
+    assert "# TYPE process_cpu_seconds_total counter" in second
+    assert process_cpu_seconds.value() >= float(first.split("process_cpu_seconds_total ")[-1].split()[0])
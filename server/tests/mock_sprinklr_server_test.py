@@ -0,0 +1,81 @@
+"""
+Mock Sprinklr server tests.
+
+Checks that the stand-in get-mentions server honours the request window and
+message count and that its streamed bodies parse with HitStreamParser.
+"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_sprinklr_server import MockConfig, create_app, generate_synthetic_corpus
+from src.utils.hit_stream_parser import HitStreamParser
+
+FROM_TIME = 1746988200000
+UPTO_TIME = 1749580199999
+
+
+def _request_body(number_of_messages, from_time=FROM_TIME, upto_time=UPTO_TIME):
+    return {
+        "filters": [{"field": "QUERY", "values": ["anything"]}],
+        "fromTime": from_time,
+        "uptoTime": upto_time,
+        "numberOfMessages": number_of_messages,
+    }
+
+
+def test_synthetic_corpus_is_deterministic():
+    assert generate_synthetic_corpus(50, FROM_TIME, UPTO_TIME, seed=7) == generate_synthetic_corpus(50, FROM_TIME, UPTO_TIME, seed=7)
+
+
+def test_get_mentions_respects_window_and_limit():
+    client = TestClient(create_app(MockConfig(size=500, from_time=FROM_TIME, upto_time=UPTO_TIME)))
+    midpoint = (FROM_TIME + UPTO_TIME) // 2
+
+    response = client.post("/get-mentions", json=_request_body(1000, from_time=midpoint))
+    hits = response.json()
+
+    assert response.status_code == 200
+    assert 0 < len(hits) < 500
+    assert all(midpoint <= hit["createdTime"] <= UPTO_TIME for hit in hits)
+    assert len(client.post("/get-mentions", json=_request_body(10)).json()) == 10
+
+
+def test_get_mentions_applies_field_filters():
+    client = TestClient(create_app(MockConfig(size=500, from_time=FROM_TIME, upto_time=UPTO_TIME)))
+    body = _request_body(500)
+    body["filters"].append({"field": "SOURCE", "values": ["TWITTER", "REDDIT"]})
+
+    hits = client.post("/get-mentions", json=body).json()
+
+    assert hits
+    assert {hit["source"] for hit in hits} <= {"TWITTER", "REDDIT"}
+
+
+@pytest.mark.parametrize("stream", ["chunked", "sse"])
+def test_streamed_bodies_parse_incrementally(stream):
+    client = TestClient(create_app(MockConfig(size=120, from_time=FROM_TIME, upto_time=UPTO_TIME, stream=stream, chunk_size=25)))
+
+    body = client.post("/get-mentions", json=_request_body(100)).text
+    parser = HitStreamParser()
+    hits = parser.feed(body) + parser.close()
+
+    assert len(hits) == 100
+
+
+def test_throttle_and_error_rates():
+    client = TestClient(create_app(MockConfig(size=10, throttle_rate=1.0, retry_after=3)))
+    response = client.post("/get-mentions", json=_request_body(5))
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+    client = TestClient(create_app(MockConfig(size=10, error_rate=1.0)))
+    assert client.post("/get-mentions", json=_request_body(5)).status_code == 503
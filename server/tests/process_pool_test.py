@@ -0,0 +1,85 @@
+"""
+Warm process pool tests.
+
+Covers worker initialization, warm-up of every worker, parallel execution
+without blocking the event loop, error propagation and recovery after a
+worker process dies.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.process_pool import WarmProcessPool
+
+_loaded = {}
+
+
+def _init(value):
+    _loaded["value"] = value
+
+
+def _read_loaded(delay):
+    time.sleep(delay)
+    return _loaded.get("value"), os.getpid()
+
+
+def _fail():
+    raise ValueError("bad input")
+
+
+def _die():
+    os._exit(1)
+
+
+def test_warm_workers_run_initializer_and_work_in_parallel():
+    async def scenario():
+        pool = WarmProcessPool("test", max_workers=2, initializer=_init, initargs=("model",))
+        try:
+            await pool.start()
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            started = time.perf_counter()
+            results = await asyncio.gather(pool.run(_read_loaded, 0.5), pool.run(_read_loaded, 0.5))
+            elapsed = time.perf_counter() - started
+            ticker.cancel()
+            return results, elapsed, ticks, pool.get_stats()
+        finally:
+            pool.shutdown()
+
+    results, elapsed, ticks, stats = asyncio.run(scenario())
+    assert [value for value, _ in results] == ["model", "model"]
+    assert len({pid for _, pid in results}) == 2
+    assert elapsed < 0.9          # Both calls ran at once
+    assert ticks >= 20            # The event loop kept running meanwhile
+    assert stats["warm_workers"] == 2 and stats["in_flight"] == 0
+
+
+def test_errors_propagate_and_dead_worker_restarts_pool():
+    async def scenario():
+        pool = WarmProcessPool("test", max_workers=1, initializer=_init, initargs=("model",))
+        try:
+            with pytest.raises(ValueError, match="bad input"):
+                await pool.run(_fail)
+            with pytest.raises(RuntimeError, match="worker process died"):
+                await pool.run(_die)
+            value, _ = await pool.run(_read_loaded, 0)
+            return value, pool.get_stats()
+        finally:
+            pool.shutdown()
+
+    value, stats = asyncio.run(scenario())
+    assert value == "model"
+    assert (stats["failed"], stats["restarts"], stats["completed"]) == (2, 1, 1)
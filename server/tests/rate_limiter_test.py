@@ -0,0 +1,88 @@
+"""
+Sprinklr rate limiting and circuit breaker tests.
+
+Covers Retry-After parsing, AIMD rate adaptation of the shared token bucket
+and the closed/open/half-open transitions of the circuit breaker.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from src.utils.rate_limiter import AdaptiveRateLimiter, jittered_backoff, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_invalid():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_jittered_backoff_is_capped():
+    for attempt in range(10):
+        assert 0 <= jittered_backoff(attempt, base=1.0, cap=5.0) <= 5.0
+
+
+def test_token_bucket_limits_burst_and_adapts_rate():
+    limiter = AdaptiveRateLimiter("test", rate_per_second=50, burst=2, min_rate_per_second=5)
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    # Two tokens are available immediately, the other two refill at 50/s
+    assert asyncio.run(run()) >= 0.03
+
+    limiter.on_throttle()
+    assert limiter.rate == 25
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 50
+
+    stats = limiter.get_stats()
+    assert stats["acquired"] == 4
+    assert stats["throttled"] == 1
+    assert stats["queued"] == 0
+
+
+def test_circuit_opens_after_threshold_and_recovers_through_probe():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.get_stats()["rejected"] == 2
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.get_stats()["times_opened"] == 2
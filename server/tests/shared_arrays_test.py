@@ -0,0 +1,92 @@
+"""
+Shared-memory transfer tests.
+
+Covers corpus and array round trips through a worker process, output arrays
+written by the worker, and unlinking of every segment when the scope closes
+(also after a failed call).
+"""
+import asyncio
+import os
+import sys
+from multiprocessing import shared_memory
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from src.utils.process_pool import WarmProcessPool
+from src.utils.shared_arrays import SharedMemoryScope, attach_array, load_texts, write_array
+
+TEXTS = ["Battery drains overnight", "", "Écran cassé 😞", "x" * 5000]
+
+
+def _embed_lengths(texts_handle, matrix_handle, out_handle):
+    texts = load_texts(texts_handle)
+    with attach_array(matrix_handle) as matrix:
+        scaled = matrix * np.array([len(text) for text in texts], dtype=np.float32)[:, None]
+    write_array(out_handle, scaled)
+    return texts
+
+
+def _fail(texts_handle):
+    load_texts(texts_handle)
+    raise ValueError("bad corpus")
+
+
+def _segment_exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def test_round_trip_through_worker_and_unlink_on_exit():
+    matrix = np.arange(len(TEXTS) * 3, dtype=np.float32).reshape(len(TEXTS), 3)
+
+    async def scenario():
+        pool = WarmProcessPool("test", max_workers=1)
+        try:
+            with SharedMemoryScope() as scope:
+                texts_handle = scope.share_texts(TEXTS)
+                matrix_handle = scope.share_array(matrix)
+                out = scope.allocate_array(matrix.shape, np.float32)
+                texts = await pool.run(_embed_lengths, texts_handle, matrix_handle, out)
+                result = scope.read_array(out)
+                names = [texts_handle.name, matrix_handle.name, out.name]
+                assert all(_segment_exists(name) for name in names)
+            return texts, result, names
+        finally:
+            pool.shutdown()
+
+    texts, result, names = asyncio.run(scenario())
+    assert texts == TEXTS
+    np.testing.assert_array_equal(result, matrix * np.array([len(t) for t in TEXTS], dtype=np.float32)[:, None])
+    assert not any(_segment_exists(name) for name in names)
+
+
+def test_segments_unlinked_after_failed_call():
+    async def scenario():
+        pool = WarmProcessPool("test", max_workers=1)
+        try:
+            with pytest.raises(ValueError):
+                with SharedMemoryScope() as scope:
+                    handle = scope.share_texts(TEXTS)
+                    await pool.run(_fail, handle)
+            return handle.name
+        finally:
+            pool.shutdown()
+
+    assert not _segment_exists(asyncio.run(scenario()))
+
+
+def test_empty_corpus_and_foreign_handle():
+    with SharedMemoryScope() as scope:
+        assert load_texts(scope.share_texts([])) == []
+        with SharedMemoryScope() as other:
+            foreign = other.allocate_array((2,), np.int32)
+            with pytest.raises(KeyError):
+                scope.read_array(foreign)
@@ -0,0 +1,92 @@
+"""
+Speculation registry tests.
+
+Covers adopting a finished run, ignoring runs derived from different state,
+cancellation on refinement and restart protection while a run is pending.
+"""
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.speculation import SpeculationRegistry, state_fingerprint
+
+KEYS = ("refined_query", "filters")
+
+
+def test_fingerprint_depends_only_on_selected_keys():
+    state = {"refined_query": "battery complaints", "filters": {"source": ["TWITTER"]}, "messages": [1]}
+    same = {"refined_query": "battery complaints", "filters": {"source": ["TWITTER"]}, "messages": [1, 2]}
+    assert state_fingerprint(state, KEYS) == state_fingerprint(same, KEYS)
+    assert state_fingerprint(state, KEYS) != state_fingerprint({**state, "refined_query": "pricing"}, KEYS)
+
+
+def test_result_is_shared_until_adopted():
+    async def scenario():
+        registry = SpeculationRegistry()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"boolean_query": "battery"}
+
+        assert registry.start("t", "fp", work)
+        assert not registry.start("t", "fp", work)    # node re-run on resume
+        assert await registry.result("t", "fp") == {"boolean_query": "battery"}
+        assert await registry.result("t", "fp") == {"boolean_query": "battery"}
+        registry.adopt("t")
+        assert await registry.result("t", "fp") is None
+        return calls, registry.get_stats()
+
+    calls, stats = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert (stats["started"], stats["adopted"], stats["pending"]) == (1, 1, 0)
+
+
+def test_mismatch_discard_and_failure():
+    async def scenario():
+        registry = SpeculationRegistry()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+            return {}
+
+        async def failing():
+            raise RuntimeError("LLM unavailable")
+
+        registry.start("a", "fp-1", slow)
+        await started.wait()
+        assert await registry.result("a", "fp-2") is None    # state changed since the run started
+
+        registry.start("b", "fp", slow)
+        task = registry._runs["b"].task
+        registry.discard("b")
+        await asyncio.sleep(0)
+        assert task.cancelled()
+
+        registry.start("c", "fp", failing)
+        assert await registry.result("c", "fp") is None
+        return registry.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["mismatched"], stats["discarded"], stats["failed"], stats["pending"]) == (1, 1, 1, 0)
+
+
+def test_unclaimed_runs_expire():
+    async def scenario():
+        registry = SpeculationRegistry(max_runs=1)
+
+        async def work():
+            return {}
+
+        registry.start("a", "fp", work)
+        registry.start("b", "fp", work)
+        return registry.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["expired"], stats["pending"]) == (1, 1)
@@ -0,0 +1,121 @@
+"""
+Bounded state tests.
+
+Covers the message window, deduplicated query history and the per-thread
+history log that keeps theme backups out of checkpoints (in memory and through
+its durable collection).
+"""
+import copy
+import operator
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.helpers.state_reducers import query_history, windowed
+from src.utils.thread_history import ThreadHistoryLog
+
+
+def test_windowed_keeps_newest_items():
+    reduce = windowed(operator.add, 3)
+    value = []
+    for i in range(10):
+        value = reduce(value, [i])
+    assert value == [7, 8, 9]
+    assert reduce([1], [2]) == [1, 2]
+
+
+def test_query_history_dedupes_and_moves_repeats_last():
+    reduce = query_history(3)
+    history = reduce([], ["Battery complaints"])
+    history = reduce(history, ["yes"])
+    history = reduce(history, ["  battery   COMPLAINTS "])
+    assert history == ["yes", "  battery   COMPLAINTS "]
+    history = reduce(history, ["", "add twitter", "last 7 days"])
+    assert history == ["  battery   COMPLAINTS ", "add twitter", "last 7 days"]
+    assert reduce("first", "second") == ["first", "second"]
+    assert reduce(None, None) == []
+
+
+def test_history_is_constant_size_over_long_conversations():
+    reduce_messages = windowed(operator.add, 30)
+    reduce_queries = query_history(20)
+    messages, queries = [], []
+    for i in range(500):
+        messages = reduce_messages(messages, [f"message {i}"])
+        queries = reduce_queries(queries, [f"query {i % 40}"])
+    assert len(messages) == 30 and messages[-1] == "message 499"
+    assert len(queries) == 20 and queries[-1] == "query 19"
+
+
+def test_thread_history_log_bounds():
+    log = ThreadHistoryLog(max_threads=2, max_entries=2)
+    themes = [{"name": "Pricing"}]
+    log.append("a", {"action": "theme_modification", "original_themes": themes})
+    themes.append({"name": "Support"})
+    assert log.get("a")[0]["original_themes"] == [{"name": "Pricing"}]    # Snapshot, not a reference
+    for action in ("approval", "feedback"):
+        log.append("a", {"action": action})
+    assert [entry["action"] for entry in log.get("a")] == ["approval", "feedback"]
+
+    log.append("b", {"action": "approval"})
+    log.append("c", {"action": "approval"})
+    assert log.get("a") == []
+    assert (log.get_stats()["threads"], log.get_stats()["entries"]) == (2, 2)
+    log.discard("b")
+    assert log.get("b") == []
+
+
+def test_thread_history_log_expires_idle_threads():
+    log = ThreadHistoryLog(ttl_seconds=0)
+    log.append("a", {"action": "approval"})
+    log._updated["a"] -= 1
+    assert log.get("a") == []
+
+
+class _Collection:
+    """Stand-in for the pymongo collection operations the history log uses"""
+
+    def __init__(self, fail=False):
+        self.documents = {}
+        self.fail = fail
+
+    def create_index(self, key, expireAfterSeconds):
+        self.ttl = (key, expireAfterSeconds)
+
+    def update_one(self, query, update, upsert):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        document = self.documents.setdefault(query["_id"], {"_id": query["_id"], "entries": []})
+        push = update["$push"]["entries"]
+        document["entries"] = (document["entries"] + push["$each"])[push["$slice"]:]
+        document.update(update["$set"])
+
+    def find_one(self, query):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        return copy.deepcopy(self.documents.get(query["_id"]))
+
+    def delete_one(self, query):
+        self.documents.pop(query["_id"], None)
+
+
+def test_thread_history_survives_restart_through_collection():
+    collection = _Collection()
+    log = ThreadHistoryLog(max_entries=2, ttl_seconds=60, collection_factory=lambda: collection)
+    for action in ("theme_modification", "approval", "feedback"):
+        log.append("a", {"action": action})
+
+    restarted = ThreadHistoryLog(max_entries=2, ttl_seconds=60, collection_factory=lambda: collection)
+    assert [entry["action"] for entry in restarted.get("a")] == ["approval", "feedback"]
+    assert collection.ttl == ("updated_at", 60)
+    restarted.discard("a")
+    assert log.get("a") == []
+
+
+def test_thread_history_falls_back_to_memory_when_collection_fails():
+    log = ThreadHistoryLog(collection_factory=lambda: _Collection(fail=True))
+    log.append("a", {"action": "approval"})
+    assert [entry["action"] for entry in log.get("a")] == ["approval"]
+    assert log.get_stats()["durable_errors"] == 2
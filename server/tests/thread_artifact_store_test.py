@@ -0,0 +1,70 @@
+"""
+Thread artifact store tests.
+
+Covers per-thread isolation, stale run detection and the LRU/size/TTL bounds.
+"""
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.thread_artifact_store import ThreadArtifacts, ThreadArtifactStore
+
+
+class SizedHits(list):
+    """List of hits reporting a fixed memory footprint"""
+
+    def __init__(self, hits, nbytes):
+        super().__init__(hits)
+        self.nbytes = nbytes
+
+
+def test_threads_are_isolated_and_runs_checked():
+    store = ThreadArtifactStore()
+    store.put("a", ThreadArtifacts("run-a", [{"text": "from a"}]))
+    store.put("b", ThreadArtifacts("run-b", [{"text": "from b"}]))
+
+    assert store.get("a", "run-a").hits == [{"text": "from a"}]
+    assert store.get("b").hits == [{"text": "from b"}]
+    assert store.get("a", "run-b") is None    # superseded or foreign run
+    assert store.get("missing") is None
+
+    stats = store.get_stats()
+    assert (stats["hits"], stats["stale"], stats["misses"], stats["threads"]) == (2, 1, 1, 2)
+
+
+def test_put_replaces_previous_run_and_discard_releases():
+    store = ThreadArtifactStore()
+    store.put("a", ThreadArtifacts("run-1", [{"text": "old"}]))
+    store.put("a", ThreadArtifacts("run-2", [{"text": "new"}], documents=["new"]))
+
+    assert store.get("a", "run-1") is None
+    assert store.get("a", "run-2").documents == ["new"]
+
+    store.discard("a")
+    store.discard("a")
+    assert store.get("a") is None
+
+
+def test_lru_and_size_bounds():
+    store = ThreadArtifactStore(max_threads=2, max_bytes=100)
+    store.put("a", ThreadArtifacts("1", SizedHits([], 40)))
+    store.put("b", ThreadArtifacts("2", SizedHits([], 40)))
+    store.get("a")
+    store.put("c", ThreadArtifacts("3", SizedHits([], 40)))
+    assert store.get("b") is None    # least recently used
+
+    store.put("d", ThreadArtifacts("4", SizedHits([], 500)))
+    assert store.get("d") is not None    # the newest entry is kept even when oversized
+    assert store.get_stats()["threads"] == 1
+
+
+def test_idle_entries_expire():
+    store = ThreadArtifactStore(ttl_seconds=60)
+    artifacts = ThreadArtifacts("1", [{"text": "x"}])
+    store.put("a", artifacts)
+    artifacts.last_access -= 120
+
+    assert store.get("a") is None
+    assert store.get_stats()["expired"] == 1